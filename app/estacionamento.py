@@ -1,19 +1,31 @@
-<<<<<<< HEAD:app/estacionamento.py
+import bisect
 import csv
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import sys
+from array import array
+
 import vagas as vaga_mod
 
+# ---------------------------------------------------------------------------
+# FUNCOES INTERNAS AO MODULO
 """
-    Nome: novo_estacionamento(nome)
+    Nome: _novo_estacionamento(nome)
 
     Objetivo:
         Instanciar um registro-estacionamento vazio.
 
     Acoplamento:
         - nome: str — identificador do estacionamento.
-        - retorno: dict {"nome": str, "vagas": list[dict]}.
+        - retorno: dict {"nome": str, "vagas": vaga_mod.BlocoVagas}.
 
     Descrição:
-        Retorna dicionário com 'nome' e lista 'vagas' vazia.
+        Retorna dicionário com 'nome' e bloco 'vagas' vazio. O bloco guarda
+        as vagas em arrays e se comporta como lista de registros–vaga
+        (len, índice, iteração).
 
     Hipóteses:
         - Nome não vazio, único no contexto do sistema.
@@ -21,8 +33,8 @@ import vagas as vaga_mod
     Restrições:
         - Não cria vagas automaticamente.
     """
-def novo_estacionamento(nome: str) -> dict:
-    return {"nome": nome, "vagas": []}
+def _novo_estacionamento(nome: str) -> dict:
+    return {"nome": nome, "vagas": vaga_mod.novo_bloco_vagas()}
 
 """
     Nome: adicionar_vaga(est, vaga)
@@ -31,15 +43,106 @@ def novo_estacionamento(nome: str) -> dict:
         Anexar nova vaga ao estacionamento.
 
     Condições de Acoplamento:
-        AE: 'vaga' é dicionário gerado por vaga_mod.nova_vaga().
-        AS: vaga inserida em est['vagas'].
+        AE: 'vaga' é registro gerado por vaga_mod.nova_vaga().
+        AS: id e estado da vaga copiados para o bloco est['vagas'].
 
     Restrições:
         - Não verifica duplicidade de ID.
+        - Alterações posteriores no registro avulso não chegam ao bloco; use
+          as vagas devolvidas pelo estacionamento.
     """
-def adicionar_vaga(est: dict, vaga: dict) -> None:
+def _adicionar_vaga(est: dict, vaga: vaga_mod.Vaga) -> None:
     est["vagas"].append(vaga)
 
+"""    
+    Nome: _vagas_livres(est)
+
+    Objetivo:
+        Contar vagas livres no estacionamento.
+
+    Restrições:
+        - O(1): contador do bloco, atualizado a cada ocupação/liberação
+          (vaga_mod.configurarBlocos(verificar=True) confere com recontagem).
+    """
+def _vagas_livres(est: dict) -> int:
+    return vaga_mod.contarLivres(est["vagas"])
+
+"""
+    Nome: _verificar_status_vaga(est, id_vaga)
+
+    Objetivo:
+        Obter string de status da vaga de id_vaga.
+
+    Restrições:
+        - O(1): usa o índice id → vaga do bloco est['vagas'], mantido por
+          adicionar_vaga.
+    """
+def _verificar_status_vaga(est: dict, id_vaga: int) -> str:
+    v = vaga_mod.buscaVagaPorId(est["vagas"], id_vaga)
+    return vaga_mod.status(v) if v is not None else "ID de vaga inválido."
+
+"""
+    Nome: _renderizar_status_vagas(est, filtro, pagina, por_pagina)
+
+    Objetivo:
+        Montar o relatório de status das vagas numa só passada.
+
+    Acoplamento:
+        - filtro: None | "livres" | "ocupadas".
+        - pagina: int — página (base 1) após o filtro.
+        - por_pagina: int | None — linhas por página; None = todas.
+        - retorno: str — cabeçalho + uma linha por vaga.
+
+    Restrições:
+        - Levanta ValueError para filtro desconhecido ou paginação inválida.
+        - Só as linhas da página pedida são formatadas: as anteriores são
+          puladas por posição (vaga_mod.statusVagas), sem montar texto.
+    """
+def _renderizar_status_vagas(est: dict, filtro=None, pagina: int = 1,
+                             por_pagina=None) -> str:
+    if pagina < 1 or (por_pagina is not None and por_pagina < 1):
+        raise ValueError("paginação inválida.")
+    if por_pagina is None:
+        linhas = vaga_mod.statusVagas(est["vagas"], filtro)
+    else:
+        inicio = (pagina - 1) * por_pagina
+        linhas = vaga_mod.statusVagas(est["vagas"], filtro, inicio, inicio + por_pagina)
+    cabecalho = f"\nStatus das vagas no {est['nome']}:"
+    return "\n".join(itertools.chain((cabecalho,), linhas))
+
+"""
+    Nome: _listar_status_vagas(est, filtro, pagina, por_pagina)
+
+    Objetivo:
+        Imprimir estado das vagas no console.
+
+    Descrição:
+        Renderiza o relatório inteiro (_renderizar_status_vagas) e escreve
+        com um único print, em vez de um print por vaga.
+    """
+def _listar_status_vagas(est: dict, filtro=None, pagina: int = 1,
+                         por_pagina=None) -> None:
+    print(_renderizar_status_vagas(est, filtro, pagina, por_pagina))
+
+# ---------------------------------------------------------------------------
+# APIs Publicas
+def novo_estacionamento(nome: str):
+    return _novo_estacionamento(nome)
+
+def adicionar_vaga(est, vaga):
+    _adicionar_vaga(est, vaga)
+
+def vagas_livres(est):
+    return _vagas_livres(est)
+
+def vagas_ocupadas(est):
+    return len(est["vagas"]) - _vagas_livres(est)
+
+def listar_status_vagas(est, filtro=None, pagina=1, por_pagina=None):
+    return _listar_status_vagas(est, filtro, pagina, por_pagina)
+
+def renderizar_status_vagas(est, filtro=None, pagina=1, por_pagina=None):
+    return _renderizar_status_vagas(est, filtro, pagina, por_pagina)
 """
     Nome: get_vaga_disponivel(est)
 
@@ -47,10 +150,14 @@ def adicionar_vaga(est: dict, vaga: dict) -> None:
         Retornar o primeiro registro-vaga livre ou None.
 
     Hipóteses:
-        - Prioridade = ordem da lista.
+        - Prioridade = ordem da lista (= menor ID nos estacionamentos
+          carregados do CSV).
+
+    Restrições:
+        - O(1): o bloco de vagas mantém a posição da primeira livre.
     """
 def get_vaga_disponivel(est: dict):
-    return next((v for v in est["vagas"] if vaga_mod.estaLivre(v)), None)
+    return vaga_mod.primeiraVagaLivre(est["vagas"])
 
 """
     Nome: buscar_vaga_por_login(est, login)
@@ -59,10 +166,41 @@ def get_vaga_disponivel(est: dict):
         Localizar vaga ocupada por determinado usuário.
 
     Retorno:
-        dict | None.
+        registro–vaga | None.
+
+    Restrições:
+        - O(1): índice login → vaga do bloco, atualizado em ocupar/liberar.
     """
 def buscar_vaga_por_login(est: dict, login: str):
-    return next((v for v in est["vagas"] if vaga_mod.estaOcupadaPor(v, login)), None)
+    return vaga_mod.buscaVagaPorOcupante(est["vagas"], login)
+
+"""
+    Nome: estado_vaga(est, id_vaga)
+
+    Objetivo:
+        Estado atual de uma vaga: 0 (livre) ou login do ocupante.
+
+    Retorno:
+        0 | str | None — None se a vaga não existe.
+
+    Restrições:
+        - O(1): índice id → vaga do bloco.
+    """
+def estado_vaga(est: dict, id_vaga: int):
+    v = vaga_mod.buscaVagaPorId(est["vagas"], id_vaga)
+    return vaga_mod.getEstado(v) if v is not None else None
+
+"""
+    Nome: ocupantes(est)
+
+    Objetivo:
+        Listar os usuários estacionados e suas vagas.
+
+    Retorno:
+        iterador de (login, id_vaga).
+    """
+def ocupantes(est: dict):
+    return vaga_mod.ocupantesVagas(est["vagas"])
 
 """
     Nome: liberar_vaga_de(est, usuario)
@@ -72,11 +210,16 @@ def buscar_vaga_por_login(est: dict, login: str):
 
     Retorno:
         int | None — id da vaga liberada ou None se não encontrada.
+
+    Restrições:
+        - O(1), via buscar_vaga_por_login; com política de alocação, mais
+          O(log n) para devolver a vaga à estrutura dela.
     """
 def liberar_vaga_de(est: dict, usuario: dict):
     v = buscar_vaga_por_login(est, usuario["login"])
     if v:
         vaga_mod.liberar(v)
+        _avisar_liberacao(est, vaga_mod.getId(v))
         return vaga_mod.getId(v)
     return None
 
@@ -84,46 +227,47 @@ def liberar_vaga_de(est: dict, usuario: dict):
     Nome: ocupar_vaga_por_login(est, login)
 
     Objetivo:
-        Tentar ocupar primeira vaga livre.
+        Tentar ocupar a vaga escolhida pela política do estacionamento
+        (definir_politica); sem política, a primeira vaga livre.
 
     Retorno:
         tuple(bool, int|None) — (sucesso, id_vaga ou None)
     """
 def ocupar_vaga_por_login(est: dict, login: str):
-    v = get_vaga_disponivel(est)
+    v = _vaga_pela_politica(est)
     if v and vaga_mod.ocupar(v, login):
         return True, vaga_mod.getId(v)
     return False, None
 
 """
-    Nome: vagas_livres(est)
-
-    Objetivo:
-        Contar vagas livres no estacionamento.
-    """
-def vagas_livres(est: dict) -> int:
-    return sum(1 for v in est["vagas"] if vaga_mod.estaLivre(v))
-
-"""
-    Nome: listar_status_vagas(est)
+    Nome: aplicar_eventos(est, eventos)
 
     Objetivo:
-        Imprimir estado de cada vaga no console.
-    """
-def listar_status_vagas(est: dict) -> None:
-    print(f"\nStatus das vagas no {est['nome']}:")
-    for v in est["vagas"]:
-        print(vaga_mod.status(v))
+        Aplicar um lote de eventos de sensores — (id_vaga, login) para vaga
+        ocupada, (id_vaga, 0 | None) para vaga liberada — numa passada.
 
-"""
-    Nome: verificar_status_vaga(est, id_vaga)
+    Retorno:
+        list[tuple(int, str)] — (índice do evento, código) dos eventos em
+        conflito, que não foram aplicados (códigos em
+        vaga_mod.aplicarEventosVagas: vaga_inexistente, vaga_ocupada,
+        vaga_ja_livre, login_em_outra_vaga).
 
-    Objetivo:
-        Obter string de status da vaga de id_vaga.
+    Restrições:
+        - Índices do bloco (contadores, primeira livre, ocupantes, marcas
+          do salvamento incremental) acertados uma vez por lote; a política
+          de alocação, se houver, recebe as vagas liberadas.
+        - Não atualiza índices de fora do estacionamento nem chama a fila;
+          para isso use principal.AplicarEventosSensores.
     """
-def verificar_status_vaga(est: dict, id_vaga: int) -> str:
-    v = next((x for x in est["vagas"] if vaga_mod.getId(x) == id_vaga), None)
-    return vaga_mod.status(v) if v else "ID de vaga inválido."
+def aplicar_eventos(est: dict, eventos) -> list:
+    eventos = list(eventos)
+    conflitos = vaga_mod.aplicarEventosVagas(est["vagas"], eventos)
+    if est.get("politica") is not None:
+        recusados = {k for k, _ in conflitos}
+        for k, (id_vaga, estado) in enumerate(eventos):
+            if k not in recusados and estado in vaga_mod._EVENTO_LIVRE:
+                _avisar_liberacao(est, id_vaga)
+    return conflitos
 
 """
     Nome: salvar_estado_em_csv(est, writer)
@@ -146,6 +290,10 @@ def salvar_estado_em_csv(est: dict, writer) -> None:
     Formato do CSV:
         nome_est,login_vaga1,login_vaga2,...
         • "0" indica vaga livre.
+
+    Restrições:
+        - Lê linha a linha; cada linha vira o bloco compacto do
+          estacionamento direto das células (vaga_mod.novo_bloco_de_estados).
     """
 def criar_estacionamentos_de_csv(caminho_csv: str) -> list[dict]:
     ests: list[dict] = []
@@ -154,256 +302,862 @@ def criar_estacionamentos_de_csv(caminho_csv: str) -> list[dict]:
             for row in csv.reader(f):
                 if not row:
                     continue
-                est = novo_estacionamento(row[0])
-                for i, estado in enumerate(row[1:], 1):
-                    v = vaga_mod.nova_vaga(i)
-                    if estado.strip() != "0":
-                        vaga_mod.ocupar(v, estado.strip())
-                    adicionar_vaga(est, v)
+                est = _novo_estacionamento(row[0])
+                est["vagas"] = vaga_mod.novo_bloco_de_estados(row[1:])
                 ests.append(est)
     except FileNotFoundError:
         print(f"Arquivo {caminho_csv} não encontrado.")
     return ests
 
+# ---------------------------------------------------------------------------
+# Snapshot binário
+#
+# Layout (inteiros little-endian, strings UTF-8):
+#   cabeçalho   _CABECALHO: mágico b"ESTB", versão, reservado, n_lotes,
+#               n_strings, off_strings, off_blob
+#   lotes       n_lotes × _LOTE: índice do nome, n_vagas, livres, flags,
+#               off_vagas
+#   vagas       por lote, n_vagas × _VAGA: id, ocupante (0 = livre,
+#               k = string k-1 da tabela)
+#   strings     (n_strings + 1) × u32 de deslocamentos no blob, seguidos do
+#               blob com nomes e logins separados por NUL
+_SNAPSHOT_MAGICO = b"ESTB"
+_SNAPSHOT_VERSAO = 1
+_CABECALHO = struct.Struct("<4sHHIIQQ")
+_LOTE = struct.Struct("<IIIIQ")
+_VAGA = struct.Struct("<ii")
+_U32 = struct.Struct("<I")
+_IDS_CONSECUTIVOS = 1          # flag: ids = primeiro, primeiro+1, ...
+
+def _para_little_endian(arr: array) -> array:
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
 """
-    Nome: listar_estacionamentos(ests)
+    Nome: _serializar_estacionamentos(ests)
 
     Objetivo:
-        Exibir nome e vagas livres de cada estacionamento.
+        Montar o conteúdo do snapshot binário (ver layout acima).
+
+    Retorno:
+        bytes.
     """
-def listar_estacionamentos(ests: list[dict]) -> None:
-    print("\nEstacionamentos disponíveis:")
-    for idx, e in enumerate(ests, 1):
-        print(f"{idx}. {e['nome']} – Vagas livres: {vagas_livres(e)}")
+def _serializar_estacionamentos(ests: list[dict]) -> bytes:
+    tabela: dict = {}
+    lotes = []
+    for est in ests:
+        nome = tabela.setdefault(est["nome"], len(tabela))
+        ids, posicoes, logins = vaga_mod.colunasVagas(est["vagas"])
+        n = len(ids)
+        registros = array("i", bytes(_VAGA.size * n))
+        registros[0::2] = array("i", ids)
+        codigos = array("i", bytes(4 * n))
+        for pos, login in zip(posicoes, logins):
+            codigos[pos] = tabela.setdefault(login, len(tabela)) + 1
+        registros[1::2] = codigos
+        flags = _IDS_CONSECUTIVOS if isinstance(ids, range) and ids.step == 1 else 0
+        lotes.append((nome, n, n - len(posicoes), flags,
+                      _para_little_endian(registros).tobytes()))
+
+    off = _CABECALHO.size + _LOTE.size * len(lotes)
+    partes = [b""]
+    for nome, n, livres, flags, dados in lotes:
+        partes.append(_LOTE.pack(nome, n, livres, flags, off))
+        off += len(dados)
+    partes.extend(dados for *_, dados in lotes)
+
+    codificadas = [s.encode("utf-8") for s in tabela]
+    deslocamentos = array("I", itertools.accumulate(
+        (len(s) + 1 for s in codificadas), initial=0))
+    off_strings = off
+    off_blob = off_strings + 4 * len(deslocamentos)
+    partes.append(_para_little_endian(deslocamentos).tobytes())
+    partes.append(b"\0".join(codificadas) + (b"\0" if codificadas else b""))
+    partes[0] = _CABECALHO.pack(_SNAPSHOT_MAGICO, _SNAPSHOT_VERSAO, 0, len(lotes),
+                                len(codificadas), off_strings, off_blob)
+    return b"".join(partes)
 
 """
-    Nome: selecionar_estacionamento(ests)
+    Nome: _string_do_snapshot(snap, k)
 
     Objetivo:
-        Permitir seleção de estacionamento pelo usuário.
+        Ler a k-ésima string da tabela sem decodificar as demais.
     """
-def selecionar_estacionamento(ests: list[dict]):
-    if not ests:
-        print("⚠️ Nenhum estacionamento disponível.")
-        return None
-    while True:
-        listar_estacionamentos(ests)
-        esc = input("Escolha (número) › ").strip()
-        if not esc:
-            return None
-        try:
-            return ests[int(esc) - 1]
-        except (ValueError, IndexError):
-            print("⚠️ Opção inválida. Tente novamente ou Enter para cancelar.")
+def _string_do_snapshot(snap: dict, k: int) -> str:
+    mapa = snap["mapa"]
+    inicio, = _U32.unpack_from(mapa, snap["off_strings"] + 4 * k)
+    fim, = _U32.unpack_from(mapa, snap["off_strings"] + 4 * (k + 1))
+    base = snap["off_blob"]
+    return mapa[base + inicio:base + fim - 1].decode("utf-8")
 
 """
-    Nome: getNome(estacionamento)
+    Nome: _tabela_do_snapshot(snap)
 
     Objetivo:
-        Obter o nome de um estacionamento sem expor a estrutura interna.
-
-    Acoplamento:
-        - estacionamento: dict — objeto estacionamento.
-        - retorno: str — nome do estacionamento.
+        Decodificar a tabela de strings inteira de uma vez (um split sobre
+        o blob), com uma posição de folga para que o ocupante k seja
+        tabela[k].
+    """
+def _tabela_do_snapshot(snap: dict) -> list:
+    if snap["tabela"] is None:
+        base, n = snap["off_blob"], snap["n_strings"]
+        fim, = _U32.unpack_from(snap["mapa"], snap["off_strings"] + 4 * n)
+        blob = snap["mapa"][base:base + fim - 1].decode("utf-8")
+        snap["tabela"] = [None] + (blob.split("\0") if n else [])
+    return snap["tabela"]
 
-    Descrição:
-        Função de acesso que encapsula o campo "nome" do estacionamento.
 """
-def getNome(estacionamento: dict) -> str:
-    """Retorna o nome do estacionamento de forma encapsulada."""
-    return estacionamento["nome"]
-=======
-import csv
-import vagas as vaga_mod
+    Nome: salvar_estacionamentos_binario(ests, caminho)
+
+    Objetivo:
+        Gravar o estado de todos os estacionamentos no snapshot binário
+        versionado.
+
+    Restrições:
+        - Grava num arquivo temporário e troca com os.replace: um snapshot
+          antigo nunca fica pela metade.
+    """
+def salvar_estacionamentos_binario(ests: list[dict], caminho: str) -> None:
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(_serializar_estacionamentos(ests))
+    os.replace(temporario, caminho)
 
-# ---------------------------------------------------------------------------
-# FUNCOES INTERNAS AO MODULO
 """
-    Nome: _novo_estacionamento(nome)
+    Nome: abrir_snapshot(caminho)
 
     Objetivo:
-        Instanciar um registro-estacionamento vazio.
+        Mapear (mmap) um snapshot binário para consultas imediatas, antes de
+        montar os blocos em memória.
 
     Acoplamento:
-        - nome: str — identificador do estacionamento.
-        - retorno: dict {"nome": str, "vagas": list[dict]}.
+        - retorno: dict snapshot — use snapshot_vagas_livres,
+          snapshot_estado_vaga, carregar_snapshot e fechar_snapshot.
 
-    Descrição:
-        Retorna dicionário com 'nome' e lista 'vagas' vazia.
+    Restrições:
+        - Lê só o cabeçalho e a tabela de lotes; vagas e logins ficam no
+          arquivo até serem consultados.
+        - Levanta ValueError para arquivo vazio, mágico ou versão
+          desconhecidos, e para lotes, vagas ou strings que apontem para
+          fora do arquivo (truncado ou corrompido).
+    """
+def abrir_snapshot(caminho: str) -> dict:
+    with open(caminho, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _CABECALHO.size:
+            raise ValueError(f"{caminho}: snapshot truncado.")
+        mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magico, versao, _, n_lotes, n_strings, off_strings, off_blob = \
+        _CABECALHO.unpack_from(mapa, 0)
+    if magico != _SNAPSHOT_MAGICO or versao != _SNAPSHOT_VERSAO:
+        mapa.close()
+        raise ValueError(f"{caminho}: snapshot de formato ou versão desconhecidos "
+                         f"({magico!r}, v{versao}).")
+    snap = {"mapa": mapa, "versao": versao, "n_strings": n_strings,
+            "off_strings": off_strings, "off_blob": off_blob,
+            "tabela": None, "lotes": {}}
+    try:
+        _validar_limites(snap, n_lotes)
+        snap["ordem"] = [_LOTE.unpack_from(mapa, _CABECALHO.size + _LOTE.size * i)
+                         for i in range(n_lotes)]
+        for nome, n, _, _, off in snap["ordem"]:
+            if nome >= n_strings or off + _VAGA.size * n > off_strings:
+                raise ValueError("lote fora dos limites")
+        for nome, *lote in snap["ordem"]:
+            snap["lotes"].setdefault(_string_do_snapshot(snap, nome), tuple(lote))
+    except ValueError as erro:
+        mapa.close()
+        raise ValueError(f"{caminho}: snapshot truncado ou corrompido ({erro}).") from None
+    return snap
 
-    Hipóteses:
-        - Nome não vazio, único no contexto do sistema.
+"""
+    Nome: _validar_limites(snap, n_lotes)
+
+    Objetivo:
+        Conferir, só com o cabeçalho e a última posição da tabela de
+        deslocamentos, que tabela de lotes, vagas e strings cabem no arquivo
+        (um snapshot truncado ou corrompido viraria struct.error/IndexError
+        longe daqui).
 
     Restrições:
-        - Não cria vagas automaticamente.
+        - Levanta ValueError com o motivo; não confere cada deslocamento
+          (um deslocamento fora de ordem só produz uma string errada ou
+          UnicodeDecodeError, também ValueError).
     """
-def _novo_estacionamento(nome: str) -> dict:
-    return {"nome": nome, "vagas": []}
+def _validar_limites(snap: dict, n_lotes: int) -> None:
+    tamanho = len(snap["mapa"])
+    off_strings, off_blob = snap["off_strings"], snap["off_blob"]
+    if _CABECALHO.size + _LOTE.size * n_lotes > off_strings:
+        raise ValueError("tabela de lotes fora dos limites")
+    if off_strings + 4 * (snap["n_strings"] + 1) != off_blob or off_blob > tamanho:
+        raise ValueError("tabela de strings fora dos limites")
+    fim, = _U32.unpack_from(snap["mapa"], off_blob - 4)
+    if off_blob + fim > tamanho:
+        raise ValueError("blob de strings fora dos limites")
 
 """
-    Nome: adicionar_vaga(est, vaga)
+    Nome: snapshot_vagas_livres(snap, nome)
 
     Objetivo:
-        Anexar nova vaga ao estacionamento.
+        Vagas livres de um estacionamento, direto do snapshot.
 
-    Condições de Acoplamento:
-        AE: 'vaga' é dicionário gerado por vaga_mod.nova_vaga().
-        AS: vaga inserida em est['vagas'].
+    Retorno:
+        int | None — None se o estacionamento não existe.
+    """
+def snapshot_vagas_livres(snap: dict, nome: str):
+    lote = snap["lotes"].get(nome)
+    return lote[1] if lote else None
+
+"""
+    Nome: snapshot_estado_vaga(snap, nome, id_vaga)
+
+    Objetivo:
+        Estado de uma vaga direto do snapshot: 0 (livre) ou login.
+
+    Retorno:
+        0 | str | None — None se estacionamento ou vaga não existem.
 
     Restrições:
-        - Não verifica duplicidade de ID.
+        - O(1) para ids consecutivos (o caso do CSV); senão, uma varredura
+          da coluna de ids do lote.
     """
-def _adicionar_vaga(est: dict, vaga: dict) -> None:
-    est["vagas"].append(vaga)
+def snapshot_estado_vaga(snap: dict, nome: str, id_vaga: int):
+    lote = snap["lotes"].get(nome)
+    if lote is None:
+        return None
+    n, _, flags, off = lote
+    mapa = snap["mapa"]
+    if not n:
+        return None
+    if flags & _IDS_CONSECUTIVOS:
+        primeiro, _ = _VAGA.unpack_from(mapa, off)
+        pos = id_vaga - primeiro
+        if not 0 <= pos < n:
+            return None
+    else:
+        ids = _para_little_endian(array("i", mapa[off:off + _VAGA.size * n]))[0::2]
+        try:
+            pos = ids.index(id_vaga)
+        except ValueError:
+            return None
+    _, codigo = _VAGA.unpack_from(mapa, off + _VAGA.size * pos)
+    if not 0 <= codigo <= snap["n_strings"]:
+        raise ValueError(f"ocupante {codigo} fora da tabela de strings do snapshot.")
+    return _string_do_snapshot(snap, codigo - 1) if codigo else 0
 
-"""    
-    Nome: _vagas_livres(est)
+"""
+    Nome: carregar_snapshot(snap)
 
     Objetivo:
-        Contar vagas livres no estacionamento.
+        Montar a lista de estacionamentos (blocos em memória) a partir de
+        um snapshot aberto.
+
+    Restrições:
+        - Cada lote vira colunas com uma cópia e um fatiamento de array; os
+          logins são decodificados uma única vez para todos os lotes.
+        - Levanta ValueError se um ocupante não estiver na tabela de strings
+          (detectado na própria consulta à tabela, sem varredura extra).
+        - O custo dominante é montar os índices do bloco (ocupantes, vaga
+          de cada login), o mesmo da carga do CSV: a carga completa fica
+          pouco abaixo da do CSV. Para consultar ocupação em milissegundos,
+          sem montar blocos, use abrir_snapshot/snapshot_estado_vaga.
     """
-def _vagas_livres(est: dict) -> int:
-    return sum(1 for v in est["vagas"] if vaga_mod.estaLivre(v))
+def carregar_snapshot(snap: dict) -> list[dict]:
+    mapa = snap["mapa"]
+    tabela = _tabela_do_snapshot(snap)
+    ests = []
+    for nome, n, _, flags, off in snap["ordem"]:
+        registros = _para_little_endian(array("i", mapa[off:off + _VAGA.size * n]))
+        if flags & _IDS_CONSECUTIVOS:
+            ids = range(registros[0], registros[0] + n) if n else range(1, 1)
+        else:
+            ids = registros[0::2]
+        # sem sinal: um código negativo (corrompido) também cai fora da tabela
+        codigos = array("I", registros[1::2].tobytes())
+        est = _novo_estacionamento(tabela[nome + 1])
+        try:
+            est["vagas"] = vaga_mod.novo_bloco_de_codigos(ids, codigos, tabela)
+        except IndexError:
+            raise ValueError(f"{est['nome']}: ocupante fora da tabela de "
+                             "strings do snapshot.") from None
+        ests.append(est)
+    return ests
 
 """
-    Nome: _verificar_status_vaga(est, id_vaga)
+    Nome: fechar_snapshot(snap)
 
     Objetivo:
-        Obter string de status da vaga de id_vaga.
+        Liberar o mapeamento do snapshot.
     """
-def _verificar_status_vaga(est: dict, id_vaga: int) -> str:
-    v = next((x for x in est["vagas"] if vaga_mod.getId(x) == id_vaga), None)
-    return vaga_mod.status(v) if v else "ID de vaga inválido."
+def fechar_snapshot(snap: dict) -> None:
+    snap["mapa"].close()
 
 """
-    Nome: _listar_status_vagas(est)
+    Nome: criar_estacionamentos_de_binario(caminho)
 
     Objetivo:
-        Imprimir estado de cada vaga no console.
+        Equivalente binário de criar_estacionamentos_de_csv: abre, carrega
+        e fecha o snapshot.
+
+    Restrições:
+        - Levanta ValueError para snapshot inválido (ver abrir_snapshot).
     """
-def _listar_status_vagas(est: dict) -> None:
-    print(f"\nStatus das vagas no {est['nome']}:")
-    for v in est["vagas"]:
-        print(vaga_mod.status(v))
+def criar_estacionamentos_de_binario(caminho: str) -> list[dict]:
+    snap = abrir_snapshot(caminho)
+    try:
+        return carregar_snapshot(snap)
+    finally:
+        fechar_snapshot(snap)
 
 # ---------------------------------------------------------------------------
-# APIs Publicas
-def novo_estacionamento(nome: str):
-    return _novo_estacionamento(nome)
+# Salvamento incremental
+#
+# Entre dois salvamentos completos (CSV/snapshot binário), só as vagas
+# alteradas são anexadas a um arquivo de alterações, uma linha CSV por vaga:
+#     nome_est,id_vaga,estado        ("0" = livre)
+# Na carga, as linhas são reaplicadas em ordem sobre o ponto de partida; a
+# última linha de cada vaga prevalece. Só linhas terminadas em quebra de
+# linha valem: uma cauda sem "\n" foi cortada por uma queda no meio da
+# escrita e é descartada (truncada) antes de ler ou anexar.
+"""
+    Nome: _cortar_linha_incompleta(caminho)
 
-def adicionar_vaga(est, vaga):
-    _adicionar_vaga(est, vaga)
+    Objetivo:
+        Truncar o arquivo logo após a última quebra de linha.
 
-def vagas_livres(est):
-    return _vagas_livres(est)
+    Retorno:
+        bool — True se havia uma cauda incompleta (e ela foi removida).
+
+    Restrições:
+        - Lê só o fim do arquivo, em blocos, até achar um "\n".
+        - Arquivo inexistente = nada a cortar.
+    """
+def _cortar_linha_incompleta(caminho: str) -> bool:
+    try:
+        f = open(caminho, "rb+")
+    except FileNotFoundError:
+        return False
+    with f:
+        fim = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            bloco = min(pos, 4096)
+            f.seek(pos - bloco)
+            dados = f.read(bloco)
+            if pos == fim and dados.endswith(b"\n"):
+                return False
+            i = dados.rfind(b"\n")
+            if i >= 0:
+                f.truncate(pos - bloco + i + 1)
+                return True
+            pos -= bloco
+        if fim:
+            f.truncate(0)
+        return bool(fim)
 
-def listar_status_vagas(est):
-    return _listar_status_vagas(est)
 """
-    Nome: get_vaga_disponivel(est)
+    Nome: salvar_alteracoes(ests, caminho)
 
     Objetivo:
-        Retornar o primeiro registro-vaga livre ou None.
+        Ponto de controle barato: anexar ao arquivo de alterações só as
+        vagas alteradas desde o anterior e zerar as marcas.
+
+    Retorno:
+        int — linhas gravadas (0 = nada mudou; o arquivo nem é aberto).
+
+    Restrições:
+        - O(vagas alteradas + estacionamentos); vagas intocadas não são
+          lidas nem escritas.
+        - Uma linha truncada por queda no meio da escrita é removida antes
+          de anexar (e ignorada na carga, aplicar_alteracoes): as novas
+          linhas nunca se colam a ela.
+    """
+def salvar_alteracoes(ests: list[dict], caminho: str) -> int:
+    linhas = [(est["nome"], id_vaga, estado if estado != 0 else "0")
+              for est in ests
+              for id_vaga, estado in vaga_mod.alteracoesVagas(est["vagas"])]
+    if linhas:
+        _cortar_linha_incompleta(caminho)
+        with open(caminho, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(linhas)
+    for est in ests:
+        vaga_mod.limparAlteracoesVagas(est["vagas"])
+    return len(linhas)
+
+"""
+    Nome: aplicar_alteracoes(ests, caminho)
+
+    Objetivo:
+        Reaplicar o arquivo de alterações sobre os estacionamentos recém-
+        carregados do ponto de partida.
+
+    Acoplamento:
+        - ests: list[dict] — alterada no lugar; estacionamentos e vagas que
+          só existem no arquivo de alterações são criados ao final.
+        - retorno: int — linhas aplicadas.
+
+    Restrições:
+        - Arquivo inexistente = nenhuma alteração.
+        - Linhas mal-formadas são ignoradas; uma última linha sem quebra
+          de linha (escrita interrompida) é descartada do arquivo.
+        - As vagas reaplicadas já estão no arquivo: suas marcas de
+          alteração são zeradas.
+    """
+def aplicar_alteracoes(ests: list[dict], caminho: str) -> int:
+    _cortar_linha_incompleta(caminho)
+    try:
+        f = open(caminho, newline="", encoding="utf-8")
+    except FileNotFoundError:
+        return 0
+    por_nome: dict = {}
+    for est in ests:
+        por_nome.setdefault(est["nome"], est)
+    aplicadas = 0
+    with f:
+        for row in csv.reader(f):
+            if len(row) != 3 or not row[2]:
+                continue
+            try:
+                id_vaga = int(row[1])
+            except ValueError:
+                continue
+            est = por_nome.get(row[0])
+            if est is None:
+                est = por_nome[row[0]] = _novo_estacionamento(row[0])
+                ests.append(est)
+            v = vaga_mod.buscaVagaPorId(est["vagas"], id_vaga)
+            if v is None:
+                _adicionar_vaga(est, vaga_mod.nova_vaga(id_vaga))
+                v = vaga_mod.buscaVagaPorId(est["vagas"], id_vaga)
+            v["estado"] = row[2] if row[2] != "0" else 0
+            aplicadas += 1
+    for est in por_nome.values():
+        vaga_mod.limparAlteracoesVagas(est["vagas"])
+    return aplicadas
+
+"""
+    Nome: zerar_alteracoes(ests, caminho)
+
+    Objetivo:
+        Marcar um novo ponto de partida, logo após um salvamento completo:
+        esvazia o arquivo de alterações e as marcas de todas as vagas.
+    """
+def zerar_alteracoes(ests: list[dict], caminho: str) -> None:
+    open(caminho, "w", encoding="utf-8").close()
+    for est in ests:
+        vaga_mod.limparAlteracoesVagas(est["vagas"])
+
+# ---------------------------------------------------------------------------
+# Setores (andares, zonas …)
+#
+# Um setor é um trecho de posições consecutivas do bloco de vagas; setores
+# se aninham (andar → zona → …) e são identificados pelo caminho de nomes
+# separados por "/" (ex.: "Piso 2/Zona B"). Contagens e buscas por setor
+# usam a árvore de Fenwick do bloco: O(log n) em vez de varrer as vagas.
+"""
+    Nome: definir_setores(est, setores)
+
+    Objetivo:
+        Dividir as vagas do estacionamento em setores aninhados.
+
+    Acoplamento:
+        - setores: lista de (nome, filhos) — filhos é um int (quantidade de
+          vagas, na ordem do bloco) ou outra lista no mesmo formato.
+        - est['setores']: {"caminhos": {caminho: (inicio, fim)},
+          "faixas": {caminho: (primeira folha, última folha + 1)},
+          "inicios": [início de cada folha], "folhas": [caminho de cada folha],
+          "limite": fim da última folha}.
 
     Hipóteses:
-        - Prioridade = ordem da lista.
+        - A ordem das folhas é a ordem física: zonas vizinhas na lista são
+          vizinhas na garagem (usado por setor_livre_mais_proximo).
+
+    Restrições:
+        - Levanta ValueError para nome vazio ou com "/", caminho repetido,
+          quantidade negativa ou setores com mais vagas que o estacionamento.
+        - Vagas além da última folha ficam fora de qualquer setor.
     """
-def get_vaga_disponivel(est: dict):
-    return next((v for v in est["vagas"] if vaga_mod.estaLivre(v)), None)
+def definir_setores(est: dict, setores: list) -> None:
+    caminhos: dict = {}
+    faixas: dict = {}
+    folhas: list = []
+
+    def percorrer(lista, prefixo, inicio):
+        for nome, filhos in lista:
+            if not nome or "/" in nome:
+                raise ValueError(f"nome de setor inválido: {nome!r}.")
+            caminho = f"{prefixo}/{nome}" if prefixo else nome
+            if caminho in caminhos:
+                raise ValueError(f"setor repetido: {caminho!r}.")
+            caminhos[caminho] = None                 # mantém a ordem pai → filhos
+            primeira = len(folhas)
+            if isinstance(filhos, int):
+                if filhos < 0:
+                    raise ValueError(f"quantidade negativa no setor {caminho!r}.")
+                fim = inicio + filhos
+                folhas.append((inicio, caminho))
+            else:
+                fim = percorrer(filhos, caminho, inicio)
+            caminhos[caminho] = (inicio, fim)
+            faixas[caminho] = (primeira, len(folhas))
+            inicio = fim
+        return inicio
+
+    limite = percorrer(setores, "", 0)
+    if limite > len(est["vagas"]):
+        raise ValueError(f"setores de {est['nome']} somam mais vagas que o estacionamento.")
+    est["setores"] = {"caminhos": caminhos, "faixas": faixas,
+                      "inicios": [inicio for inicio, _ in folhas],
+                      "folhas": [caminho for _, caminho in folhas],
+                      "limite": limite}
+
+def _trecho_do_setor(est: dict, caminho: str) -> tuple:
+    trecho = est.get("setores", {}).get("caminhos", {}).get(caminho)
+    if trecho is None:
+        raise ValueError(f"setor desconhecido em {est['nome']}: {caminho!r}.")
+    return trecho
+
+def _folha_da_posicao(setores: dict, pos: int) -> int:
+    return bisect.bisect_right(setores["inicios"], pos) - 1
 
 """
-    Nome: buscar_vaga_por_login(est, login)
+    Nome: vagas_livres_no_setor(est, caminho)
 
     Objetivo:
-        Localizar vaga ocupada por determinado usuário.
+        Contar as vagas livres de um setor (e de todos os seus subsetores).
+
+    Restrições:
+        - O(log n). Levanta ValueError para setor desconhecido.
+    """
+def vagas_livres_no_setor(est: dict, caminho: str) -> int:
+    return vaga_mod.contarLivresEntre(est["vagas"], *_trecho_do_setor(est, caminho))
+
+"""
+    Nome: livres_por_setor(est, nivel)
+
+    Objetivo:
+        Vagas livres de cada setor de um nível (1 = andares, 2 = zonas …).
 
     Retorno:
-        dict | None.
+        list[tuple(str, int)] — (caminho, livres), na ordem dos setores.
     """
-def buscar_vaga_por_login(est: dict, login: str):
-    return next((v for v in est["vagas"] if vaga_mod.estaOcupadaPor(v, login)), None)
+def livres_por_setor(est: dict, nivel: int = 1) -> list:
+    caminhos = est.get("setores", {}).get("caminhos", {})
+    return [(caminho, vaga_mod.contarLivresEntre(est["vagas"], inicio, fim))
+            for caminho, (inicio, fim) in caminhos.items()
+            if caminho.count("/") == nivel - 1]
 
 """
-    Nome: liberar_vaga_de(est, usuario)
+    Nome: vaga_livre_no_setor(est, caminho)
 
     Objetivo:
-        Liberar a vaga ocupada por 'usuario'.
+        Primeira vaga livre dentro de um setor.
 
     Retorno:
-        int | None — id da vaga liberada ou None se não encontrada.
+        registro–vaga | None.
+
+    Restrições:
+        - O(log n). Levanta ValueError para setor desconhecido.
     """
-def liberar_vaga_de(est: dict, usuario: dict):
-    v = buscar_vaga_por_login(est, usuario["login"])
-    if v:
-        vaga_mod.liberar(v)
-        return vaga_mod.getId(v)
-    return None
+def vaga_livre_no_setor(est: dict, caminho: str):
+    pos = vaga_mod.posicaoLivreEntre(est["vagas"], *_trecho_do_setor(est, caminho))
+    return est["vagas"][pos] if pos >= 0 else None
 
 """
-    Nome: ocupar_vaga_por_login(est, login)
+    Nome: ocupar_vaga_no_setor(est, caminho, login)
 
     Objetivo:
-        Tentar ocupar primeira vaga livre.
+        Como ocupar_vaga_por_login, restrito a um setor.
 
     Retorno:
         tuple(bool, int|None) — (sucesso, id_vaga ou None)
     """
-def ocupar_vaga_por_login(est: dict, login: str):
-    v = get_vaga_disponivel(est)
+def ocupar_vaga_no_setor(est: dict, caminho: str, login: str):
+    v = vaga_livre_no_setor(est, caminho)
     if v and vaga_mod.ocupar(v, login):
         return True, vaga_mod.getId(v)
     return False, None
 
 """
-    Nome: salvar_estado_em_csv(est, writer)
+    Nome: setor_livre_mais_proximo(est, caminho)
 
     Objetivo:
-        Persistir linha CSV: [nome, estado1, estado2, …].
+        Zona (folha) com vaga livre mais próxima de um setor: uma zona do
+        próprio setor, se houver livre nele; senão a mais perto antes ou
+        depois dele, contando zonas a partir das folhas do setor — zonas
+        vazias (0 vagas) também contam (empate: a de depois).
+
+    Retorno:
+        str | None — caminho da zona; None se não há livres em setor algum.
+
+    Restrições:
+        - O(log n): duas buscas na árvore de Fenwick e bisect nas folhas.
     """
-def salvar_estado_em_csv(est: dict, writer) -> None:
-    linha = [est["nome"]] + [
-        (vaga_mod.getEstado(v) if not vaga_mod.estaLivre(v) else "0") for v in est["vagas"]
-    ]
-    writer.writerow(linha)
+def setor_livre_mais_proximo(est: dict, caminho: str):
+    inicio, fim = _trecho_do_setor(est, caminho)
+    setores, vagas = est["setores"], est["vagas"]
+    pos = vaga_mod.posicaoLivreEntre(vagas, inicio, fim)
+    if pos >= 0:
+        return setores["folhas"][_folha_da_posicao(setores, pos)]
+    depois = vaga_mod.posicaoLivreEntre(vagas, fim, setores["limite"])
+    antes = vaga_mod.posicaoLivreAntes(vagas, inicio)
+    primeira, ultima = setores["faixas"][caminho]
+    candidatos = []
+    if depois >= 0:
+        folha = _folha_da_posicao(setores, depois)
+        candidatos.append((folha - (ultima - 1), 0, folha))
+    if antes >= 0:
+        folha = _folha_da_posicao(setores, antes)
+        candidatos.append((primeira - folha, 1, folha))
+    if not candidatos:
+        return None
+    return setores["folhas"][min(candidatos)[2]]
 
 """
-    Nome: criar_estacionamentos_de_csv(caminho_csv)
+    Nome: carregar_setores_de_csv(ests, caminho_csv)
 
     Objetivo:
-        Construir lista de estacionamentos + vagas a partir de arquivo CSV.
+        Definir os setores dos estacionamentos a partir de um CSV.
 
     Formato do CSV:
-        nome_est,login_vaga1,login_vaga2,...
-        • "0" indica vaga livre.
+        nome_est,caminho_da_zona,quantidade
+        • Ex.: "Central,Piso 1/Zona A,40"; as linhas de um estacionamento,
+          na ordem do arquivo, cobrem as vagas em ordem.
+
+    Restrições:
+        - Arquivo inexistente: nenhum setor (a configuração é opcional).
+        - Linhas mal-formadas ou de estacionamento desconhecido são
+          ignoradas; um estacionamento com setores inválidos fica sem setores
+          e é avisado no console.
     """
-def criar_estacionamentos_de_csv(caminho_csv: str) -> list[dict]:
-    ests: list[dict] = []
+def carregar_setores_de_csv(ests: list[dict], caminho_csv: str) -> None:
     try:
-        with open(caminho_csv, newline='', encoding="utf-8") as f:
-            for row in csv.reader(f):
-                if not row:
-                    continue
-                est = _novo_estacionamento(row[0])
-                for i, estado in enumerate(row[1:], 1):
-                    v = vaga_mod.nova_vaga(i)
-                    if estado.strip() != "0":
-                        vaga_mod.ocupar(v, estado.strip())
-                    _adicionar_vaga(est, v)
-                ests.append(est)
+        f = open(caminho_csv, newline='', encoding="utf-8")
     except FileNotFoundError:
-        print(f"Arquivo {caminho_csv} não encontrado.")
-    return ests
+        return
+    arvores: dict = {}
+    with f:
+        for row in csv.reader(f):
+            if len(row) != 3:
+                continue
+            try:
+                quantidade = int(row[2])
+            except ValueError:
+                continue
+            *pais, folha = row[1].split("/")
+            no = arvores.setdefault(row[0], {})
+            for nome in pais:
+                no = no.setdefault(nome, {})
+                if not isinstance(no, dict):
+                    break
+            else:
+                no[folha] = quantidade
+
+    def como_lista(no):
+        return [(nome, filhos if isinstance(filhos, int) else como_lista(filhos))
+                for nome, filhos in no.items()]
+
+    for est in ests:
+        if est["nome"] in arvores:
+            try:
+                definir_setores(est, como_lista(arvores[est["nome"]]))
+            except ValueError as erro:
+                print(f"⚠️ Setores ignorados: {erro}")
+
+# ---------------------------------------------------------------------------
+# Políticas de alocação
+#
+# A política de um estacionamento decide qual vaga livre ocupar_vaga_por_login
+# usa, e guarda a própria estrutura indexada em est['politica']['estado']:
+#   "primeira"        — primeira livre na ordem do bloco (padrão; cache do bloco)
+#   "menor_id"        — menor id livre; heap de (id, posição)
+#   "proxima_entrada" — menor distância à entrada; heap de (distância, id, posição)
+#   "rodizio"         — próxima livre depois da última alocada, circular, para
+#                       gastar as vagas por igual; cursor + Fenwick do bloco
+#   "por_zona"        — completa a zona mais cheia que ainda tem vaga antes de
+#                       abrir outra; heap de zonas por (livres, ordem)
+# Os heaps são preguiçosos: entradas velhas (vaga já ocupada, contagem
+# mudada) são descartadas ou corrigidas ao chegar ao topo; liberar_vaga_de
+# reinsere a vaga liberada. Uma vaga liberada por outro caminho só espera o
+# heap esvaziar, quando ele é remontado a partir do bloco.
+_FOLGA_HEAP = 64               # entradas velhas toleradas antes de remontar
+
+def _escolher_primeira(est, estado):
+    v = get_vaga_disponivel(est)
+    return vaga_mod.posicaoPorId(est["vagas"], vaga_mod.getId(v)) if v else -1
+
+def _nada(est, estado, pos=None):
+    return None
+
+# --- heap de vagas (menor_id, proxima_entrada)
+def _chave_menor_id(est, estado, pos):
+    return (vaga_mod.getId(est["vagas"][pos]),)
+
+def _chave_distancia(est, estado, pos):
+    id_vaga = vaga_mod.getId(est["vagas"][pos])
+    return (estado["distancias"].get(id_vaga, float("inf")), id_vaga)
+
+def _montar_heap_de_vagas(est, estado):
+    chave = estado["chave"]
+    estado["heap"] = [(*chave(est, estado, pos), pos)
+                      for pos in vaga_mod.posicoesLivres(est["vagas"])]
+    heapq.heapify(estado["heap"])
+
+def _criar_heap_de_vagas(chave):
+    def criar(est, distancias=None):
+        estado = {"chave": chave, "distancias": dict(distancias or {})}
+        _montar_heap_de_vagas(est, estado)
+        return estado
+    return criar
+
+def _escolher_do_heap(est, estado):
+    vagas = est["vagas"]
+    for _ in range(2):
+        heap = estado["heap"]
+        while heap:
+            pos = heapq.heappop(heap)[-1]
+            if vaga_mod.estaLivre(vagas[pos]):
+                return pos
+        if not vaga_mod.contarLivres(vagas):
+            return -1
+        _montar_heap_de_vagas(est, estado)       # liberações sem aviso
+    return -1
+
+def _liberou_no_heap(est, estado, pos):
+    if len(estado["heap"]) > 2 * vaga_mod.contarLivres(est["vagas"]) + _FOLGA_HEAP:
+        _montar_heap_de_vagas(est, estado)
+    else:
+        heapq.heappush(estado["heap"], (*estado["chave"](est, estado, pos), pos))
+
+# --- rodízio
+def _criar_rodizio(est):
+    return {"cursor": 0}
+
+def _escolher_rodizio(est, estado):
+    vagas, cursor = est["vagas"], estado["cursor"]
+    pos = vaga_mod.posicaoLivreEntre(vagas, cursor, len(vagas))
+    if pos < 0:
+        pos = vaga_mod.posicaoLivreEntre(vagas, 0, min(cursor, len(vagas)))
+    if pos >= 0:
+        estado["cursor"] = pos + 1
+    return pos
+
+# --- por zona
+def _zonas(est):
+    """Trechos (inicio, fim) das zonas: folhas dos setores, mais as vagas
+    fora de setor como uma zona final; sem setores, o estacionamento todo."""
+    setores, n = est.get("setores"), len(est["vagas"])
+    if not setores:
+        return [(0, n)]
+    zonas = [setores["caminhos"][folha] for folha in setores["folhas"]]
+    if setores["limite"] < n:
+        zonas.append((setores["limite"], n))
+    return zonas
+
+def _montar_heap_de_zonas(est, estado):
+    vagas = est["vagas"]
+    estado["zonas"] = _zonas(est)
+    estado["inicios"] = [inicio for inicio, _ in estado["zonas"]]
+    estado["heap"] = [(livres, ordem) for ordem, (inicio, fim) in enumerate(estado["zonas"])
+                      if (livres := vaga_mod.contarLivresEntre(vagas, inicio, fim))]
+    heapq.heapify(estado["heap"])
+
+def _criar_por_zona(est):
+    estado = {}
+    _montar_heap_de_zonas(est, estado)
+    return estado
+
+def _escolher_por_zona(est, estado):
+    vagas = est["vagas"]
+    for _ in range(2):
+        heap = estado["heap"]
+        while heap:
+            livres, ordem = heapq.heappop(heap)
+            inicio, fim = estado["zonas"][ordem]
+            atual = vaga_mod.contarLivresEntre(vagas, inicio, fim)
+            if atual != livres:                      # entrada velha
+                if atual:
+                    heapq.heappush(heap, (atual, ordem))
+                continue
+            if atual > 1:
+                heapq.heappush(heap, (atual - 1, ordem))
+            return vaga_mod.posicaoLivreEntre(vagas, inicio, fim)
+        if not vaga_mod.contarLivres(vagas):
+            return -1
+        _montar_heap_de_zonas(est, estado)
+    return -1
+
+def _liberou_por_zona(est, estado, pos):
+    if len(estado["heap"]) > 2 * len(estado["zonas"]) + _FOLGA_HEAP:
+        _montar_heap_de_zonas(est, estado)
+        return
+    ordem = bisect.bisect_right(estado["inicios"], pos) - 1
+    inicio, fim = estado["zonas"][ordem]
+    heapq.heappush(estado["heap"], (vaga_mod.contarLivresEntre(est["vagas"], inicio, fim), ordem))
+
+_POLITICAS = {
+    "primeira": {"criar": lambda est: None, "escolher": _escolher_primeira,
+                 "liberou": _nada},
+    "menor_id": {"criar": _criar_heap_de_vagas(_chave_menor_id),
+                 "escolher": _escolher_do_heap, "liberou": _liberou_no_heap},
+    "proxima_entrada": {"criar": _criar_heap_de_vagas(_chave_distancia),
+                        "escolher": _escolher_do_heap, "liberou": _liberou_no_heap},
+    "rodizio": {"criar": _criar_rodizio, "escolher": _escolher_rodizio,
+                "liberou": _nada},
+    "por_zona": {"criar": _criar_por_zona, "escolher": _escolher_por_zona,
+                 "liberou": _liberou_por_zona},
+}
+
+"""
+    Nome: definir_politica(est, nome, **opcoes)
+
+    Objetivo:
+        Escolher a política de alocação do estacionamento (ver tabela acima)
+        e montar a estrutura dela.
+
+    Acoplamento:
+        - nome: str — chave de _POLITICAS.
+        - opcoes: distancias={id_vaga: distância} para "proxima_entrada"
+          (vagas sem distância ficam por último).
+        - est['politica']: {"nome": str, "estado": estrutura da política}.
+
+    Restrições:
+        - Levanta ValueError para política desconhecida.
+        - Monta a estrutura em O(n log n) (heaps) ou O(zonas); depois cada
+          alocação e liberação custa O(log n).
+        - "por_zona" usa os setores do momento da definição; redefinir a
+          política depois de mudar os setores.
+    """
+def definir_politica(est: dict, nome: str = "primeira", **opcoes) -> None:
+    if nome not in _POLITICAS:
+        raise ValueError(f"política de alocação desconhecida: {nome!r}.")
+    est["politica"] = {"nome": nome, "estado": _POLITICAS[nome]["criar"](est, **opcoes)}
+
+def _vaga_pela_politica(est: dict):
+    politica = est.get("politica")
+    if politica is None:
+        return get_vaga_disponivel(est)
+    pos = _POLITICAS[politica["nome"]]["escolher"](est, politica["estado"])
+    return est["vagas"][pos] if pos >= 0 else None
+
+def _avisar_liberacao(est: dict, id_vaga: int) -> None:
+    politica = est.get("politica")
+    if politica is not None:
+        pos = vaga_mod.posicaoPorId(est["vagas"], id_vaga)
+        _POLITICAS[politica["nome"]]["liberou"](est, politica["estado"], pos)
 
 """
     Nome: listar_estacionamentos(ests)
 
     Objetivo:
-        Exibir nome e vagas livres de cada estacionamento.
+        Exibir nome e vagas livres de cada estacionamento (e de cada
+        andar, se o estacionamento tiver setores).
     """
 def listar_estacionamentos(ests: list[dict]) -> None:
     print("\nEstacionamentos disponíveis:")
     for idx, e in enumerate(ests, 1):
         print(f"{idx}. {e['nome']} – Vagas livres: {_vagas_livres(e)}")
+        for caminho, livres in livres_por_setor(e):
+            print(f"     {caminho}: {livres} livres")
 
 """
     Nome: selecionar_estacionamento(ests)
@@ -445,12 +1199,31 @@ def getNome(estacionamento: dict) -> str:
 __all__ = [
     "get_vaga_disponivel",
     "buscar_vaga_por_login",
+    "ocupantes",
     "liberar_vaga_de",
     "ocupar_vaga_por_login",
+    "aplicar_eventos",
     "salvar_estado_em_csv",
     "criar_estacionamentos_de_csv",
+    "salvar_estacionamentos_binario",
+    "criar_estacionamentos_de_binario",
+    "abrir_snapshot",
+    "snapshot_vagas_livres",
+    "snapshot_estado_vaga",
+    "carregar_snapshot",
+    "fechar_snapshot",
+    "salvar_alteracoes",
+    "aplicar_alteracoes",
+    "zerar_alteracoes",
+    "definir_setores",
+    "carregar_setores_de_csv",
+    "vagas_livres_no_setor",
+    "livres_por_setor",
+    "vaga_livre_no_setor",
+    "ocupar_vaga_no_setor",
+    "setor_livre_mais_proximo",
+    "definir_politica",
     "listar_estacionamentos",
     "selecionar_estacionamento",
     "getNome",
 ]
->>>>>>> 6cc85dd154a8cd0119e83129a4d74f3ff9c8f22d:estacionamento.py
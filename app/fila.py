@@ -1,238 +1,831 @@
+import os
 import pathlib
 import csv
+import itertools
+from collections import deque
 import usuario
 
-# ---------------------------- variável global da fila ------------------------
-_FILA = []
+# ---------------------------- variáveis globais da fila ----------------------
+# Uma fila por estacionamento, mais a fila "qualquer estacionamento" (chave
+# None). Cada fila é um dict criado por _novaFila():
+#   "niveis" — lista de níveis de prioridade; niveis[t - 1] guarda o tipo t;
+#   "total"  — entradas presentes nos níveis (vivas + lápides);
+#   "mortas" — quantidade de lápides ainda presentes nos níveis.
+# Cada nível é um balde FIFO: {"entradas", "arvore", "proximo", "vivos"}.
+# "entradas" é um deque na ordem de chegada; "arvore" é uma árvore de Fenwick
+# (1-based) sobre os seq do nível, com 1 em cada seq ainda presente na fila;
+# "proximo" é o próximo seq a distribuir e "vivos" a quantidade de usuários
+# daquele tipo na fila.
+_FILAS = {}
+
+# Quantidade de níveis de prioridade (tipos 1..quantidade). Ampliável para
+# novos níveis (ex.: acessibilidade, staff) sem encarecer as inserções.
+_CONFIG_NIVEIS = {"quantidade": 3}
+
+# Cada entrada é um _Entrada (registro compacto com __slots__):
+#   login, tipo — só o necessário para ordenar e persistir; o registro
+#             completo do usuário é resolvido sob demanda (_resolverUsuario);
+#   seq     — ordem de chegada dentro do tipo, na própria fila (0, 1, 2 …);
+#             indexa a árvore de Fenwick do nível;
+#   chegada — ordem global de chegada, usada para comparar entradas de filas
+#             diferentes (ex.: fila do estacionamento × fila "qualquer");
+#   fila    — chave da fila em _FILAS;
+#   viva    — False marca uma lápide: já saiu da fila, mas ainda ocupa
+#             espaço no deque até chegar à frente ou até a próxima
+#             compactação.
+class _Entrada:
+    __slots__ = ("login", "tipo", "seq", "chegada", "fila", "viva")
+
+    def __init__(self, login, tipo, seq, chegada, fila):
+        self.login = login
+        self.tipo = tipo
+        self.seq = seq
+        self.chegada = chegada
+        self.fila = fila
+        self.viva = True
+
+_CHEGADA = itertools.count()
+
+# Índice login → entrada viva. Um login está em no máximo uma fila; o índice
+# permite testar presença e remover por login sem percorrer nenhuma fila.
+_INDICE = {}
+
+# Remoção preguiçosa (lápides) e compactação automática: quando a proporção
+# de lápides em uma fila passa de "limiar", os níveis dela são reconstruídos
+# só com as entradas vivas. "preguicosa"=False volta à remoção imediata.
+_CONFIG_REMOCAO = {"preguicosa": True, "limiar": 0.5}
+_ESTATISTICAS = {"mortas": 0, "compactacoes": 0, "lapides_compactadas": 0,
+                 "lapides_no_topo": 0}
+
+# Diário (journal) de eventos da fila, ativado por abrirJournal(). Cada
+# entrada/saída é anexada a <snapshot>.journal; a cada "intervalo" eventos um
+# novo snapshot CSV é gravado e o diário recomeça vazio.
+_JOURNAL = {"snapshot": None, "arquivo": None, "eventos": 0,
+            "intervalo": 1000, "sincronizar": False}
+
+# ---------------------------------------------------------------------------
+# FUNCOES INTERNAS — árvore de Fenwick por nível
+def _fenwickAdicionar(arvore, i, delta):
+    while i < len(arvore):
+        arvore[i] += delta
+        i += i & -i
+
+def _fenwickPrefixo(arvore, i):
+    total = 0
+    while i > 0:
+        total += arvore[i]
+        i -= i & -i
+    return total
+
+def _fenwickCheia(n):
+    """Árvore de capacidade potência de 2 com as posições 1..n marcadas."""
+    capacidade = 1
+    while capacidade < n:
+        capacidade *= 2
+    arvore = [0] + [1 if i <= n else 0 for i in range(1, capacidade + 1)]
+    for i in range(1, capacidade + 1):
+        pai = i + (i & -i)
+        if pai <= capacidade:
+            arvore[pai] += arvore[i]
+    return arvore
+
+def _novoSeq(nivel):
+    """Reserva o próximo seq do nível e marca-o como presente na árvore."""
+    arvore = nivel["arvore"]
+    capacidade = len(arvore) - 1
+    if nivel["proximo"] == capacidade:
+        # Capacidade é sempre potência de 2: ao dobrar, os novos nós cobrem
+        # só posições vazias, exceto a raiz nova, que cobre a árvore inteira.
+        arvore.extend([0] * capacidade)
+        arvore[2 * capacidade] = nivel["vivos"]
+    seq = nivel["proximo"]
+    nivel["proximo"] += 1
+    nivel["vivos"] += 1
+    _fenwickAdicionar(arvore, seq + 1, 1)
+    return seq
+
+# ---------------------------------------------------------------------------
+# FUNCOES INTERNAS — filas em baldes por nível
+def _novoNivel():
+    return {"entradas": deque(), "arvore": [0, 0], "proximo": 0, "vivos": 0}
+
+def _novaFila():
+    return {"niveis": [_novoNivel() for _ in range(_CONFIG_NIVEIS["quantidade"])],
+            "total": 0, "mortas": 0}
+
+def _obterFila(chave):
+    fila = _FILAS.get(chave)
+    if fila is None:
+        fila = _FILAS[chave] = _novaFila()
+    return fila
+
+def _validarTipo(tipo):
+    if not isinstance(tipo, int) or not 1 <= tipo <= _CONFIG_NIVEIS["quantidade"]:
+        raise ValueError(f"tipo {tipo!r} fora dos níveis 1..{_CONFIG_NIVEIS['quantidade']}.")
+
+def _nivelDoTipo(fila, tipo):
+    """Nível (balde) do tipo; cria níveis que surgiram após configurarNiveis."""
+    _validarTipo(tipo)
+    niveis = fila["niveis"]
+    while len(niveis) < tipo:
+        niveis.append(_novoNivel())
+    return niveis[tipo - 1]
+
+def _enfileirar(fila, chave, login, tipo):
+    """Cria a entrada e a anexa ao fim do balde do seu tipo — O(1) + árvore."""
+    nivel = _nivelDoTipo(fila, tipo)
+    entrada = _Entrada(login, tipo, _novoSeq(nivel), next(_CHEGADA), chave)
+    nivel["entradas"].append(entrada)
+    fila["total"] += 1
+    _INDICE[login] = entrada
+    return entrada
+
+def _resolverUsuario(entrada):
+    """Registro completo do usuário da entrada (busca indexada por login em
+    usuario); sintetizado se não cadastrado."""
+    return (usuario.buscarUsuario(entrada.login)
+            or usuario.novo_usuario(entrada.login, "", entrada.tipo))
+
+def _adicionar(login, tipo, chave):
+    if login in _INDICE:
+        return -1
+    _registrarEntrada(_enfileirar(_obterFila(chave), chave, login, tipo))
+    return 0
+
+def _chaveGlobal(entrada):
+    return entrada.tipo, entrada.chegada
+
+def _desligar(entrada):
+    """Tira a entrada do índice e da árvore, transformando-a em lápide."""
+    del _INDICE[entrada.login]
+    nivel = _FILAS[entrada.fila]["niveis"][entrada.tipo - 1]
+    nivel["vivos"] -= 1
+    _fenwickAdicionar(nivel["arvore"], entrada.seq + 1, -1)
+    entrada.viva = False
+
+def _topo(fila):
+    """Primeira entrada viva da fila (descartando lápides da frente) ou None."""
+    for nivel in fila["niveis"]:
+        entradas = nivel["entradas"]
+        if entradas and not entradas[0].viva:
+            while entradas and not entradas[0].viva:
+                entradas.popleft()
+                fila["total"] -= 1
+                fila["mortas"] -= 1
+                _ESTATISTICAS["mortas"] -= 1
+                _ESTATISTICAS["lapides_no_topo"] += 1
+            _aparar(fila, nivel)
+            entradas = nivel["entradas"]
+        if entradas:
+            return entradas[0]
+    return None
+
+def _compactarNivel(fila, nivel):
+    """Descarta as lápides do nível e renumera seq 0..vivos-1 — O(entradas)."""
+    vivas = [e for e in nivel["entradas"] if e.viva]
+    descartadas = len(nivel["entradas"]) - len(vivas)
+    for seq, entrada in enumerate(vivas):
+        entrada.seq = seq
+    nivel["entradas"] = deque(vivas)
+    nivel["proximo"] = len(vivas)
+    nivel["arvore"] = _fenwickCheia(len(vivas))
+
+    fila["total"] -= descartadas
+    fila["mortas"] -= descartadas
+    _ESTATISTICAS["mortas"] -= descartadas
+    _ESTATISTICAS["lapides_compactadas"] += descartadas
+    return descartadas
+
+def _compactar(fila):
+    descartadas = sum(_compactarNivel(fila, nivel) for nivel in fila["niveis"])
+    _ESTATISTICAS["compactacoes"] += 1
+    return descartadas
+
+def _aparar(fila, nivel):
+    """Renumera o nível quando os seq distribuídos passam do dobro das
+    entradas presentes (ou o nível esvaziou): a árvore acompanha o tamanho
+    atual da fila, não o total de chegadas. Custo amortizado O(1) por saída."""
+    if nivel["proximo"] > 2 * len(nivel["entradas"]):
+        _compactarNivel(fila, nivel)
+        _ESTATISTICAS["compactacoes"] += 1
+
+def _caminhoJournal(caminho):
+    return str(pathlib.Path(caminho).with_suffix(".journal"))
+
+def _cortarLinhaIncompleta(caminho):
+    """Trunca o arquivo logo após a última quebra de linha: uma cauda sem
+    "\n" é um evento cortado por queda no meio da escrita. Lê só o fim do
+    arquivo; devolve True se havia o que cortar."""
+    try:
+        f = open(caminho, "rb+")
+    except FileNotFoundError:
+        return False
+    with f:
+        fim = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            bloco = min(pos, 4096)
+            f.seek(pos - bloco)
+            dados = f.read(bloco)
+            if pos == fim and dados.endswith(b"\n"):
+                return False
+            i = dados.rfind(b"\n")
+            if i >= 0:
+                f.truncate(pos - bloco + i + 1)
+                return True
+            pos -= bloco
+        if fim:
+            f.truncate(0)
+        return bool(fim)
+
+def _registrar(*evento):
+    """Anexa um evento ao diário (se ativo) e tira snapshot periódico."""
+    if _JOURNAL["snapshot"] is None:
+        return
+    if _JOURNAL["arquivo"] is None:             # abre só no primeiro evento
+        caminho = _caminhoJournal(_JOURNAL["snapshot"])
+        _cortarLinhaIncompleta(caminho)         # nunca anexar a um evento cortado
+        _JOURNAL["arquivo"] = open(caminho, "a", newline="", encoding="utf-8")
+    f = _JOURNAL["arquivo"]
+    csv.writer(f).writerow(evento)
+    f.flush()
+    if _JOURNAL["sincronizar"]:
+        os.fsync(f.fileno())
+    _JOURNAL["eventos"] += 1
+    if _JOURNAL["eventos"] >= _JOURNAL["intervalo"]:
+        salvar_fila_em_csv(_JOURNAL["snapshot"])
+
+def _registrarEntrada(entrada):
+    evento = ["+", entrada.login, entrada.tipo]
+    if entrada.fila is not None:
+        evento.append(entrada.fila)
+    _registrar(*evento)
+
+def _zerarFila():
+    _FILAS.clear()
+    _INDICE.clear()
+    for chave in _ESTATISTICAS:
+        _ESTATISTICAS[chave] = 0
+
+"""
+    Nome: estaNaFila(id_usuario)
+
+    Objetivo:
+        Informar se o login está em alguma fila, sem calcular sua posição.
+
+    Acoplamento:
+        - _INDICE: dict[str, dict].
+        - id_usuario: str — login a procurar.
+        - retorno: bool.
+
+    Condições de Acoplamento:
+        AE: id_usuario não vazio.
+        AS: True se o login está na fila, False caso contrário.
+
+    Descrição:
+        Consulta direta ao índice login → entrada.
+
+    Restrições:
+        - Acesso O(1), independente do tamanho e da quantidade de filas.
+"""
+def estaNaFila(id_usuario):
+    return id_usuario in _INDICE
 
 """
     Nome: consultarPosicaoNaFila(id_usuario)
 
     Objetivo:
-        Retornar a posição (base 1) do usuário ou –1 se ausente.
+        Retornar a posição (base 1) do usuário na fila em que está
+        ou –1 se ausente.
 
     Acoplamento:
-        - _FILA: list[dict] — cada dict tem 'login'.
+        - _INDICE: dict[str, dict].
+        - _FILAS: árvores de Fenwick por nível de cada fila.
         - id_usuario: str — login a procurar.
         - retorno: int.
 
     Condições de Acoplamento:
         AE: id_usuario não vazio.
-        AS: devolve posição correta (idx + 1) ou –1.
+        AS: devolve posição correta na ordem de prioridade ou –1.
 
     Descrição:
-        Itera enumerate(_FILA); compara getLogin(u) com id_usuario.
+        1) Localiza a entrada do usuário via _INDICE (ausente → –1).
+        2) Soma os usuários de todos os níveis mais prioritários ("vivos")
+           na mesma fila.
+        3) Acrescenta o prefixo da árvore do próprio nível até o seq do
+           usuário (quantos do mesmo tipo chegaram antes, incluindo ele).
 
     Hipóteses:
         - Logins são únicos.
 
     Restrições:
-        - Busca O(n).
+        - O(níveis + log n); remoções no meio da fila já são refletidas
+          pela árvore.
+        - A posição é relativa à fila do usuário (a de um estacionamento ou
+          a de "qualquer estacionamento"), não à soma de todas.
 """
 def consultarPosicaoNaFila(id_usuario):
-    for i, user in enumerate(_FILA):
-        if usuario.getLogin(user) == id_usuario:
-            return i + 1
-    return -1
+    entrada = _INDICE.get(id_usuario)
+    if entrada is None:
+        return -1
+    niveis = _FILAS[entrada.fila]["niveis"]
+    t = entrada.tipo - 1
+    antes = sum(nivel["vivos"] for nivel in niveis[:t])
+    return antes + _fenwickPrefixo(niveis[t]["arvore"], entrada.seq + 1)
 
 """
-    Nome: adicionarNaFila(usuario_obj)
+    Nome: adicionarNaFila(usuario_obj, estacionamento)
 
     Objetivo:
-        Inserir `usuario_obj` se ainda não estiver na fila.
+        Inserir `usuario_obj` se ainda não estiver em nenhuma fila.
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _FILAS, _INDICE.
         - usuario_obj: dict — chaves 'login', 'tipo'.
+        - estacionamento: str | None — nome do estacionamento desejado;
+          None = aceita qualquer estacionamento.
         - retorno: int — 0=sucesso, –1=já presente.
 
     Condições de Acoplamento:
-        AE: getTipo(usuario_obj) ∈ {1,2,3}.
-        AS: fila reordenada por prioridade após inserção.
+        AE: 1 <= getTipo(usuario_obj) <= quantidade de níveis (padrão 3).
+        AS: usuário inserido na fila escolhida respeitando prioridade e
+            ordem de chegada; _INDICE atualizado.
 
     Descrição:
-        1) Se login já presente → –1.
-        2) append(usuario_obj) → ordenarFilaPorPrioridade() → 0.
+        1) Se estaNaFila(login) → –1.
+        2) Obtém (ou cria) a fila do estacionamento.
+        3) Cria a entrada, reservando o próximo seq do nível (árvore de
+           Fenwick) e a próxima ordem global de chegada.
+        4) Anexa a entrada ao fim do deque do seu nível.
+        5) Registra o evento "+" no diário, se ativo → 0.
 
     Hipóteses:
         - Logins são únicos por usuário.
         - usuario_obj é dict válido com campos obrigatórios.
 
     Restrições:
-        - Busca O(n) para verificar duplicidade.
-        - Ordenação O(n log n) após inserção.
+        - Verificação de duplicidade O(1).
+        - Inserção no balde O(1); só a árvore de posições custa O(log n).
+        - Levanta ValueError se o tipo não corresponde a um nível.
 """
-def adicionarNaFila(usuario_obj):
-    if consultarPosicaoNaFila(usuario.getLogin(usuario_obj)) != -1:
-        return -1
+def adicionarNaFila(usuario_obj, estacionamento=None):
+    return _adicionar(usuario.getLogin(usuario_obj), usuario.getTipo(usuario_obj),
+                      estacionamento)
 
-    _FILA.append(usuario_obj)
-    ordenarFilaPorPrioridade()
-    return 0
+"""
+    Nome: adicionarVariosNaFila(usuarios, estacionamento)
+
+    Objetivo:
+        Inserir um lote de usuários de uma só vez (troca de turno, eventos).
+
+    Acoplamento:
+        - _FILAS, _INDICE.
+        - usuarios: iterável de dict — chaves 'login', 'tipo'.
+        - estacionamento: str | None — fila de destino de todo o lote.
+        - retorno: list[int] — um código por usuário, na ordem recebida:
+          0=inserido, –1=já presente (na fila ou repetido dentro do lote).
+
+    Condições de Acoplamento:
+        AE: cada getTipo(u) corresponde a um nível.
+        AS: mesma fila que resultaria de chamar adicionarNaFila(u) para cada
+            usuário, na ordem do lote.
+
+    Descrição:
+        1) Valida o tipo de todo o lote antes de alterar qualquer fila.
+        2) Uma passada: descarta logins já na fila ou já vistos no lote e
+           anexa cada novo usuário ao fim do balde do seu nível — a ordem
+           do lote é a ordem de chegada, então nada precisa ser reordenado —
+           registrando seu evento "+" no diário, se ativo, logo em seguida.
+
+    Restrições:
+        - O(k) nos baldes (+ O(k log n) nas árvores de posição).
+        - Levanta ValueError se algum tipo for inválido; nesse caso nenhum
+          usuário do lote é inserido.
+"""
+def adicionarVariosNaFila(usuarios, estacionamento=None):
+    usuarios = list(usuarios)
+    for u in usuarios:                           # valida antes de mexer na fila
+        _validarTipo(usuario.getTipo(u))
+
+    fila = _obterFila(estacionamento)
+    resultados = []
+    for u in usuarios:
+        login = usuario.getLogin(u)
+        if login in _INDICE:
+            resultados.append(-1)
+            continue
+        _registrarEntrada(_enfileirar(fila, estacionamento, login, usuario.getTipo(u)))
+        resultados.append(0)
+    return resultados
 
 """
     Nome: removerDaFila(id_usuario)
 
     Objetivo:
-        Remover usuário cujo login == id_usuario.
+        Remover usuário cujo login == id_usuario, em qualquer fila.
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _FILAS, _INDICE.
         - id_usuario: str.
         - retorno: int — 0 removido, –1 não achou.
 
     Condições de Acoplamento:
         AE: id_usuario não vazio.
-        AS: primeiro usuário com login correspondente é removido.
+        AS: usuário com login correspondente sai da fila; níveis e _INDICE
+            continuam consistentes.
 
     Descrição:
-        Percorre lista; del quando getLogin(u) coincide.
+        1) Obtém a entrada do login em _INDICE (ausente → –1).
+        2) Tira o login do índice e desmarca seu seq na árvore de Fenwick.
+        3) Modo preguiçoso (padrão): a entrada vira lápide no lugar, sem
+           mexer no deque; se a proporção de lápides da fila passar do
+           limiar, a fila é compactada.
+        4) Modo imediato: retira a entrada do deque do nível.
+        Em ambos os modos, quando os seq do nível passam do dobro das
+        entradas presentes (remoção imediata ou lápides descartadas do topo
+        em retornaPrimeiro), o nível é renumerado (_aparar): a árvore de
+        posições não cresce com o total de chegadas.
+        5) Registra o evento "-" no diário, se ativo.
 
     Hipóteses:
         - Logins são únicos na fila.
 
     Restrições:
-        - Busca e remoção O(n).
+        - Localização O(1); árvore atualizada em O(log n).
+        - Deque: nenhuma movimentação no modo preguiçoso, O(n) no imediato.
 """
 def removerDaFila(id_usuario):
-    for i, u in enumerate(_FILA):
-        if usuario.getLogin(u) == id_usuario:
-            del _FILA[i]
-            return 0
-    return -1
+    entrada = _INDICE.get(id_usuario)
+    if entrada is None:
+        return -1
+    fila = _FILAS[entrada.fila]
+    _desligar(entrada)
+    if not _CONFIG_REMOCAO["preguicosa"]:
+        nivel = fila["niveis"][entrada.tipo - 1]
+        nivel["entradas"].remove(entrada)
+        fila["total"] -= 1
+        _aparar(fila, nivel)
+    else:
+        fila["mortas"] += 1
+        _ESTATISTICAS["mortas"] += 1
+        if fila["mortas"] > _CONFIG_REMOCAO["limiar"] * fila["total"]:
+            _compactar(fila)
+    _registrar("-", id_usuario)
+    return 0
 
 """
-    Nome: ordenarFilaPorPrioridade()
+    Nome: compactarFila()
 
     Objetivo:
-        Ordenar in-place pelo campo 'tipo':
-        1 primeiro, depois 2.
+        Descartar as lápides acumuladas e renumerar os seq de cada nível,
+        em todas as filas.
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _FILAS, _ESTATISTICAS.
+        - retorno: int — quantidade de lápides descartadas.
 
     Condições de Acoplamento:
-        AE: _FILA lista válida.
-        AS: fila reordenada por prioridade.
+        AE: estruturas da fila consistentes.
+        AS: cada deque contém apenas entradas vivas; seq de cada nível volta
+            a ser 0..vivos-1; árvores reconstruídas.
 
     Descrição:
-        list.sort(key=lambda u: getTipo(u)) — sort do Python é estável.
+        Para cada fila e cada nível:
+        1) Filtra as entradas vivas (a ordem do deque já é a de chegada).
+        2) Renumera seq e reconstrói a árvore de Fenwick em O(n).
+        3) Atualiza as estatísticas de compactação.
 
     Hipóteses:
-        - Todos os usuários têm campo 'tipo' válido.
-        - Tipos são valores numéricos ordenáveis.
+        - Chamada automática (por fila) em removerDaFila; pode ser chamada
+          à mão. Um nível também é renumerado sozinho por _aparar quando seus
+          seq passam do dobro das entradas presentes.
 
     Restrições:
-        - Ordenação O(n log n).
-        - Modifica _FILA in-place.
+        - O(n); com limiar λ, ocorre no máximo a cada λ·n remoções.
+"""
+def compactarFila():
+    return sum(_compactar(fila) for fila in _FILAS.values())
+
+"""
+    Nome: configurarRemocao(preguicosa, limiar)
+
+    Objetivo:
+        Ajustar o modo de remoção e o limiar de compactação automática.
+
+    Acoplamento:
+        - preguicosa: bool | None — True usa lápides; None mantém o atual.
+        - limiar: float | None — proporção de lápides (0..1) que dispara a
+          compactação; None mantém o atual.
+
+    Condições de Acoplamento:
+        AE: 0 <= limiar < 1.
+        AS: _CONFIG_REMOCAO atualizado; lápides pendentes são compactadas
+            ao desligar o modo preguiçoso.
+
+    Restrições:
+        - Levanta ValueError para limiar fora do intervalo.
+"""
+def configurarRemocao(preguicosa=None, limiar=None):
+    if limiar is not None:
+        if not 0 <= limiar < 1:
+            raise ValueError("limiar deve estar em [0, 1).")
+        _CONFIG_REMOCAO["limiar"] = limiar
+    if preguicosa is not None:
+        _CONFIG_REMOCAO["preguicosa"] = preguicosa
+        if not preguicosa and _ESTATISTICAS["mortas"]:
+            compactarFila()
+
+"""
+    Nome: configurarNiveis(quantidade)
+
+    Objetivo:
+        Definir quantos níveis de prioridade (tipos 1..quantidade) a fila
+        aceita — ex.: acrescentar acessibilidade e staff.
+
+    Acoplamento:
+        - quantidade: int — número de níveis (>= 1).
+        - _CONFIG_NIVEIS, _FILAS.
+
+    Condições de Acoplamento:
+        AE: nenhum usuário na fila com tipo > quantidade.
+        AS: novos usuários podem ter tipo em 1..quantidade; filas existentes
+            ganham os níveis novos sob demanda.
+
+    Restrições:
+        - Levanta ValueError se quantidade < 1 ou se algum nível que seria
+          removido ainda tem usuários.
+        - Mais níveis só encarecem retornaPrimeiro (O(níveis)); inserções
+          continuam O(1) nos baldes.
+"""
+def configurarNiveis(quantidade: int) -> None:
+    if quantidade < 1:
+        raise ValueError("quantidade de níveis deve ser ao menos 1.")
+    for fila in _FILAS.values():
+        if any(nivel["vivos"] for nivel in fila["niveis"][quantidade:]):
+            raise ValueError("há usuários na fila em níveis acima de "
+                             f"{quantidade}.")
+    for fila in _FILAS.values():
+        fila["total"] -= sum(len(n["entradas"]) for n in fila["niveis"][quantidade:])
+        fila["mortas"] -= sum(len(n["entradas"]) for n in fila["niveis"][quantidade:])
+        del fila["niveis"][quantidade:]
+    _ESTATISTICAS["mortas"] = sum(f["mortas"] for f in _FILAS.values())
+    _CONFIG_NIVEIS["quantidade"] = quantidade
+
+"""
+    Nome: estatisticasCompactacao()
+
+    Objetivo:
+        Expor contadores de lápides e compactações para ajuste do limiar.
+
+    Acoplamento:
+        - retorno: dict — cópia com as chaves:
+            mortas, proporcao_mortas, limiar, preguicosa, compactacoes,
+            lapides_compactadas, lapides_no_topo.
+
+    Restrições:
+        - Não modifica a fila.
+"""
+def estatisticasCompactacao():
+    estat = dict(_ESTATISTICAS)
+    total = sum(f["total"] for f in _FILAS.values())
+    estat["proporcao_mortas"] = estat["mortas"] / total if total else 0.0
+    estat.update(_CONFIG_REMOCAO)
+    return estat
+
+"""
+    Nome: ordenarFilaPorPrioridade()
+
+    Objetivo:
+        Garantir a ordem por prioridade ('tipo': 1 primeiro, depois 2),
+        preservando a ordem de chegada dentro do mesmo tipo.
+
+    Acoplamento:
+        - _FILAS: níveis de cada fila.
+
+    Condições de Acoplamento:
+        AE: _FILAS consistente.
+        AS: filas em ordem de prioridade.
+
+    Descrição:
+        Nada a fazer: cada nível é um balde FIFO e os níveis são percorridos
+        em ordem de prioridade, então a fila está sempre ordenada. Mantida
+        por compatibilidade com chamadores antigos.
+
+    Restrições:
+        - O(1); não modifica a fila.
 """
 def ordenarFilaPorPrioridade():
-    if len(_FILA) > 1:
-        _FILA.sort(key=lambda u: usuario.getTipo(u))
+    return None
 
 """
-    Nome: retornaPrimeiro()
+    Nome: retornaPrimeiro(estacionamento)
 
     Objetivo:
-        Obter o primeiro elemento sem removê-lo.
+        Obter o próximo usuário a ser chamado, sem removê-lo.
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _FILAS: níveis de cada fila.
+        - estacionamento: str | None — nome do estacionamento onde surgiu a
+          vaga; None = primeiro entre todas as filas.
         - retorno: dict | None.
 
     Condições de Acoplamento:
-        AE: _FILA lista válida.
-        AS: devolve primeiro elemento ou None se vazia.
+        AE: _FILAS consistente.
+        AS: devolve o usuário de maior prioridade apto à vaga ou None.
 
     Descrição:
-        Acessa _FILA[0] se não vazia, senão retorna None.
+        1) Candidatas: fila do estacionamento e fila "qualquer
+           estacionamento" (ou todas as filas, se None).
+        2) Em cada candidata, a frente do primeiro nível não vazio,
+           descartando lápides pelo caminho.
+        3) Escolhe o menor (tipo, chegada) — prioridade primeiro, depois
+           quem chegou antes, mesmo entre filas diferentes.
+        4) Resolve o login escolhido para o registro completo via
+           usuario.buscarUsuario (índice por login); sem cadastro (ex.:
+           convidado), devolve novo_usuario(login, "", tipo).
 
     Hipóteses:
-        - Fila mantém ordenação por prioridade.
+        - Níveis percorridos do mais prioritário (tipo 1) para o menos.
 
     Restrições:
-        - Acesso O(1).
-        - Não modifica a fila.
+        - Com estacionamento: O(níveis) sem lápides na frente; não consulta
+          filas de outros estacionamentos.
+        - Sem estacionamento: O(filas · níveis).
+        - Não altera o conjunto de usuários na fila.
+        - A resolução é uma consulta O(1) ao índice por login de usuario,
+          só para o usuário devolvido; login sem cadastro (ou inserido
+          direto em usuario.usuarios) cai na busca linear, O(u).
 """
-def retornaPrimeiro():
-    return _FILA[0] if _FILA else None
+def retornaPrimeiro(estacionamento=None):
+    if estacionamento is None:
+        candidatas = list(_FILAS.values())
+    else:
+        candidatas = [_FILAS.get(estacionamento), _FILAS.get(None)]
+
+    melhor = None
+    for fila in candidatas:
+        topo = _topo(fila) if fila is not None else None
+        if topo is not None and (melhor is None or _chaveGlobal(topo) < _chaveGlobal(melhor)):
+            melhor = topo
+    return _resolverUsuario(melhor) if melhor else None
 
 """
     Nome: tamanhoFila()
 
     Objetivo:
-        Retornar o número de usuários na fila.
+        Retornar o número de usuários na fila (somando todas as filas).
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _INDICE: dict[str, dict] — só contém usuários vivos.
         - retorno: int.
 
     Condições de Acoplamento:
-        AE: _FILA lista válida.
-        AS: devolve tamanho da fila.
+        AE: _INDICE consistente com _FILAS.
+        AS: devolve tamanho da fila (sem contar lápides).
 
     Descrição:
-        Retorna len(_FILA).
+        Retorna len(_INDICE).
 
     Hipóteses:
-        - _FILA é lista Python válida.
+        - _INDICE é dict Python válido.
 
     Restrições:
         - Acesso O(1).
         - Não modifica a fila.
 """
 def tamanhoFila():
-    return len(_FILA)
+    return len(_INDICE)
 
 """
     Nome: esvaziarFila()
 
     Objetivo:
-        Limpar todos os elementos da fila.
+        Limpar todos os elementos de todas as filas.
 
     Acoplamento:
-        - _FILA: list[dict].
+        - _FILAS, _INDICE, _ESTATISTICAS.
 
     Condições de Acoplamento:
-        AE: _FILA lista válida.
-        AS: _FILA fica vazia.
+        AE: _FILAS consistente.
+        AS: nenhuma fila, nenhum login indexado.
 
     Descrição:
-        Chama clear() na lista da fila.
+        Descarta as filas (níveis e árvores de Fenwick — os seq recomeçam do
+        zero) e o índice de logins; zera as estatísticas de compactação.
+        Registra o evento "x" no diário, se ativo.
 
     Restrições:
         - Chamada típica no final da aplicação.
 """
+def esvaziarFila():
+    _zerarFila()
+    _registrar("x")
+
+"""
+    Nome: abrirJournal(caminho, intervalo, sincronizar)
+
+    Objetivo:
+        Tornar cada alteração da fila durável com custo O(1), anexando-a a um
+        diário em vez de regravar o CSV inteiro.
+
+    Acoplamento:
+        - caminho: str — CSV de snapshot; o diário fica ao lado, com a
+          extensão .journal (ex.: fila.csv → fila.journal).
+        - intervalo: int — eventos entre dois snapshots automáticos.
+        - sincronizar: bool — se True, os.fsync() após cada evento.
+        - _JOURNAL: estado do diário.
+
+    Condições de Acoplamento:
+        AE: fila já carregada de `caminho` (carregar_fila_de_csv).
+        AS: entradas ("+,login,tipo[,estacionamento]"), saídas ("-,login")
+            e esvaziamentos ("x") passam a ser anexados ao diário.
+
+    Descrição:
+        1) Fecha um diário anterior, se houver.
+        2) Guarda caminho e parâmetros; o arquivo só é aberto no primeiro
+           evento (modo append), depois de descartada uma última linha
+           cortada por queda.
+
+    Restrições:
+        - Levanta ValueError se intervalo < 1.
+        - Sem sincronizar, um evento pode se perder numa queda do sistema
+          operacional (mas não numa queda do processo).
+"""
+def abrirJournal(caminho: str = "fila.csv", intervalo: int = 1000,
+                 sincronizar: bool = False) -> None:
+    if intervalo < 1:
+        raise ValueError("intervalo deve ser ao menos 1.")
+    fecharJournal()
+    pathlib.Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    _JOURNAL.update(snapshot=caminho, eventos=0, intervalo=intervalo,
+                    sincronizar=sincronizar)
+
+"""
+    Nome: fecharJournal()
+
+    Objetivo:
+        Desativar o diário e fechar o arquivo, se aberto.
+
+    Restrições:
+        - Não grava snapshot; chamar salvar_fila_em_csv antes, se desejado.
+"""
+def fecharJournal() -> None:
+    if _JOURNAL["arquivo"] is not None:
+        _JOURNAL["arquivo"].close()
+    _JOURNAL.update(snapshot=None, arquivo=None, eventos=0)
 
 # ---------------------------------------------------------------------------
 def salvar_fila_em_csv(caminho: str = "fila.csv") -> None:
     """
-    Grava o conteúdo atual de `_FILA` em CSV.
+    Grava o conteúdo atual das filas em CSV.
 
     Formato de cada linha:
-        login_usuario , tipo_usuario
+        login_usuario , tipo_usuario [, estacionamento]
 
+    • Sem a 3ª coluna, o usuário aceita qualquer estacionamento.
     • A posição das linhas preserva a ordem da fila
-      (quem está no topo é escrito primeiro).
-    • Cria/overwrite o arquivo informado.
+      (quem está no topo é escrito primeiro): ordem (tipo, chegada), que
+      também preserva a ordem relativa entre filas diferentes.
+    • Cria/overwrite o arquivo informado, via arquivo temporário +
+      os.replace (um snapshot nunca fica pela metade).
+    • Lápides são ignoradas; a ordem entre filas diferentes vem de
+      sorted() — O(n log n).
+    • Se o diário estiver ativo para este caminho, ele é zerado: o snapshot
+      passa a conter todos os eventos registrados até aqui.
     """
     # garante que o diretório exista (evita FileNotFoundError em sub-pastas)
     pathlib.Path(caminho).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(caminho, "w", newline="", encoding="utf-8") as f:
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", newline="", encoding="utf-8") as f:
         w = csv.writer(f)
-        for u in _FILA:
-            w.writerow([usuario.getLogin(u), usuario.getTipo(u)])
+        for e in sorted(_INDICE.values(), key=_chaveGlobal):
+            linha = [e.login, e.tipo]
+            if e.fila is not None:
+                linha.append(e.fila)
+            w.writerow(linha)
+    os.replace(temporario, caminho)
+
+    if _JOURNAL["snapshot"] == caminho:
+        if _JOURNAL["arquivo"] is not None:
+            _JOURNAL["arquivo"].close()
+            _JOURNAL["arquivo"] = None
+        open(_caminhoJournal(caminho), "w", encoding="utf-8").close()
+        _JOURNAL["eventos"] = 0
 
 
 def carregar_fila_de_csv(caminho: str = "fila.csv") -> None:
     """
-    Lê o arquivo CSV (caso exista) e repopula `_FILA`.
+    Lê o arquivo CSV (caso exista) e repopula as filas.
 
+    • A ordem das linhas define a ordem de chegada (seq) de cada usuário.
+    • Guarda só login e tipo de cada linha; nenhum dict de usuário é criado.
+    • 3ª coluna opcional: estacionamento desejado (vazia/ausente = qualquer).
     • Linhas vazias ou mal-formadas são ignoradas.
     • Se o arquivo não existir, apenas mantém fila vazia.
+    • Em seguida reaplica o diário (<caminho>.journal), se existir: o
+      estado final é o último snapshot + os eventos posteriores a ele.
     """
-    _FILA.clear()                              # zera estado anterior
+    _zerarFila()                               # zera estado anterior
     try:
         with open(caminho, newline="", encoding="utf-8") as f:
             for row in csv.reader(f):
@@ -243,7 +836,37 @@ def carregar_fila_de_csv(caminho: str = "fila.csv") -> None:
                     tipo = int(tipo_s)
                 except ValueError:
                     continue                   # linha mal-formada
-                _FILA.append(usuario.novo_usuario(login, "", tipo))
+                if login in _INDICE or not 1 <= tipo <= _CONFIG_NIVEIS["quantidade"]:
+                    continue                   # repetido ou tipo sem nível
+                chave = (row[2].strip() or None) if len(row) > 2 else None
+                _enfileirar(_obterFila(chave), chave, login, tipo)
     except FileNotFoundError:
         # ok – primeira execução, fila ainda não foi criada
-        pass
\ No newline at end of file
+        pass
+    _reaplicarJournal(_caminhoJournal(caminho))
+
+
+def _reaplicarJournal(caminho_journal: str) -> None:
+    """Reaplica os eventos do diário sobre a fila recém-carregada; um último
+    evento sem quebra de linha (escrita interrompida) é descartado do arquivo
+    antes da leitura."""
+    _cortarLinhaIncompleta(caminho_journal)
+    snapshot = _JOURNAL["snapshot"]
+    _JOURNAL["snapshot"] = None                # reaplicar não gera eventos
+    try:
+        with open(caminho_journal, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if row == ["x"]:
+                    _zerarFila()
+                elif len(row) == 2 and row[0] == "-":
+                    removerDaFila(row[1])
+                elif len(row) in (3, 4) and row[0] == "+":
+                    chave = row[3] if len(row) == 4 else None
+                    try:
+                        _adicionar(row[1], int(row[2]), chave)
+                    except ValueError:
+                        continue               # linha truncada ou tipo sem nível
+    except FileNotFoundError:
+        pass
+    finally:
+        _JOURNAL["snapshot"] = snapshot
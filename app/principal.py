@@ -3,6 +3,7 @@
 # Módulo principal do sistema de gerenciamento de estacionamento
 # -----------------------------------------------------------------------------
 import csv
+import os
 import sys
 import usuario as usuario_mod
 import fila as fila_mod
@@ -12,6 +13,16 @@ import estacionamento as est_mod
 ESTACIONAMENTOS = []
 USUARIO_ATUAL = None
 
+# Índice global login → (estacionamento, id da vaga) de quem está
+# estacionado, em qualquer estacionamento. Construído em IniciarSistema e
+# mantido a cada alocação/liberação.
+OCUPANTES = {}
+
+# Salvamento incremental: linhas no arquivo de alterações desde o último
+# salvamento completo. Passado o limite, SalvarCheckpoint grava tudo de novo
+# (CSV + snapshot binário) e recomeça o arquivo de alterações vazio.
+CHECKPOINT = {"alteracoes": 0, "limite": 10_000}
+
 # Mapa simples de erros para mensagens
 ERROS = {
     "OPCAO_INVALIDA" : "Opção inválida!",
@@ -22,6 +33,24 @@ ERROS = {
 }
 
 # ------------------------------ rotinas chave -------------------------------
+"""
+    Nome: _snapshotAtual(caminho_bin, caminho_csv)
+
+    Objetivo:
+        Dizer se o snapshot binário pode substituir o CSV: existe e foi
+        gravado depois (ou junto) dele. Um CSV editado à mão depois do
+        último encerramento tem precedência.
+"""
+def _snapshotAtual(caminho_bin, caminho_csv):
+    try:
+        gravado = os.path.getmtime(caminho_bin)
+    except OSError:
+        return False
+    try:
+        return gravado >= os.path.getmtime(caminho_csv)
+    except OSError:
+        return True
+
 """
     Nome: IniciarSistema()
 
@@ -41,8 +70,16 @@ ERROS = {
 
     Descrição:
         1) Carrega usuários recorrentes (tipo 1) e convidados (tipo 2).
-        2) Constrói objetos Estacionamento a partir do CSV de estado.
-        3) Exibe mensagem de sucesso.
+        2) Carrega a fila (snapshot + diário) e ativa o diário, para que
+           cada alteração da fila seja persistida na hora.
+        3) Constrói os estacionamentos a partir do snapshot binário
+           (estacionamentos.bin) quando ele existe e não é mais antigo que o
+           CSV de estado; senão, ou se o snapshot for inválido, do CSV.
+           Em seguida reaplica estacionamentos.patch (pontos de controle
+           incrementais gravados depois do último salvamento completo) e
+           define andares/zonas a partir de setores.csv, se existir.
+        4) Monta o índice global OCUPANTES a partir das vagas ocupadas.
+        5) Exibe mensagem de sucesso.
 
     Hipóteses:
         - Funções usuario_mod.carregarUsuarios e est_mod.criarEstacionamentosDeCSV
@@ -52,16 +89,33 @@ ERROS = {
         - Deve ser chamada uma única vez, logo no início do programa.
 """
 def IniciarSistema():
-    global ESTACIONAMENTOS
+    global ESTACIONAMENTOS, OCUPANTES
 
     # 1. Carregar usuários e convidados
     usuario_mod.carregarUsuarios("users.csv")
     usuario_mod.carregarUsuarios("guests.csv", tipo_padrao=2)
 
     fila_mod.carregar_fila_de_csv("fila.csv")
-
-    # 2. Estacionamentos 
-    ESTACIONAMENTOS = est_mod.criar_estacionamentos_de_csv("estacionamentos.csv")
+    fila_mod.abrirJournal("fila.csv")
+
+    # 2. Estacionamentos: snapshot binário, se não for mais velho que o CSV
+    ESTACIONAMENTOS = None
+    if _snapshotAtual("estacionamentos.bin", "estacionamentos.csv"):
+        try:
+            ESTACIONAMENTOS = est_mod.criar_estacionamentos_de_binario("estacionamentos.bin")
+        except (OSError, ValueError) as erro:
+            print(f"Snapshot binário ignorado ({erro}); lendo o CSV.")
+    if ESTACIONAMENTOS is None:
+        ESTACIONAMENTOS = est_mod.criar_estacionamentos_de_csv("estacionamentos.csv")
+    CHECKPOINT["alteracoes"] = est_mod.aplicar_alteracoes(ESTACIONAMENTOS,
+                                                          "estacionamentos.patch")
+    est_mod.carregar_setores_de_csv(ESTACIONAMENTOS, "setores.csv")
+
+    # 3. Índice de quem está estacionado (login repetido: vale o primeiro)
+    OCUPANTES = {}
+    for est in ESTACIONAMENTOS:
+        for login, id_vaga in est_mod.ocupantes(est):
+            OCUPANTES.setdefault(login, (est, id_vaga))
 
     print("✅ Sistema iniciado com sucesso.")
 
@@ -139,6 +193,7 @@ def MenuInicial():
     Descrição:
         Constrói dicionário {opção: função}.  
         Mostra menu, lê escolha, despacha para a rotina adequada ou exibe erro.
+        Após cada operação, grava um ponto de controle (SalvarCheckpoint).
 
     Hipóteses:
         - USUARIO_ATUAL continuará válido durante a sessão.
@@ -164,6 +219,7 @@ def ExibirMenuPrincipal():
         acao = opcoes.get(escolha)
         if acao:
             acao()
+            SalvarCheckpoint()
         else:
             TratarErros("OPCAO_INVALIDA")
 
@@ -222,37 +278,43 @@ def AutenticarUsuario():
         AS: Vaga ocupada ou usuário inserido na FILA.
 
     Descrição:
-        1) Verifica autenticação.  
+        1) Verifica autenticação e rejeita quem já está estacionado
+           (consulta O(1) a OCUPANTES, sem percorrer os estacionamentos).  
         2) Permite escolha do estacionamento.  
-        3) Se get_vaga_disponivel == –1 → GerenciaFila + erro “SEM_VAGAS”.  
-        4) Caso contrário → ocupar_vaga_por_login() e confirmar.
+        3) Se get_vaga_disponivel == –1 → GerenciaFila (fila do estacionamento
+           escolhido) + erro “SEM_VAGAS”.  
+        4) Caso contrário → ocupar_vaga_por_login() (a política do
+           estacionamento escolhe a vaga); se ocupou, registrar em OCUPANTES
+           e confirmar com o id devolvido; se não, tratar como no passo 3.
 
     Hipóteses:
-        - ocupar_vaga_por_login() devolve tupla(sucesso,id); usamos apenas efeito.
+        - ocupar_vaga_por_login() devolve tupla(sucesso,id).
     """
 def AlocarVaga():
     if USUARIO_ATUAL is None:
         TratarErros("NAO_AUTENTICADO")
         return
     
-    for est in ESTACIONAMENTOS: 
-        if est_mod.buscar_vaga_por_login(est, usuario_mod.getLogin(USUARIO_ATUAL)) is not None:
-            print("Você já está alocado em uma vaga!")
-            return
+    login = usuario_mod.getLogin(USUARIO_ATUAL)
+    if login in OCUPANTES:
+        print("Você já está alocado em uma vaga!")
+        return
     
     est = est_mod.selecionar_estacionamento(ESTACIONAMENTOS)
     if not est:
         print("Nenhum estacionamento selecionado.")
         return
 
-    vaga = est_mod.get_vaga_disponivel(est)
-    if vaga is None:
-        GerenciaFila(USUARIO_ATUAL)
+    ok = False
+    if est_mod.get_vaga_disponivel(est) is not None:
+        ok, id_vaga = est_mod.ocupar_vaga_por_login(est, login)
+    if not ok:
+        GerenciaFila(USUARIO_ATUAL, est)
         TratarErros("SEM_VAGAS")
-    else:
-        est_mod.ocupar_vaga_por_login(est, usuario_mod.getLogin(USUARIO_ATUAL))
-        fila_mod.removerDaFila(usuario_mod.getLogin(USUARIO_ATUAL))
-        print(f"✅ Vaga {vaga['id']} ocupada. Boa estadia!")
+        return
+    OCUPANTES[login] = (est, id_vaga)
+    fila_mod.removerDaFila(login)
+    print(f"✅ Vaga {id_vaga} ocupada. Boa estadia!")
 
 """
     Nome: LiberarVaga()
@@ -269,10 +331,10 @@ def AlocarVaga():
         AS: Vaga liberada ou erro VAGA_NAO_ENCONTRADA.
 
     Descrição:
-        Itera todos os estacionamentos:  
-        • se liberar_vaga_de() devolver id → imprime sucesso e chama
-          AtualizarEstado(est).  
-        • se nenhum estacionamento contiver o usuário → erro.
+        Consulta OCUPANTES para achar o estacionamento do usuário:  
+        • se liberar_vaga_de() devolver id → retira do índice, imprime
+          sucesso e chama AtualizarEstado(est).  
+        • se o usuário não estiver no índice (ou a vaga não o tiver) → erro.
 
     Hipóteses:
         - Cada usuário ocupa no máximo uma vaga.
@@ -282,49 +344,54 @@ def LiberarVaga():
         TratarErros("NAO_AUTENTICADO")
         return
 
-    for est in ESTACIONAMENTOS:
-        vaga_id = est_mod.liberar_vaga_de(est, USUARIO_ATUAL)
-        if vaga_id is not None:
-            print(f"✅ Vaga {vaga_id} liberada no estacionamento '{est_mod.getNome(est)}'.")
-            AtualizarEstado(est)
-            return
+    local = OCUPANTES.pop(usuario_mod.getLogin(USUARIO_ATUAL), None)
+    vaga_id = est_mod.liberar_vaga_de(local[0], USUARIO_ATUAL) if local else None
+    if vaga_id is None:
+        TratarErros("VAGA_NAO_ENCONTRADA")
+        return
 
-    TratarErros("VAGA_NAO_ENCONTRADA")
+    est = local[0]
+    print(f"✅ Vaga {vaga_id} liberada no estacionamento '{est_mod.getNome(est)}'.")
+    AtualizarEstado(est)
 
 """
-    Nome: GerenciaFila(usuario)
+    Nome: GerenciaFila(usuario, est)
 
     Objetivo:
         Garantir que `usuario` esteja na fila exatamente uma vez, ordenada
         por prioridade (.tipo).
 
     Acoplamento:
-        - fila_mod.consultarPosicaoNaFila, adicionarNaFila.
+        - fila_mod.estaNaFila, adicionarNaFila.
+        - est: estacionamento desejado ou None (aceita qualquer um).
 
     Condições de Acoplamento:
         AE: fila do módulo fila_mod inicializada.
         AS: fila contém usuário e está ordenada.
 
     Descrição:
-        Se consultarPosicaoNaFila == –1 → adicionarNaFila().
+        Se não estaNaFila (consulta O(1) ao índice) → adicionarNaFila() na
+        fila do estacionamento escolhido.
 
     Hipóteses:
         - Prioridade: tipo 1 < 2.
     """
-def GerenciaFila(usuario):
-    if fila_mod.consultarPosicaoNaFila(usuario_mod.getLogin(usuario)) == -1:
-        fila_mod.adicionarNaFila(usuario)
+def GerenciaFila(usuario, est=None):
+    if not fila_mod.estaNaFila(usuario_mod.getLogin(usuario)):
+        nome = est_mod.getNome(est) if est is not None else None
+        fila_mod.adicionarNaFila(usuario, nome)
 
 """
     Nome: AtualizarEstado(est)
 
     Objetivo:
-        Após liberação de vaga, chamar o primeiro da fila (se houver).
+        Após liberação de vaga, chamar o primeiro da fila (se houver) entre
+        quem aguarda este estacionamento ou qualquer estacionamento.
 
     Acoplamento:
         - est: Estacionamento onde surgiu vaga.
         - est.getVagaDisponivel() / ocuparVagaPorLogin().
-        - fila_mod.retornaPrimeiro / removerDaFila.
+        - fila_mod.retornaPrimeiro(nome) / removerDaFila.
 
     Condições de Acoplamento:
         AE: est válido; fila do módulo fila_mod inicializada.
@@ -332,8 +399,10 @@ def GerenciaFila(usuario):
 
     Descrição:
         1) Verificar vaga livre.  
-        2) Se existir, pegar primeiro da fila.  
-        3) Tentar ocupar; se sucesso → removerDaFila + mensagem.
+        2) Se existir, pegar primeiro da fila do estacionamento (sem
+           percorrer as filas dos demais estacionamentos).  
+        3) Tentar ocupar; se sucesso → removerDaFila, registrar em
+           OCUPANTES + mensagem.
 
     Hipóteses:
         - ocuparVagaPorLogin() retorna (sucesso, id).
@@ -344,14 +413,81 @@ def AtualizarEstado(est):
         print("Vaga não existe")
         return
 
-    prox = fila_mod.retornaPrimeiro()
+    prox = fila_mod.retornaPrimeiro(est_mod.getNome(est))
     if prox is not None:
         print(f"Peguei um prox, {usuario_mod.getLogin(prox)}")
         ok, id_vaga = est_mod.ocupar_vaga_por_login(est, usuario_mod.getLogin(prox))
         if ok:
             fila_mod.removerDaFila(usuario_mod.getLogin(prox))
+            OCUPANTES[usuario_mod.getLogin(prox)] = (est, id_vaga)
             print(f"🔔 Usuário {usuario_mod.getLogin(prox)} foi chamado para ocupar a vaga {id_vaga}.")
 
+"""
+    Nome: AplicarEventosSensores(est, eventos)
+
+    Objetivo:
+        Aplicar um lote de eventos de sensores (est_mod.aplicar_eventos) e
+        manter o sistema coerente: OCUPANTES reflete as vagas ocupadas e
+        liberadas pelo lote, e a fila é chamada para as vagas liberadas.
+
+    Acoplamento:
+        - eventos: iterável de (id_vaga, login | 0 | None | "0").
+        - retorno: list[tuple(int, str)] — conflitos, como em
+          est_mod.aplicar_eventos.
+
+    Condições de Acoplamento:
+        AE: est pertence a ESTACIONAMENTOS.
+        AS: OCUPANTES atualizado; AtualizarEstado(est) uma vez por vaga
+            liberada enquanto houver vaga livre e alguém na fila.
+
+    Descrição:
+        1) Guardar o estado, antes do lote, de cada vaga citada.
+        2) Aplicar o lote.
+        3) Comparar antes × depois por vaga: quem saiu deixa OCUPANTES,
+           quem entrou é registrado e sai da fila; vagas que terminam livres
+           contam como liberadas (ocupar e liberar no mesmo lote se anulam).
+        4) Quem entrou mas constava em OCUPANTES noutro estacionamento: o
+           sensor prevalece — a vaga antiga é liberada e a fila daquele
+           estacionamento é chamada.
+        5) Chamar a fila para as vagas liberadas.
+
+    Restrições:
+        - O(k) consultas O(1) para k vagas citadas, além do próprio lote.
+    """
+def AplicarEventosSensores(est, eventos):
+    eventos = list(eventos)
+    antes = {id_vaga: est_mod.estado_vaga(est, id_vaga) for id_vaga, _ in eventos}
+    conflitos = est_mod.aplicar_eventos(est, eventos)
+
+    depois = {id_vaga: est_mod.estado_vaga(est, id_vaga) for id_vaga in antes}
+    for id_vaga, login in antes.items():
+        if login and depois[id_vaga] != login:
+            registro = OCUPANTES.get(login)
+            if registro is not None and registro[0] is est and registro[1] == id_vaga:
+                del OCUPANTES[login]
+    liberadas = 0
+    outros = []
+    for id_vaga, login in depois.items():
+        if login and login != antes[id_vaga]:
+            registro = OCUPANTES.get(login)
+            if registro is not None and registro[0] is not est:
+                if est_mod.liberar_vaga_de(registro[0], {"login": login}) is not None:
+                    outros.append(registro[0])
+            OCUPANTES[login] = (est, id_vaga)
+            fila_mod.removerDaFila(login)
+        elif login == 0 and antes[id_vaga]:
+            liberadas += 1
+
+    for outro in outros:
+        AtualizarEstado(outro)
+
+    for _ in range(liberadas):
+        if (est_mod.get_vaga_disponivel(est) is None
+                or fila_mod.retornaPrimeiro(est_mod.getNome(est)) is None):
+            break
+        AtualizarEstado(est)
+    return conflitos
+
 """
     Nome: ExibirResumo()
 
@@ -381,6 +517,48 @@ def ExibirResumo():
     else:
         print("Nenhum usuário autenticado.")
 
+"""
+    Nome: SalvarEstacionamentos()
+
+    Objetivo:
+        Salvamento completo do estado dos estacionamentos: CSV, snapshot
+        binário e um arquivo de alterações vazio (novo ponto de partida).
+
+    Restrições:
+        - O snapshot é gravado depois do CSV, para que IniciarSistema o
+          prefira (ver _snapshotAtual).
+    """
+def SalvarEstacionamentos():
+    with open("estacionamentos.csv", "w", newline='', encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for est in ESTACIONAMENTOS:
+            est_mod.salvar_estado_em_csv(est, writer)
+    est_mod.salvar_estacionamentos_binario(ESTACIONAMENTOS, "estacionamentos.bin")
+    est_mod.zerar_alteracoes(ESTACIONAMENTOS, "estacionamentos.patch")
+    CHECKPOINT["alteracoes"] = 0
+
+"""
+    Nome: SalvarCheckpoint()
+
+    Objetivo:
+        Ponto de controle barato: anexar a estacionamentos.patch só as vagas
+        alteradas desde o anterior.
+
+    Descrição:
+        1) est_mod.salvar_alteracoes grava as vagas alteradas.
+        2) Se o arquivo de alterações passou de CHECKPOINT["limite"] linhas,
+           faz um salvamento completo (SalvarEstacionamentos), para que a
+           carga não precise reaplicar um arquivo longo.
+
+    Restrições:
+        - O(vagas alteradas) fora do salvamento completo periódico.
+    """
+def SalvarCheckpoint():
+    CHECKPOINT["alteracoes"] += est_mod.salvar_alteracoes(ESTACIONAMENTOS,
+                                                          "estacionamentos.patch")
+    if CHECKPOINT["alteracoes"] >= CHECKPOINT["limite"]:
+        SalvarEstacionamentos()
+
 """
     Nome: EncerrarSistema()
 
@@ -390,13 +568,14 @@ def ExibirResumo():
 
     Acoplamento:
         - usuario_mod.salvarUsuarios().
-        - Estacionamento.salvarEstadoEmCSV() em loop de ESTACIONAMENTOS.
+        - SalvarEstacionamentos(): CSV, snapshot binário e arquivo de
+          alterações zerado.
         - sys.exit(0).
 
     Descrição:
         1) Salvar users.csv e guests.csv via usuario_mod.  
-        2) Abrir estacionamentos.csv e gravar o snapshot de cada estacionamento.
-        3) Esvaziar a fila.
+        2) Salvamento completo dos estacionamentos (SalvarEstacionamentos).
+        3) Gravar o snapshot da fila (zera o diário) e fechar o diário.
         4) Imprimir confirmação e sair.
 
     Restrições:
@@ -404,12 +583,10 @@ def ExibirResumo():
     """
 def EncerrarSistema():
     usuario_mod.salvarUsuarios("users.csv", "guests.csv")
-    with open("estacionamentos.csv", "w", newline='', encoding="utf-8") as f:
-        writer = csv.writer(f)
-        for est in ESTACIONAMENTOS:
-            est_mod.salvar_estado_em_csv(est, writer)
-    
+    SalvarEstacionamentos()
+
     fila_mod.salvar_fila_em_csv("fila.csv")
+    fila_mod.fecharJournal()
 
     print("✔️  Dados salvos. Até logo!")
     sys.exit(0)
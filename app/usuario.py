@@ -3,6 +3,18 @@ import csv
 usuarios = []
 convidados = []
 
+# Tabela login ↔ id inteiro, compartilhada com vagas para guardar ocupantes
+# em arrays de largura fixa. Ids começam em 1 (0 = "vaga livre") e nunca são
+# reaproveitados; _LOGIN_DO_ID[id] devolve o login.
+_ID_DO_LOGIN = {}
+_LOGIN_DO_ID = [None]
+
+# Índice login -> posição em `usuarios`, mantido por _registrarUsuario. Uma
+# posição só vale se ainda apontar para um registro com o mesmo login; senão
+# (lista trocada ou editada por fora) _buscarUsuario cai na busca linear e
+# refaz a entrada.
+_POSICAO_DO_LOGIN = {}
+
 # ---------------------------------------------------------------------------
 # FUNCOES INTERNAS
 """
@@ -114,17 +126,34 @@ def _cpfConvidadoValido(cpf: str) -> bool:
        AS: não altera listas globais.
 
     Descrição:
-       1) Itera sobre `usuarios`; devolve primeiro match ou None.
+       1) Consulta _POSICAO_DO_LOGIN e confere o registro naquela posição.
+       2) Se a posição não confere, itera sobre `usuarios`, devolve o primeiro
+          match (reindexando-o) ou None.
 
     Hipóteses:
        - Logins são únicos em `usuarios`.
 
     Restrições:
-       - Busca linear.
+       - O(1) para usuários registrados por _registrarUsuario; busca linear
+         para logins inexistentes ou inseridos direto na lista.
     """
 def _buscarUsuario(login: str):
     """Retorna dicionário-usuário ou None."""
-    return next((u for u in usuarios if u["login"] == login), None)
+    pos = _POSICAO_DO_LOGIN.get(login)
+    if pos is not None and pos < len(usuarios) and usuarios[pos]["login"] == login:
+        return usuarios[pos]
+    for pos, u in enumerate(usuarios):
+        if u["login"] == login:
+            _POSICAO_DO_LOGIN[login] = pos
+            return u
+    return None
+
+def _registrarUsuario(u: dict, convidado: bool = False) -> None:
+    """Insere `u` em `usuarios` (e em `convidados`) e indexa seu login."""
+    _POSICAO_DO_LOGIN[u["login"]] = len(usuarios)
+    usuarios.append(u)
+    if convidado:
+        convidados.append(u)
 # ---------------------------------------------------------------------------
 # APIs Publicas
 def novo_usuario(login: str, senha: str, tipo: int) -> dict:
@@ -142,6 +171,52 @@ def cpfConvidadoValido(cpf: str) -> bool:
 def buscarUsuario(login: str):
     return _buscarUsuario(login)
 
+"""
+    Nome: internarLogin(login)
+
+    Objetivo:
+       - Obter o id inteiro do login, registrando-o na tabela se for novo.
+
+    Acoplamento:
+       - login: str.
+       - retorno: int — id >= 1, estável durante a execução.
+
+    Restrições:
+       - O(1); a tabela só cresce (ids não são reaproveitados).
+    """
+def internarLogin(login: str) -> int:
+    id_login = _ID_DO_LOGIN.get(login)
+    if id_login is None:
+        id_login = _ID_DO_LOGIN[login] = len(_LOGIN_DO_ID)
+        _LOGIN_DO_ID.append(login)
+    return id_login
+
+"""
+    Nome: idDoLogin(login)
+
+    Objetivo:
+       - Consultar o id de um login já internado, sem registrá-lo.
+
+    Acoplamento:
+       - retorno: int | None — None se o login nunca foi internado.
+    """
+def idDoLogin(login: str):
+    return _ID_DO_LOGIN.get(login)
+
+"""
+    Nome: loginDoId(id_login)
+
+    Objetivo:
+       - Traduzir um id devolvido por internarLogin de volta ao login.
+
+    Restrições:
+       - Levanta IndexError para id nunca distribuído.
+    """
+def loginDoId(id_login: int) -> str:
+    if id_login < 1:
+        raise IndexError("id de login inválido")
+    return _LOGIN_DO_ID[id_login]
+
 """
     Nome: criaInterno()
 
@@ -186,7 +261,7 @@ def criaInterno() -> None:
         print("❌ Senha não pode ser vazia.")
         return
 
-    usuarios.append(novo_usuario(login, senha, 1))
+    _registrarUsuario(novo_usuario(login, senha, 1))
     print("✅ Usuário interno criado com sucesso.")
 
 """
@@ -240,9 +315,7 @@ def criaConvidado() -> None:
         print("❌ Senha não pode ser vazia.")
         return
 
-    novo = novo_usuario(cpf, senha, 2)
-    usuarios.append(novo)
-    convidados.append(novo)
+    _registrarUsuario(novo_usuario(cpf, senha, 2), convidado=True)
     print("✅ Usuário convidado criado com sucesso.")
 
 """
@@ -283,10 +356,8 @@ def carregarUsuarios(caminho: str, tipo_padrao = None) -> None:
                 except ValueError:
                     tipo = tipo_padrao
                 if login and senha and tipo is not None:
-                    u = novo_usuario(login, senha, tipo)
-                    if tipo == 2:
-                        convidados.append(u)
-                    usuarios.append(u)
+                    _registrarUsuario(novo_usuario(login, senha, tipo),
+                                      convidado=(tipo == 2))
     except FileNotFoundError:
         pass
 
@@ -354,7 +425,7 @@ def salvarUsuarios(caminho_usuarios: str, caminho_convidados: str) -> None:
         - Logins são únicos.
 
     Restrições:
-        - Busca sequencial O(n).
+        - Busca O(1) via buscarUsuario (usuários registrados).
 """
 def autentica(login: str, senha: str):
     # Validação de campos
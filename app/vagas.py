@@ -1,176 +1,65 @@
-<<<<<<< HEAD:app/vagas.py
-"""
-    Nome: nova_vaga(id_vaga)
-
-    Objetivo:
-        Criar e devolver um registro–vaga no formato dicionário.
-
-    Acoplamento:
-        - id_vaga: int — identificador único dentro do estacionamento.
-        - retorno: dict — {"id": int, "estado": 0}.
-
-    Condições de Acoplamento:
-        AE: id_vaga inteiro positivo.
-        AS: retorna dicionário com estado livre (0).
-
-    Descrição:
-        1) Monta dict {'id': id_vaga, 'estado': 0}.
-        2) Retorna o dicionário.
-
-    Hipóteses:
-        - Cada estacionamento garante unicidade de id_vaga.
-
-    Restrições:
-        - Estado “0” representa vaga livre; qualquer string = login ocupado.
-    """
-def nova_vaga(id_vaga: int) -> dict:
-    return {"id": id_vaga, "estado": 0}
-
-"""
-    Nome: estaLivre(vaga)
-
-    Objetivo:
-        Verificar se a vaga está livre.
+from array import array
+from itertools import compress, islice, repeat
+from operator import ne
+import usuario
 
-    Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
-        - retorno: bool.
-
-    Descrição:
-        Retorna True se vaga['estado'] == 0.
-    """
-def estaLivre(vaga: dict) -> bool:
-    return vaga["estado"] == 0
+# Padrões dos blocos de vagas criados sem opções explícitas (ver
+# configurarBlocos): "internar" guarda ocupantes como ids inteiros de
+# usuario.internarLogin em vez de strings; "verificar" (depuração) confere
+# os contadores de livres com uma recontagem completa a cada consulta.
+_CONFIG_BLOCO = {"internar": False, "verificar": False}
 
 """
-    Nome: estaOcupadaPor(vaga, login)
-
-    Objetivo:
-        Conferir se a vaga está ocupada pelo usuário `login`.
+Nome: Vaga
 
-    Retorno:
-        bool.
-    """
-def estaOcupadaPor(vaga: dict, login: str) -> bool:
-    return vaga["estado"] == login
-
-"""
-    Nome: ocupar(vaga, login)
-
-    Objetivo:
-        Marcar a vaga como ocupada pelo login informado.
-
-    Acoplamento:
-        - retorno: bool — True se ocupação realizada.
-
-    Descrição:
-        1) Se estaLivre() → grava login em vaga['estado'] e retorna True.
-        2) Caso contrário, retorna False.
-    """
-def ocupar(vaga: dict, login: str) -> bool:
-    if estaLivre(vaga):
-        vaga["estado"] = login
-        return True
-    return False
-
-"""
-    Nome: liberar(vaga)
-
-    Objetivo:
-        Tornar a vaga livre novamente (estado = 0).
-
-    Retorno:
-        None.
-    """
-def liberar(vaga: dict) -> None:
-    vaga["estado"] = 0
-
-"""
-    Nome: status(vaga)
-
-    Objetivo:
-        Gerar string legível do estado atual da vaga.
-
-    Retorno:
-        str — "Vaga 01: Livre" ou "Vaga 01: Ocupada por <login>".
-    """
-def status(vaga: dict) -> str:
-    if estaLivre(vaga):
-        return f"Vaga {vaga['id']:02d}: Livre"
-    return f"Vaga {vaga['id']:02d}: Ocupada por {vaga['estado']}"
-
-"""
-    Nome: ocupaVagaPorId(vagas, vaga_id, login)
-
-    Objetivo:
-        Localizar a vaga de id == vaga_id na lista e tentar ocupá-la.
-
-    Acoplamento:
-        - vagas: list[dict] — coleção de registros–vaga.
-        - retorno: bool — True se ocupada com sucesso.
+Objetivo:
+    Registro–vaga compacto: atributos fixos ("id", "estado") em __slots__,
+    sem o dict por instância.
 
-    Descrição:
-        1) Busca vaga pelo id.
-        2) Se não encontrada → False.
-        3) Se encontrada → chamar ocupar(); retorna resultado.
-    """
-def ocupaVagaPorId(vagas: list[dict], vaga_id: int, login: str) -> bool:
-    alvo = next((v for v in vagas if v["id"] == vaga_id), None)
-    return ocupar(alvo, login) if alvo else False
+Acoplamento:
+    - vaga.id, vaga.estado: acesso direto, usado pelos acessores.
+    - vaga["id"], vaga["estado"]: compatível com o antigo formato dict.
 
+Restrições:
+    - Só as chaves "id" e "estado" existem; outras levantam KeyError.
 """
-    Nome: getId(vaga)
+class Vaga:
+    __slots__ = ("id", "estado")
 
-    Objetivo:
-        Obter o ID de uma vaga sem expor a estrutura interna.
+    def __init__(self, id_vaga: int, estado=0):
+        self.id = id_vaga
+        self.estado = estado
 
-    Acoplamento:
-        
-vaga: dict — registro vaga.
-retorno: int — ID da vaga.
+    def __getitem__(self, chave):
+        if chave not in Vaga.__slots__:
+            raise KeyError(chave)
+        return getattr(self, chave)
 
-    Descrição:
-        Função de acesso que encapsula o campo "id" da vaga.
-"""
-def getId(vaga: dict) -> int:
-    """Retorna o ID da vaga de forma encapsulada."""
-    return vaga["id"]
-
-"""
-    Nome: getEstado(vaga)
+    def __setitem__(self, chave, valor):
+        if chave not in Vaga.__slots__:
+            raise KeyError(chave)
+        setattr(self, chave, valor)
 
-    Objetivo:
-        Obter o estado de uma vaga sem expor a estrutura interna.
-
-    Acoplamento:
-        
-vaga: dict — registro vaga.
-retorno: int | str — estado da vaga (0 se livre, login se ocupada).
+    def __repr__(self):
+        return f"Vaga(id={self.id!r}, estado={self.estado!r})"
 
-    Descrição:
-        Função de acesso que encapsula o campo "estado" da vaga.
-"""
-def getEstado(vaga: dict):
-    """Retorna o estado da vaga de forma encapsulada."""
-    return vaga["estado"]
-=======
 """
 Nome: nova_vaga(id_vaga)
 
 Objetivo:
-    Criar e devolver um registro–vaga no formato dicionário.
+    Criar e devolver um registro–vaga (Vaga).
 
 Acoplamento:
     - id_vaga: int — identificador único dentro do estacionamento.
-    - retorno: dict — {"id": int, "estado": 0}.
+    - retorno: Vaga — id=id_vaga, estado=0.
 
 Condições de Acoplamento:
     AE: id_vaga inteiro positivo.
-    AS: retorna dicionário com estado livre (0).
+    AS: retorna vaga com estado livre (0).
 
 Descrição:
-    1) Monta dict {'id': id_vaga, 'estado': 0}.
-    2) Retorna o dicionário.
+    1) Monta Vaga(id_vaga) com estado 0.
+    2) Retorna o registro.
 
 Hipóteses:
     - Cada estacionamento garante unicidade de id_vaga.
@@ -178,8 +67,8 @@ Hipóteses:
 Restrições:
     - Estado "0" representa vaga livre; qualquer string = login ocupado.
 """
-def nova_vaga(id_vaga: int) -> dict:
-    return {"id": id_vaga, "estado": 0}
+def nova_vaga(id_vaga: int) -> Vaga:
+    return Vaga(id_vaga)
 
 """
     Nome: estaLivre(vaga)
@@ -188,22 +77,22 @@ def nova_vaga(id_vaga: int) -> dict:
         Verificar se a vaga está livre.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - retorno: bool — True se livre, False caso contrário.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido com chave 'estado'.
+        AE: vaga deve ser um registro–vaga válido.
         AS: retorna booleano indicando se vaga está livre.
 
     Descrição:
-        1) Verifica se vaga['estado'] == 0.
+        1) Verifica se vaga.estado == 0.
         2) Retorna True se condição satisfeita, False caso contrário.
 
     Restrições:
         - Estado "0" representa vaga livre; qualquer string = login ocupado.
     """
-def estaLivre(vaga: dict) -> bool:
-    return vaga["estado"] == 0
+def estaLivre(vaga: Vaga) -> bool:
+    return vaga.estado == 0
 
 """
     Nome: estaOcupadaPor(vaga, login)
@@ -212,24 +101,24 @@ def estaLivre(vaga: dict) -> bool:
         Conferir se a vaga está ocupada pelo usuário específico.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - login: str — identificador do usuário.
         - retorno: bool — True se ocupada pelo login, False caso contrário.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido; login deve ser string não vazia.
+        AE: vaga deve ser um registro–vaga válido; login deve ser string não vazia.
         AS: retorna booleano indicando se vaga está ocupada pelo login específico.
 
     Descrição:
-        1) Compara vaga['estado'] com o login fornecido.
+        1) Compara vaga.estado com o login fornecido.
         2) Retorna True se iguais, False caso contrário.
 
     Restrições:
         - Comparação é case-sensitive.
         - Estado "0" representa vaga livre; qualquer string = login ocupado.
     """
-def estaOcupadaPor(vaga: dict, login: str) -> bool:
-    return vaga["estado"] == login
+def estaOcupadaPor(vaga: Vaga, login: str) -> bool:
+    return vaga.estado == login
 
 """
     Nome: ocupar(vaga, login)
@@ -238,27 +127,27 @@ def estaOcupadaPor(vaga: dict, login: str) -> bool:
         Marcar a vaga como ocupada pelo login informado se estiver livre.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - login: str — identificador do usuário.
         - retorno: bool — True se ocupação realizada, False caso contrário.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido; login deve ser string não vazia.
+        AE: vaga deve ser um registro–vaga válido; login deve ser string não vazia.
         AS: se vaga estava livre, fica ocupada pelo login e retorna True; 
             caso contrário, vaga inalterada e retorna False.
 
     Descrição:
         1) Verifica se estaLivre(vaga) retorna True.
-        2) Se sim: grava login em vaga['estado'] e retorna True.
+        2) Se sim: grava login em vaga.estado e retorna True.
         3) Caso contrário: retorna False sem modificar a vaga.
 
     Restrições:
         - Só ocupa vaga se estiver livre (estado = 0).
         - Uma vez ocupada, vaga não pode ser ocupada por outro usuário.
     """
-def ocupar(vaga: dict, login: str) -> bool:
+def ocupar(vaga: Vaga, login: str) -> bool:
     if estaLivre(vaga):
-        vaga["estado"] = login
+        vaga.estado = login
         return True
     return False
 
@@ -269,23 +158,23 @@ def ocupar(vaga: dict, login: str) -> bool:
         Tornar a vaga livre novamente, independente do estado atual.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - retorno: None.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido com chave 'estado'.
+        AE: vaga deve ser um registro–vaga válido.
         AS: vaga fica com estado livre (0).
 
     Descrição:
-        1) Define vaga['estado'] = 0.
+        1) Define vaga.estado = 0.
         2) Não retorna valor.
 
     Restrições:
         - Operação sempre bem-sucedida, independente do estado anterior.
         - Estado "0" representa vaga livre.
     """
-def liberar(vaga: dict) -> None:
-    vaga["estado"] = 0
+def liberar(vaga: Vaga) -> None:
+    vaga.estado = 0
 
 """
     Nome: status(vaga)
@@ -294,11 +183,11 @@ def liberar(vaga: dict) -> None:
         Gerar string legível do estado atual da vaga.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - retorno: str — descrição formatada do estado da vaga.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido com chaves 'id' e 'estado'.
+        AE: vaga deve ser um registro–vaga válido.
         AS: retorna string formatada descrevendo o estado da vaga.
 
     Descrição:
@@ -308,10 +197,34 @@ def liberar(vaga: dict) -> None:
     Restrições:
         - Estado "0" representa vaga livre; qualquer string = login ocupado.
     """
-def status(vaga: dict) -> str:
+def status(vaga: Vaga) -> str:
     if estaLivre(vaga):
-        return f"Vaga {vaga['id']:02d}: Livre"
-    return f"Vaga {vaga['id']:02d}: Ocupada por {vaga['estado']}"
+        return f"Vaga {vaga.id:02d}: Livre"
+    return f"Vaga {vaga.id:02d}: Ocupada por {vaga.estado}"
+
+"""
+    Nome: buscaVagaPorId(vagas, vaga_id)
+
+    Objetivo:
+        Localizar a vaga de id específico na coleção.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas — coleção de registros–vaga.
+        - vaga_id: int — identificador procurado.
+        - retorno: registro–vaga | None.
+
+    Descrição:
+        1) BlocoVagas: consulta o índice id → posição do bloco.
+        2) Lista: busca o primeiro elemento com v.id == vaga_id.
+
+    Restrições:
+        - O(1) em BlocoVagas; O(n) em lista.
+        - Com IDs repetidos, devolve a primeira vaga com o ID.
+    """
+def buscaVagaPorId(vagas, vaga_id: int):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.porId(vaga_id)
+    return next((v for v in vagas if v.id == vaga_id), None)
 
 """
     Nome: ocupaVagaPorId(vagas, vaga_id, login)
@@ -320,19 +233,19 @@ def status(vaga: dict) -> str:
         Localizar a vaga de id específico na lista e tentar ocupá-la.
 
     Acoplamento:
-        - vagas: list[dict] — coleção de registros–vaga.
+        - vagas: list[Vaga] | BlocoVagas — coleção de registros–vaga.
         - vaga_id: int — identificador da vaga a ser ocupada.
         - login: str — identificador do usuário.
         - retorno: bool — True se ocupada com sucesso, False caso contrário.
 
     Condições de Acoplamento:
-        AE: vagas deve ser lista de dicionários válidos; vaga_id inteiro positivo; 
+        AE: vagas deve ser lista de registros–vaga válidos; vaga_id inteiro positivo; 
             login string não vazia.
         AS: se vaga encontrada e livre, fica ocupada pelo login e retorna True; 
             caso contrário retorna False.
 
     Descrição:
-        1) Busca na lista vagas o primeiro elemento com v["id"] == vaga_id.
+        1) Localiza a vaga via buscaVagaPorId (índice em BlocoVagas).
         2) Se não encontrada: retorna False.
         3) Se encontrada: chama ocupar(vaga, login) e retorna o resultado.
 
@@ -343,57 +256,823 @@ def status(vaga: dict) -> str:
     Restrições:
         - Só ocupa se vaga existir e estiver livre.
         - Busca para no primeiro elemento com ID correspondente.
+        - O(1) em BlocoVagas; O(n) em lista.
     """
-def ocupaVagaPorId(vagas: list[dict], vaga_id: int, login: str) -> bool:
-    alvo = next((v for v in vagas if v["id"] == vaga_id), None)
-    return ocupar(alvo, login) if alvo else False
+def ocupaVagaPorId(vagas: list[Vaga], vaga_id: int, login: str) -> bool:
+    alvo = buscaVagaPorId(vagas, vaga_id)
+    return ocupar(alvo, login) if alvo is not None else False
 
 """
     Nome: getId(vaga)
 
     Objetivo:
-        Obter o ID de uma vaga sem expor a estrutura interna do dicionário.
+        Obter o ID de uma vaga sem expor a estrutura interna do registro.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - retorno: int — identificador único da vaga.
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido com chave 'id'.
+        AE: vaga deve ser um registro–vaga válido.
         AS: retorna o valor inteiro do ID da vaga.
 
     Descrição:
-        1) Acessa vaga["id"] e retorna o valor.
+        1) Acessa vaga.id e retorna o valor.
 
     Restrições:
         - Função de acesso somente leitura (não modifica a vaga).
     """
-def getId(vaga: dict) -> int:
+def getId(vaga: Vaga) -> int:
     """Retorna o ID da vaga de forma encapsulada."""
-    return vaga["id"]
+    return vaga.id
 
 """
     Nome: getEstado(vaga)
 
     Objetivo:
-        Obter o estado de uma vaga sem expor a estrutura interna do dicionário.
+        Obter o estado de uma vaga sem expor a estrutura interna do registro.
 
     Acoplamento:
-        - vaga: dict — registro gerado por nova_vaga().
+        - vaga: Vaga — registro gerado por nova_vaga().
         - retorno: int | str — estado da vaga (0 se livre, login se ocupada).
 
     Condições de Acoplamento:
-        AE: vaga deve ser um dicionário válido com chave 'estado'.
+        AE: vaga deve ser um registro–vaga válido.
         AS: retorna o valor do estado (0 para livre, string para ocupada).
 
     Descrição:
-        1) Acessa vaga["estado"] e retorna o valor.
+        1) Acessa vaga.estado e retorna o valor.
 
     Restrições:
         - Função de acesso somente leitura (não modifica a vaga).
         - Estado "0" representa vaga livre; qualquer string = login ocupado.
     """
-def getEstado(vaga: dict):
+def getEstado(vaga: Vaga):
     """Retorna o estado da vaga de forma encapsulada."""
-    return vaga["estado"]
->>>>>>> 6cc85dd154a8cd0119e83129a4d74f3ff9c8f22d:vagas.py
+    return vaga.estado
+
+
+# ---------------------------------------------------------------------------
+# ARMAZENAMENTO COMPACTO DE VAGAS
+
+# Árvore de Fenwick (base 1) das vagas livres de um bloco.
+def _fenwickAdicionar(arvore, i, delta):
+    while i < len(arvore):
+        arvore[i] += delta
+        i += i & -i
+
+def _fenwickPrefixo(arvore, i):
+    total = 0
+    while i > 0:
+        total += arvore[i]
+        i -= i & -i
+    return total
+
+def _fenwickDe(flags):
+    """Árvore com flags[i] na posição i + 1, montada em O(n)."""
+    arvore = array("l", [0])
+    arvore.extend(flags)
+    for i in range(1, len(arvore)):
+        pai = i + (i & -i)
+        if pai < len(arvore):
+            arvore[pai] += arvore[i]
+    return arvore
+
+def _fenwickKesimo(arvore, k):
+    """Posição (base 0) da k-ésima livre; len(arvore) - 1 se não houver."""
+    pos, passo = 0, 1 << (len(arvore) - 1).bit_length()
+    while passo:
+        proximo = pos + passo
+        if proximo < len(arvore) and arvore[proximo] < k:
+            pos = proximo
+            k -= arvore[proximo]
+        passo >>= 1
+    return pos
+
+"""
+    Nome: BlocoVagas
+
+    Objetivo:
+        Guardar as vagas de um estacionamento em arrays, sem um dict por
+        vaga: ids em array de inteiros, livres em bytearray (1 = livre) e
+        ocupantes numa tabela esparsa índice → login (só vagas ocupadas) ou,
+        com internar=True, num array de ids de login (0 = livre).
+
+    Acoplamento:
+        - len(bloco), bloco[i], iteração: devolvem referências (_VagaNoBloco)
+          aceitas por todos os acessores deste módulo (estaLivre, ocupar,
+          liberar, getId, getEstado, status …).
+        - append(vaga): copia id e estado de um registro–vaga avulso.
+        - porId(id): referência à vaga do id, ou None — O(1).
+        - posicaoDe(id): posição da vaga do id, ou -1 — O(1).
+        - posicoesLivres(): posições das vagas livres, em ordem (varredura em C).
+        - aplicarEventos(eventos): ocupações/liberações em lote por id.
+        - porOcupante(login): primeira vaga ocupada pelo login, ou None — O(1).
+        - primeiraLivre(): primeira vaga livre na ordem do bloco, ou None — O(1).
+        - livres(), ocupadas(): contadores mantidos a cada mudança — O(1).
+        - linhasStatus(filtro, inicio, fim): status() das vagas do trecho
+          [inicio, fim) após o filtro, lido direto dos arrays; as vagas
+          puladas não são formatadas.
+        - ocupantes(): pares (login, id da vaga) das vagas ocupadas.
+        - colunas(): ids, posições ocupadas e seus logins (serialização).
+        - alteracoes(), limparAlteracoes(): vagas gravadas ou anexadas desde
+          o último ponto de controle (salvamento incremental).
+        - livresEntre(inicio, fim), posicaoLivreEntre(inicio, fim),
+          posicaoLivreAntes(fim): contagem e busca de livres num trecho de
+          posições (setores do estacionamento) — O(log n).
+
+    Hipóteses:
+        - A referência devolvida lê e grava direto nos arrays; o registro
+          avulso passado a append() não fica ligado ao bloco.
+
+    Restrições:
+        - ~1 byte por vaga livre com ids consecutivos (o caso do CSV: ids
+          ficam num range) e ~9 bytes (id + flag) caso contrário; ocupadas
+          somam a entrada na tabela de ocupantes.
+        - Índice id → posição: enquanto os ids forem consecutivos, a posição
+          é id - ids[0] e nenhum dict é mantido; o primeiro id fora da
+          sequência materializa o array de ids e o dict.
+        - Internado: estado continua sendo lido/gravado como string (a
+          tradução passa pela tabela de usuario).
+        - Índice ocupante → posição (login, ou id internado), atualizado a
+          cada ocupação/liberação; um login em duas vagas (ex.: CSV editado à
+          mão) aponta para a primeira, e liberá-la faz uma busca pela outra.
+        - Primeira livre: a posição exata fica em cache; liberar só compara
+          com ela e ocupar a própria primeira livre procura a próxima com
+          bytearray.find (varredura em C, a partir dela).
+        - Alterações: um set de posições, marcado em _gravar e append; as
+          cargas em lote (CSV, snapshot) não marcam nada — são o ponto de
+          partida.
+        - Trechos: uma árvore de Fenwick das livres (8 bytes por vaga) só é
+          montada na primeira consulta por trecho e, a partir daí, mantida em
+          _gravar; append a descarta (remontada na próxima consulta).
+"""
+_INVERTE_FLAG = bytes([1, 0]) + bytes(254)      # translate: 0 ↔ 1
+_EVENTO_LIVRE = (0, None, "0")                   # estados que liberam a vaga
+
+class BlocoVagas:
+    __slots__ = ("_ids", "_livres", "_ocupantes", "_posicoes", "_internar",
+                 "_primeira", "_vagaDoOcupante", "_repetidos", "_nLivres",
+                 "_alteradas", "_arvore")
+
+    def __init__(self, ids=(), internar=False):
+        consecutivos = isinstance(ids, range) and ids.step == 1
+        self._ids = ids if consecutivos else array("l", ids)
+        self._livres = bytearray(b"\x01") * len(self._ids)
+        self._internar = internar
+        self._ocupantes = array("l", [0]) * len(self._ids) if internar else {}
+        self._posicoes = None
+        self._primeira = 0 if self._ids else -1      # -1 = nenhuma livre
+        self._vagaDoOcupante = {}
+        self._repetidos = 0                          # ocupações fora do índice
+        self._nLivres = len(self._ids)
+        self._alteradas = set()                      # posições desde o checkpoint
+        self._arvore = None                          # Fenwick das livres, sob demanda
+        if not consecutivos and any(id_vaga != self._ids[0] + i
+                                    for i, id_vaga in enumerate(self._ids)):
+            self._materializarPosicoes()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self._ids)
+        if not 0 <= i < len(self._ids):
+            raise IndexError("índice de vaga fora do bloco")
+        return _VagaNoBloco(self, i)
+
+    def __iter__(self):
+        for i in range(len(self._ids)):
+            yield _VagaNoBloco(self, i)
+
+    def porId(self, id_vaga):
+        i = self.posicaoDe(id_vaga)
+        return None if i < 0 else _VagaNoBloco(self, i)
+
+    def posicaoDe(self, id_vaga):
+        """Posição da vaga de id_vaga no bloco, ou -1."""
+        if self._posicoes is not None:
+            return self._posicoes.get(id_vaga, -1)
+        if isinstance(id_vaga, int) and self._ids:
+            i = id_vaga - self._ids[0]
+            if 0 <= i < len(self._ids):
+                return i
+        return -1
+
+    def posicoesLivres(self):
+        return compress(range(len(self._ids)), self._livres)
+
+    def primeiraLivre(self):
+        return _VagaNoBloco(self, self._primeira) if self._primeira >= 0 else None
+
+    def livres(self):
+        if _CONFIG_BLOCO["verificar"]:
+            recontagem = self._livres.count(1)
+            if recontagem != self._nLivres:
+                raise RuntimeError(f"contador de vagas livres divergente: "
+                                   f"{self._nLivres} != {recontagem}")
+        return self._nLivres
+
+    def ocupadas(self):
+        return len(self._ids) - self.livres()
+
+    def porOcupante(self, login):
+        chave = usuario.idDoLogin(login) if self._internar else login
+        i = self._vagaDoOcupante.get(chave)
+        return None if i is None else _VagaNoBloco(self, i)
+
+    def ocupantes(self):
+        for chave, i in self._vagaDoOcupante.items():
+            yield (usuario.loginDoId(chave) if self._internar else chave), self._ids[i]
+
+    def linhasStatus(self, filtro=None, inicio=0, fim=None):
+        if filtro is None:
+            posicoes = range(len(self._ids))[inicio:fim]
+        else:
+            marcas = self._livres if filtro == "livres" else self._livres.translate(_INVERTE_FLAG)
+            posicoes = islice(compress(range(len(self._ids)), marcas), inicio, fim)
+        for i in posicoes:                            # pular é só avançar posições
+            if self._livres[i]:
+                yield f"Vaga {self._ids[i]:02d}: Livre"
+            else:
+                yield f"Vaga {self._ids[i]:02d}: Ocupada por {self._estado(i)}"
+
+    def append(self, vaga) -> None:
+        n = len(self._ids)
+        if self._posicoes is not None:
+            self._posicoes.setdefault(vaga.id, n)
+        elif n and vaga.id != self._ids[0] + n:
+            self._materializarPosicoes()
+            self._posicoes.setdefault(vaga.id, n)
+        if isinstance(self._ids, range):
+            self._ids = range(vaga.id - n, vaga.id + 1)
+        else:
+            self._ids.append(vaga.id)
+        self._livres.append(1)
+        self._nLivres += 1
+        if self._primeira < 0:
+            self._primeira = n
+        if self._internar:
+            self._ocupantes.append(0)
+        self._alteradas.add(n)
+        self._arvore = None
+        if vaga.estado != 0:
+            self._gravar(len(self._ids) - 1, vaga.estado)
+
+    def _carregarEstados(self, estados):
+        """Preenche um bloco recém-criado (todo livre) a partir das células.
+
+        As varreduras rodam em C (map/compress/translate/dict(zip)); strip()
+        só roda se alguma célula ocupada tiver espaços.
+        """
+        ocupada = bytearray(map(ne, estados, repeat("0")))
+        posicoes = list(compress(range(len(estados)), ocupada))
+        logins = list(compress(estados, ocupada))
+        juntos = "".join(logins)
+        if " " in juntos or not juntos.isprintable():
+            logins = list(map(str.strip, logins))
+            for i, login in zip(posicoes, logins):
+                if login == "0":                     # " 0": livre, com espaços
+                    ocupada[i] = 0
+            pares = [(i, l) for i, l in zip(posicoes, logins) if l != "0"]
+            posicoes, logins = [i for i, _ in pares], [l for _, l in pares]
+        self._carregarOcupantes(ocupada, posicoes, logins)
+
+    def _carregarCodigos(self, codigos, logins):
+        """Preenche um bloco recém-criado a partir de códigos por vaga
+        (0 = livre, k = logins[k]), como no snapshot binário."""
+        ocupada = bytearray(map(bool, codigos))
+        posicoes = list(compress(range(len(codigos)), ocupada))
+        self._carregarOcupantes(ocupada, posicoes,
+                                list(map(logins.__getitem__, compress(codigos, ocupada))))
+
+    def _carregarOcupantes(self, ocupada, posicoes, logins):
+        self._livres = ocupada.translate(_INVERTE_FLAG)
+        if self._internar:
+            chaves = list(map(usuario.internarLogin, logins))
+            for i, chave in zip(posicoes, chaves):
+                self._ocupantes[i] = chave
+        else:
+            chaves = logins
+            self._ocupantes = dict(zip(posicoes, chaves))
+        # invertido: com login repetido, fica a primeira vaga
+        self._vagaDoOcupante = dict(zip(reversed(chaves), reversed(posicoes)))
+        self._repetidos = len(chaves) - len(self._vagaDoOcupante)
+        self._nLivres = len(ocupada) - len(chaves)
+        self._primeira = self._livres.find(1)
+
+    def colunas(self):
+        """(ids, posições ocupadas em ordem, logins dessas posições)."""
+        if self._internar:
+            posicoes = list(compress(range(len(self._ids)), self._ocupantes))
+            logins = [usuario.loginDoId(self._ocupantes[i]) for i in posicoes]
+        else:
+            posicoes = sorted(self._ocupantes)
+            logins = list(map(self._ocupantes.__getitem__, posicoes))
+        return self._ids, posicoes, logins
+
+    def _materializarPosicoes(self):
+        self._ids = array("l", self._ids)
+        self._posicoes = {}
+        for i, id_vaga in enumerate(self._ids):
+            self._posicoes.setdefault(id_vaga, i)
+
+    def _estado(self, i):
+        if self._livres[i]:
+            return 0
+        if self._internar:
+            return usuario.loginDoId(self._ocupantes[i])
+        return self._ocupantes[i]
+
+    def alteracoes(self):
+        """(id, estado) de cada vaga alterada desde limparAlteracoes, na
+        ordem do bloco."""
+        return [(self._ids[i], self._estado(i)) for i in sorted(self._alteradas)]
+
+    def limparAlteracoes(self) -> None:
+        self._alteradas.clear()
+
+    def livresEntre(self, inicio, fim):
+        """Vagas livres nas posições [inicio, fim)."""
+        arvore = self._fenwick()
+        return _fenwickPrefixo(arvore, fim) - _fenwickPrefixo(arvore, inicio)
+
+    def posicaoLivreEntre(self, inicio, fim):
+        """Primeira posição livre em [inicio, fim), ou -1."""
+        arvore = self._fenwick()
+        i = _fenwickKesimo(arvore, _fenwickPrefixo(arvore, inicio) + 1)
+        return i if i < fim else -1
+
+    def posicaoLivreAntes(self, fim):
+        """Última posição livre antes de fim, ou -1."""
+        arvore = self._fenwick()
+        antes = _fenwickPrefixo(arvore, fim)
+        return _fenwickKesimo(arvore, antes) if antes else -1
+
+    def aplicarEventos(self, eventos):
+        """Aplica eventos (id_vaga, login | livre) numa passada; devolve os
+        conflitos como pares (índice do evento, código). Ver aplicarEventosVagas."""
+        conflitos = []
+        livres, ocupantes, arvore = self._livres, self._ocupantes, self._arvore
+        alteradas = []
+        menorLiberada = len(self._ids)
+        delta = 0
+        for k, (id_vaga, estado) in enumerate(eventos):
+            i = self.posicaoDe(id_vaga)
+            if i < 0:
+                conflitos.append((k, "vaga_inexistente"))
+            elif estado in _EVENTO_LIVRE:
+                if livres[i]:
+                    conflitos.append((k, "vaga_ja_livre"))
+                    continue
+                self._desmapear(i, ocupantes[i])
+                livres[i] = 1
+                if self._internar:
+                    ocupantes[i] = 0
+                else:
+                    del ocupantes[i]
+                menorLiberada = min(menorLiberada, i)
+                delta += 1
+                alteradas.append(i)
+                if arvore is not None:
+                    _fenwickAdicionar(arvore, i + 1, 1)
+            elif not livres[i]:
+                if self._estado(i) != estado:
+                    conflitos.append((k, "vaga_ocupada"))
+            elif self.porOcupante(estado) is not None:
+                conflitos.append((k, "login_em_outra_vaga"))
+            else:
+                chave = usuario.internarLogin(estado) if self._internar else estado
+                livres[i] = 0
+                ocupantes[i] = chave
+                self._mapear(i, chave)
+                delta -= 1
+                alteradas.append(i)
+                if arvore is not None:
+                    _fenwickAdicionar(arvore, i + 1, -1)
+
+        # contador, primeira livre e marcas: uma vez por lote
+        self._nLivres += delta
+        # antes de min(primeira, menor liberada) tudo seguiu ocupado
+        if self._primeira >= 0:
+            menorLiberada = min(menorLiberada, self._primeira)
+        if menorLiberada < len(self._ids):
+            self._primeira = livres.find(1, menorLiberada)
+        self._alteradas.update(alteradas)
+        return conflitos
+
+    def _fenwick(self):
+        if self._arvore is None:
+            self._arvore = _fenwickDe(self._livres)
+        return self._arvore
+
+    def _gravar(self, i, estado):
+        self._alteradas.add(i)
+        if not self._livres[i]:
+            self._desmapear(i, self._ocupantes[i])
+        delta = (estado == 0) - self._livres[i]
+        self._nLivres += delta
+        if delta and self._arvore is not None:
+            _fenwickAdicionar(self._arvore, i + 1, delta)
+        if estado == 0:
+            self._livres[i] = 1
+            if self._primeira < 0 or i < self._primeira:
+                self._primeira = i
+            if self._internar:
+                self._ocupantes[i] = 0
+            else:
+                self._ocupantes.pop(i, None)
+        else:
+            self._livres[i] = 0
+            if i == self._primeira:
+                self._primeira = self._livres.find(1, i + 1)
+            chave = usuario.internarLogin(estado) if self._internar else estado
+            self._ocupantes[i] = chave
+            self._mapear(i, chave)
+
+    def _mapear(self, i, chave):
+        atual = self._vagaDoOcupante.get(chave)
+        if atual is None:
+            self._vagaDoOcupante[chave] = i
+            return
+        self._repetidos += 1
+        if i < atual:
+            self._vagaDoOcupante[chave] = i
+
+    def _desmapear(self, i, chave):
+        if self._vagaDoOcupante.get(chave) != i:
+            self._repetidos -= 1                 # era uma ocupação repetida
+            return
+        del self._vagaDoOcupante[chave]
+        if self._repetidos:
+            outra = next((j for j in range(len(self._ids))
+                          if j != i and not self._livres[j] and self._ocupantes[j] == chave),
+                         None)
+            if outra is not None:
+                self._vagaDoOcupante[chave] = outra
+                self._repetidos -= 1
+
+
+class _VagaNoBloco:
+    """Referência a uma vaga dentro de um BlocoVagas, com a interface de Vaga."""
+    __slots__ = ("_bloco", "_i")
+
+    def __init__(self, bloco, i):
+        self._bloco = bloco
+        self._i = i
+
+    @property
+    def id(self):
+        return self._bloco._ids[self._i]
+
+    @property
+    def estado(self):
+        return self._bloco._estado(self._i)
+
+    @estado.setter
+    def estado(self, valor):
+        self._bloco._gravar(self._i, valor)
+
+    __getitem__ = Vaga.__getitem__
+    __setitem__ = Vaga.__setitem__
+
+    def __eq__(self, outra):
+        if isinstance(outra, _VagaNoBloco):
+            return self._bloco is outra._bloco and self._i == outra._i
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self._bloco), self._i))
+
+"""
+    Nome: novo_bloco_vagas(ids, internar)
+
+    Objetivo:
+        Criar o armazenamento compacto de vagas de um estacionamento.
+
+    Acoplamento:
+        - ids: iterável de int — ids das vagas, todas livres (padrão: vazio).
+        - internar: bool | None — ocupantes como ids inteiros; None usa o
+          padrão de configurarBlocos.
+        - retorno: BlocoVagas.
+
+    Restrições:
+        - Não verifica duplicidade de ID.
+"""
+def novo_bloco_vagas(ids=(), internar=None) -> BlocoVagas:
+    if internar is None:
+        internar = _CONFIG_BLOCO["internar"]
+    return BlocoVagas(ids, internar)
+
+"""
+    Nome: novo_bloco_de_estados(estados, internar)
+
+    Objetivo:
+        Criar o bloco de um estacionamento direto das células de estado de
+        uma linha do CSV, sem registro–vaga intermediário.
+
+    Acoplamento:
+        - estados: sequência de str — "0" = livre, outro valor = login; a
+          i-ésima célula vira a vaga de id i (base 1).
+        - internar: bool | None — como em novo_bloco_vagas.
+        - retorno: BlocoVagas.
+
+    Restrições:
+        - Células "0" (o caso comum) não são copiadas nem passam por
+          strip(); só as ocupadas são gravadas no bloco.
+"""
+def novo_bloco_de_estados(estados, internar=None) -> BlocoVagas:
+    bloco = novo_bloco_vagas(range(1, len(estados) + 1), internar)
+    bloco._carregarEstados(estados)
+    return bloco
+
+"""
+    Nome: novo_bloco_de_codigos(ids, codigos, logins, internar)
+
+    Objetivo:
+        Criar um bloco a partir de colunas já decodificadas (ex.: snapshot
+        binário), sem passar por strings de estado.
+
+    Acoplamento:
+        - ids: sequência de int — id de cada vaga.
+        - codigos: sequência de int (ex.: array 'I') — por vaga, 0 = livre
+          ou k = índice do ocupante em logins.
+        - logins: sequência de str — tabela de logins (logins[0] não é usado).
+        - internar: bool | None — como em novo_bloco_vagas.
+        - retorno: BlocoVagas.
+
+    Restrições:
+        - len(ids) == len(codigos).
+"""
+def novo_bloco_de_codigos(ids, codigos, logins, internar=None) -> BlocoVagas:
+    bloco = novo_bloco_vagas(ids, internar)
+    bloco._carregarCodigos(codigos, logins)
+    return bloco
+
+"""
+    Nome: configurarBlocos(internar, verificar)
+
+    Objetivo:
+        Definir o padrão dos blocos criados a seguir (ex.: pelo carregamento
+        de estacionamentos.csv) e o modo de depuração dos contadores.
+
+    Acoplamento:
+        - internar: bool | None — None mantém o atual.
+        - verificar: bool | None — True confere livres()/ocupadas() com uma
+          recontagem completa (O(n)) em todos os blocos; None mantém o atual.
+
+    Restrições:
+        - Blocos já criados não mudam de representação.
+        - Com verificar, contador divergente levanta RuntimeError.
+"""
+def configurarBlocos(internar=None, verificar=None) -> None:
+    if internar is not None:
+        _CONFIG_BLOCO["internar"] = internar
+    if verificar is not None:
+        _CONFIG_BLOCO["verificar"] = verificar
+
+"""
+    Nome: contarLivres(vagas)
+
+    Objetivo:
+        Contar as vagas livres da coleção.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas.
+        - retorno: int.
+
+    Restrições:
+        - BlocoVagas: O(1), contador mantido. Lista: O(n).
+"""
+def contarLivres(vagas) -> int:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.livres()
+    return sum(1 for v in vagas if estaLivre(v))
+
+"""
+    Nome: primeiraVagaLivre(vagas)
+
+    Objetivo:
+        Obter a primeira vaga livre na ordem da coleção.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas.
+        - retorno: registro–vaga | None.
+
+    Restrições:
+        - BlocoVagas: O(1) (posição em cache). Lista: O(n).
+"""
+def primeiraVagaLivre(vagas):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.primeiraLivre()
+    return next((v for v in vagas if estaLivre(v)), None)
+
+"""
+    Nome: buscaVagaPorOcupante(vagas, login)
+
+    Objetivo:
+        Localizar a vaga ocupada pelo login.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas.
+        - login: str.
+        - retorno: registro–vaga | None.
+
+    Restrições:
+        - BlocoVagas: O(1), pelo índice ocupante → posição. Lista: O(n).
+"""
+def buscaVagaPorOcupante(vagas, login: str):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.porOcupante(login)
+    return next((v for v in vagas if estaOcupadaPor(v, login)), None)
+
+"""
+    Nome: ocupantesVagas(vagas)
+
+    Objetivo:
+        Listar quem ocupa cada vaga ocupada da coleção.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas.
+        - retorno: iterador de (login, id_vaga).
+
+    Restrições:
+        - BlocoVagas: O(ocupadas), pelo índice de ocupantes (um par por
+          login). Lista: O(n).
+"""
+def ocupantesVagas(vagas):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.ocupantes()
+    return ((getEstado(v), getId(v)) for v in vagas if not estaLivre(v))
+
+"""
+    Nome: colunasVagas(vagas)
+
+    Objetivo:
+        Exportar as vagas em colunas, para serialização (snapshot binário).
+
+    Acoplamento:
+        - vagas: BlocoVagas ou lista de registros–vaga.
+        - retorno: (ids, posições ocupadas, logins) — posições em ordem
+          crescente, logins alinhados a elas.
+"""
+def colunasVagas(vagas):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.colunas()
+    ocupadas = [(i, getEstado(v)) for i, v in enumerate(vagas) if not estaLivre(v)]
+    return ([getId(v) for v in vagas], [i for i, _ in ocupadas],
+            [login for _, login in ocupadas])
+
+"""
+    Nome: alteracoesVagas(vagas) / limparAlteracoesVagas(vagas)
+
+    Objetivo:
+        Listar as vagas alteradas desde o último ponto de controle, como
+        pares (id, estado), e zerar essa marcação.
+
+    Restrições:
+        - Só o BlocoVagas rastreia alterações; para uma lista de
+          registros–vaga todas as vagas contam como alteradas.
+"""
+def alteracoesVagas(vagas):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.alteracoes()
+    return [(getId(v), getEstado(v)) for v in vagas]
+
+def limparAlteracoesVagas(vagas) -> None:
+    if isinstance(vagas, BlocoVagas):
+        vagas.limparAlteracoes()
+
+"""
+    Nome: posicaoPorId(vagas, id_vaga) / posicoesLivres(vagas)
+
+    Objetivo:
+        Posição (índice em vagas) da vaga de id_vaga, ou -1; e as posições
+        de todas as vagas livres, em ordem.
+
+    Restrições:
+        - O(1) / varredura em C no BlocoVagas; varredura numa lista.
+"""
+def posicaoPorId(vagas, id_vaga: int) -> int:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.posicaoDe(id_vaga)
+    return next((i for i, v in enumerate(vagas) if getId(v) == id_vaga), -1)
+
+def posicoesLivres(vagas):
+    if isinstance(vagas, BlocoVagas):
+        return vagas.posicoesLivres()
+    return (i for i, v in enumerate(vagas) if estaLivre(v))
+
+"""
+    Nome: aplicarEventosVagas(vagas, eventos)
+
+    Objetivo:
+        Aplicar, numa passada e em ordem, um lote de eventos de ocupação
+        (ex.: sensores de piso) e relatar os que não puderam ser aplicados.
+
+    Acoplamento:
+        - eventos: iterável de (id_vaga, estado) — estado é o login que
+          ocupou a vaga ou 0 / None / "0" para vaga liberada.
+        - retorno: list[tuple(int, str)] — (índice do evento, código) para
+          cada evento em conflito, que não é aplicado:
+            "vaga_inexistente"    — id fora do estacionamento;
+            "vaga_ocupada"        — ocupar vaga ocupada por outro login;
+            "vaga_ja_livre"       — liberar vaga já livre;
+            "login_em_outra_vaga" — login já estacionado em outra vaga.
+
+    Restrições:
+        - Ocupar de novo a vaga que o mesmo login já ocupa não é conflito
+          (evento repetido do sensor) e não muda nada.
+        - No BlocoVagas, cada evento custa O(1) (O(log n) com a árvore de
+          Fenwick montada); contador, primeira livre e marcas de alteração
+          são acertados uma vez por lote.
+"""
+def aplicarEventosVagas(vagas, eventos) -> list:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.aplicarEventos(eventos)
+    conflitos = []
+    for k, (id_vaga, estado) in enumerate(eventos):
+        v = buscaVagaPorId(vagas, id_vaga)
+        if v is None:
+            conflitos.append((k, "vaga_inexistente"))
+        elif estado in _EVENTO_LIVRE:
+            if estaLivre(v):
+                conflitos.append((k, "vaga_ja_livre"))
+            else:
+                liberar(v)
+        elif not estaLivre(v):
+            if not estaOcupadaPor(v, estado):
+                conflitos.append((k, "vaga_ocupada"))
+        elif buscaVagaPorOcupante(vagas, estado) is not None:
+            conflitos.append((k, "login_em_outra_vaga"))
+        else:
+            ocupar(v, estado)
+    return conflitos
+
+"""
+    Nome: contarLivresEntre(vagas, inicio, fim)
+
+    Objetivo:
+        Contar as vagas livres nas posições [inicio, fim) — um setor.
+
+    Restrições:
+        - O(log n) no BlocoVagas; varredura do trecho numa lista.
+"""
+def contarLivresEntre(vagas, inicio: int, fim: int) -> int:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.livresEntre(inicio, fim)
+    return sum(1 for v in vagas[inicio:fim] if estaLivre(v))
+
+"""
+    Nome: posicaoLivreEntre(vagas, inicio, fim) / posicaoLivreAntes(vagas, fim)
+
+    Objetivo:
+        Posição da primeira vaga livre em [inicio, fim), ou da última livre
+        antes de fim; -1 se não houver.
+
+    Restrições:
+        - O(log n) no BlocoVagas; varredura do trecho numa lista.
+"""
+def posicaoLivreEntre(vagas, inicio: int, fim: int) -> int:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.posicaoLivreEntre(inicio, fim)
+    return next((i for i in range(inicio, min(fim, len(vagas)))
+                 if estaLivre(vagas[i])), -1)
+
+def posicaoLivreAntes(vagas, fim: int) -> int:
+    if isinstance(vagas, BlocoVagas):
+        return vagas.posicaoLivreAntes(fim)
+    return next((i for i in range(min(fim, len(vagas)) - 1, -1, -1)
+                 if estaLivre(vagas[i])), -1)
+
+"""
+    Nome: statusVagas(vagas, filtro, inicio, fim)
+
+    Objetivo:
+        Gerar o status() de várias vagas numa só passada, opcionalmente só
+        as livres ou só as ocupadas.
+
+    Acoplamento:
+        - vagas: list[Vaga] | BlocoVagas.
+        - filtro: None | "livres" | "ocupadas".
+        - inicio, fim: int | None — trecho [inicio, fim) das vagas que passam
+          no filtro (ex.: uma página); fim None = até o final.
+        - retorno: iterador de str — mesmas linhas de status(), na ordem das
+          vagas.
+
+    Restrições:
+        - Levanta ValueError para filtro desconhecido.
+        - Só as vagas do trecho são formatadas; as anteriores são puladas
+          por posição.
+        - BlocoVagas: lê os arrays direto, sem criar referências por vaga;
+          sem filtro, pular é O(1).
+"""
+def statusVagas(vagas, filtro=None, inicio=0, fim=None):
+    if filtro not in (None, "livres", "ocupadas"):
+        raise ValueError(f"filtro inválido: {filtro!r}")
+    if isinstance(vagas, BlocoVagas):
+        return vagas.linhasStatus(filtro, inicio, fim)
+    escolhidas = (v for v in vagas
+                  if filtro is None or estaLivre(v) == (filtro == "livres"))
+    return map(status, islice(escolhidas, inicio, fim))
@@ -0,0 +1,147 @@
+"""
+    Benchmark do carregamento de estacionamentos.csv.
+
+    Objetivo:
+        Medir o custo de inicialização para garagens grandes: vazão
+        (linhas/s e vagas/s) e memória de criar_estacionamentos_de_csv,
+        comparado ao carregador original (um dict por vaga), ao snapshot
+        binário (criar_estacionamentos_de_binario) e à só abertura do
+        snapshot com mmap seguida de uma consulta de vaga.
+
+    Uso:
+        python benchmarks/bench_estacionamentos.py [--lotes 100]
+                                                   [--vagas 10000]
+                                                   [--ocupacao 0.6]
+                                                   [--saida arq.json]
+
+    Saída:
+        JSON com um registro por carregador:
+            {"carregador", "lotes", "vagas_por_lote", "segundos",
+             "linhas_por_segundo", "vagas_por_segundo",
+             "pico_memoria_bytes", "memoria_retida_bytes"}
+
+    Restrições:
+        - O arquivo sintético é gerado num diretório temporário e convertido
+          uma vez para o snapshot binário; logins
+          misturam matrículas (7 dígitos) e CPFs (11 dígitos).
+        - Memória medida com tracemalloc numa passada separada.
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import estacionamento as est_mod  # noqa: E402
+
+SEMENTE = 2025
+
+
+def _carregarDict(caminho_csv):
+    """Carregador original: um dict por vaga, strip() duas vezes por célula."""
+    ests = []
+    with open(caminho_csv, newline='', encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if not row:
+                continue
+            est = {"nome": row[0], "vagas": []}
+            for i, estado in enumerate(row[1:], 1):
+                v = {"id": i, "estado": 0}
+                if estado.strip() != "0":
+                    v["estado"] = estado.strip()
+                est["vagas"].append(v)
+            ests.append(est)
+    return ests
+
+
+def _abrirSnapshot(caminho_bin):
+    """Só mmap + tabela de lotes, e uma consulta; devolve os nomes dos lotes."""
+    snap = est_mod.abrir_snapshot(caminho_bin)
+    nomes = list(snap["lotes"])
+    est_mod.snapshot_estado_vaga(snap, nomes[-1], 1)
+    est_mod.fechar_snapshot(snap)
+    return nomes
+
+
+# nome -> (carregador, arquivo de entrada: "csv" ou "bin")
+CARREGADORES = {
+    "dict": (_carregarDict, "csv"),
+    "bloco": (est_mod.criar_estacionamentos_de_csv, "csv"),
+    "binario": (est_mod.criar_estacionamentos_de_binario, "bin"),
+    "mmap": (_abrirSnapshot, "bin"),
+}
+
+
+def _gerarArquivo(caminho, lotes, vagas, ocupacao):
+    rng = random.Random(SEMENTE)
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        for n in range(lotes):
+            linha = [f"Estacionamento {n:03d}"]
+            for _ in range(vagas):
+                if rng.random() >= ocupacao:
+                    linha.append("0")
+                elif rng.random() < 0.7:
+                    linha.append(str(rng.randrange(10**6, 10**7)))
+                else:
+                    linha.append(str(rng.randrange(10**10, 10**11)))
+            w.writerow(linha)
+
+
+def executar(nome, caminhos, lotes, vagas):
+    carregar, entrada = CARREGADORES[nome]
+    caminho = caminhos[entrada]
+    inicio = time.perf_counter()
+    ests = carregar(caminho)
+    segundos = time.perf_counter() - inicio
+    assert len(ests) == lotes
+    del ests
+
+    tracemalloc.start()
+    ests = carregar(caminho)
+    retida, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del ests
+    return {"carregador": nome, "lotes": lotes, "vagas_por_lote": vagas,
+            "segundos": round(segundos, 4),
+            "linhas_por_segundo": round(lotes / segundos, 1),
+            "vagas_por_segundo": round(lotes * vagas / segundos, 1),
+            "pico_memoria_bytes": pico, "memoria_retida_bytes": retida}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de estacionamentos.csv.")
+    parser.add_argument("--lotes", type=int, default=100)
+    parser.add_argument("--vagas", type=int, default=10_000)
+    parser.add_argument("--ocupacao", type=float, default=0.6)
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminhos = {"csv": os.path.join(diretorio, "estacionamentos.csv"),
+                    "bin": os.path.join(diretorio, "estacionamentos.bin")}
+        _gerarArquivo(caminhos["csv"], args.lotes, args.vagas, args.ocupacao)
+        est_mod.salvar_estacionamentos_binario(
+            est_mod.criar_estacionamentos_de_csv(caminhos["csv"]), caminhos["bin"])
+        resultados = [executar(nome, caminhos, args.lotes, args.vagas)
+                      for nome in CARREGADORES]
+
+    relatorio = {"modulo": "estacionamento", "python": platform.python_version(),
+                 "resultados": resultados}
+    texto = json.dumps(relatorio, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
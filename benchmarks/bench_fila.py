@@ -0,0 +1,152 @@
+"""
+    Benchmark do módulo fila.
+
+    Objetivo:
+        Medir vazão (ops/s) e pico de memória das operações da fila em
+        escala, para detectar regressões de desempenho.
+
+    Uso:
+        python benchmarks/bench_fila.py [--tamanhos 1000 100000 1000000]
+                                        [--distribuicoes uniforme enviesada]
+                                        [--saida resultado.json]
+
+    Saída:
+        JSON em stdout (ou no arquivo de --saida) com um registro por
+        (tamanho, distribuição):
+            {"tamanho", "distribuicao", "pico_memoria_bytes",
+             "bytes_por_entrada",
+             "operacoes": {nome: {"ops", "segundos", "ops_por_segundo"}}}
+
+    Operações medidas:
+        adicionar — adicionarNaFila para n usuários novos;
+        posicao   — consultarPosicaoNaFila para logins sorteados;
+        primeiro  — retornaPrimeiro (global e por estacionamento);
+        salvar    — salvar_fila_em_csv (ops = linhas gravadas);
+        carregar  — carregar_fila_de_csv (ops = linhas lidas);
+        remover   — removerDaFila de todos, em ordem aleatória.
+
+    Restrições:
+        - O pico de memória é medido em uma passada separada, com
+          tracemalloc, para não distorcer os tempos.
+        - O diário (journal) fica desligado; só a fila em memória e o CSV
+          são medidos.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import fila  # noqa: E402
+
+# Proporção de cada tipo (1, 2, 3) nos usuários gerados.
+DISTRIBUICOES = {
+    "uniforme": (1, 1, 1),
+    "enviesada": (1, 3, 6),          # poucos prioritários, muitos comuns
+    "prioritaria": (6, 3, 1),        # pior caso para quem chega depois
+}
+ESTACIONAMENTOS = ("A", "B", "C", None)
+AMOSTRA_CONSULTAS = 100_000
+SEMENTE = 2025
+
+
+def _gerarUsuarios(n, distribuicao, rng):
+    tipos = rng.choices((1, 2, 3), weights=DISTRIBUICOES[distribuicao], k=n)
+    lotes = rng.choices(ESTACIONAMENTOS, k=n)
+    return [({"login": f"{i:07d}", "tipo": t}, e)
+            for i, (t, e) in enumerate(zip(tipos, lotes))]
+
+
+def _medir(resultado, nome, ops, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    resultado[nome] = {"ops": ops, "segundos": round(segundos, 6),
+                       "ops_por_segundo": round(ops / segundos, 1) if segundos else None}
+
+
+def _picoMemoria(usuarios):
+    """Pico de memória (bytes) alocado para enfileirar todos os usuários."""
+    fila.esvaziarFila()
+    tracemalloc.start()
+    for u, est in usuarios:
+        fila.adicionarNaFila(u, est)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    fila.esvaziarFila()
+    return pico
+
+
+def executar(n, distribuicao, diretorio):
+    rng = random.Random(SEMENTE)
+    usuarios = _gerarUsuarios(n, distribuicao, rng)
+    logins = [u["login"] for u, _ in usuarios]
+    amostra = rng.choices(logins, k=min(n, AMOSTRA_CONSULTAS))
+    caminho = os.path.join(diretorio, f"fila_{n}_{distribuicao}.csv")
+    ops = {}
+
+    fila.esvaziarFila()
+
+    def adicionar():
+        for u, est in usuarios:
+            fila.adicionarNaFila(u, est)
+
+    def posicao():
+        for login in amostra:
+            fila.consultarPosicaoNaFila(login)
+
+    def primeiro():
+        for est in ESTACIONAMENTOS * (len(amostra) // len(ESTACIONAMENTOS)):
+            fila.retornaPrimeiro(est)
+
+    def remover():
+        for login in logins:
+            fila.removerDaFila(login)
+
+    _medir(ops, "adicionar", n, adicionar)
+    _medir(ops, "posicao", len(amostra), posicao)
+    _medir(ops, "primeiro", len(amostra) // len(ESTACIONAMENTOS) * len(ESTACIONAMENTOS),
+           primeiro)
+    _medir(ops, "salvar", n, lambda: fila.salvar_fila_em_csv(caminho))
+    _medir(ops, "carregar", n, lambda: fila.carregar_fila_de_csv(caminho))
+    rng.shuffle(logins)
+    _medir(ops, "remover", n, remover)
+    fila.esvaziarFila()
+
+    pico = _picoMemoria(usuarios)
+    return {"tamanho": n, "distribuicao": distribuicao,
+            "pico_memoria_bytes": pico, "bytes_por_entrada": round(pico / n, 1),
+            "operacoes": ops}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do módulo fila.")
+    parser.add_argument("--tamanhos", type=int, nargs="+",
+                        default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--distribuicoes", nargs="+", choices=sorted(DISTRIBUICOES),
+                        default=["uniforme", "enviesada"])
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        resultados = [executar(n, d, diretorio)
+                      for n in args.tamanhos for d in args.distribuicoes]
+
+    relatorio = {"modulo": "fila", "python": platform.python_version(),
+                 "resultados": resultados}
+    texto = json.dumps(relatorio, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
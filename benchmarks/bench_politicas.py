@@ -0,0 +1,136 @@
+"""
+    Benchmark das políticas de alocação de vagas.
+
+    Objetivo:
+        Comparar as políticas de estacionamento.definir_politica num
+        estacionamento sintético com andares e zonas: custo de montar a
+        estrutura da política, vazão de alocação/liberação em regime
+        (rotatividade) e memória da estrutura.
+
+    Uso:
+        python benchmarks/bench_politicas.py [--tamanhos 10000 100000]
+                                             [--ocupacao 0.8]
+                                             [--operacoes 50000]
+                                             [--saida arq.json]
+
+    Saída:
+        JSON com um registro por (tamanho, política):
+            {"tamanho", "politica", "montar_segundos", "memoria_bytes",
+             "operacoes": {nome: {"ops", "segundos", "ops_por_segundo"}}}
+
+    Operações medidas:
+        encher      — ocupar_vaga_por_login até a ocupação pedida;
+        rotatividade — pares (liberar_vaga_de de um ocupante sorteado,
+                       ocupar_vaga_por_login de um novo), com a garagem cheia
+                       na proporção pedida.
+
+    Restrições:
+        - 10 andares × 10 zonas de tamanhos iguais; distâncias à entrada
+          crescem com o andar, com ruído, sorteadas com semente fixa.
+        - Memória da estrutura medida com tracemalloc em definir_politica,
+          numa passada separada. "rodizio" só monta a árvore de Fenwick do
+          bloco na primeira alocação (o custo cai em "encher", não em
+          "memoria_bytes").
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import estacionamento as est_mod  # noqa: E402
+import vagas as vaga_mod  # noqa: E402
+
+POLITICAS = ("primeira", "menor_id", "proxima_entrada", "rodizio", "por_zona")
+ANDARES, ZONAS = 10, 10
+SEMENTE = 2025
+
+
+def _criarEstacionamento(n, rng):
+    est = est_mod.novo_estacionamento("Sintético")
+    est["vagas"] = vaga_mod.novo_bloco_de_estados(["0"] * n)
+    por_zona = n // (ANDARES * ZONAS)
+    est_mod.definir_setores(est, [(f"Piso {a}", [(f"Zona {z}", por_zona) for z in range(ZONAS)])
+                                  for a in range(ANDARES)])
+    distancias = {i: (i - 1) // (n // ANDARES) * 100 + rng.random() * 100
+                  for i in range(1, n + 1)}
+    return est, distancias
+
+
+def _medir(resultado, nome, ops, funcao):
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    resultado[nome] = {"ops": ops, "segundos": round(segundos, 6),
+                       "ops_por_segundo": round(ops / segundos, 1) if segundos else None}
+
+
+def _definir(est, politica, distancias):
+    opcoes = {"distancias": distancias} if politica == "proxima_entrada" else {}
+    est_mod.definir_politica(est, politica, **opcoes)
+
+
+def executar(n, politica, ocupacao, operacoes):
+    rng = random.Random(SEMENTE)
+    est, distancias = _criarEstacionamento(n, rng)
+
+    inicio = time.perf_counter()
+    _definir(est, politica, distancias)
+    montar = time.perf_counter() - inicio
+
+    alvo = int(n * ocupacao)
+    logins = [f"{k:07d}" for k in range(alvo)]
+    ops = {}
+
+    def encher():
+        for login in logins:
+            est_mod.ocupar_vaga_por_login(est, login)
+
+    def rotatividade():
+        for k in range(operacoes):
+            i = rng.randrange(len(logins))
+            est_mod.liberar_vaga_de(est, {"login": logins[i]})
+            logins[i] = f"R{k:07d}"
+            est_mod.ocupar_vaga_por_login(est, logins[i])
+
+    _medir(ops, "encher", alvo, encher)
+    _medir(ops, "rotatividade", operacoes, rotatividade)
+    assert est_mod.vagas_livres(est) == n - alvo
+
+    est, _ = _criarEstacionamento(n, random.Random(SEMENTE))
+    tracemalloc.start()
+    _definir(est, politica, distancias)
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"tamanho": n, "politica": politica, "montar_segundos": round(montar, 6),
+            "memoria_bytes": memoria, "operacoes": ops}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das políticas de alocação.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--ocupacao", type=float, default=0.8)
+    parser.add_argument("--operacoes", type=int, default=50_000)
+    parser.add_argument("--politicas", nargs="+", choices=POLITICAS, default=list(POLITICAS))
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    resultados = [executar(n, p, args.ocupacao, args.operacoes)
+                  for n in args.tamanhos for p in args.politicas]
+    relatorio = {"modulo": "estacionamento.politicas", "python": platform.python_version(),
+                 "resultados": resultados}
+    texto = json.dumps(relatorio, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
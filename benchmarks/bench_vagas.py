@@ -0,0 +1,137 @@
+"""
+    Benchmark dos registros–vaga.
+
+    Objetivo:
+        Comparar o registro dict antigo ({"id", "estado"}) com a classe
+        vagas.Vaga (__slots__) e com o vagas.BlocoVagas: memória por vaga e
+        vazão dos acessores nos caminhos quentes de estacionamento (varredura
+        por vaga livre, busca por login, ocupar/liberar).
+
+    Uso:
+        python benchmarks/bench_vagas.py [--tamanhos 1000 50000]
+                                         [--repeticoes 5] [--saida arq.json]
+
+    Saída:
+        JSON com um registro por (tamanho, representação):
+            {"tamanho", "representacao", "bytes_por_vaga",
+             "operacoes": {nome: {"ops", "segundos", "ops_por_segundo"}}}
+
+    Restrições:
+        - A versão dict usa acessores equivalentes aos originais (por chave),
+          reproduzidos aqui só para comparação.
+        - Memória medida com tracemalloc, fora das passadas cronometradas.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+import vagas as vaga_mod  # noqa: E402
+
+
+# ------------------------------------------------ versão dict (referência)
+def _dictNova(id_vaga):
+    return {"id": id_vaga, "estado": 0}
+
+def _dictEstaLivre(vaga):
+    return vaga["estado"] == 0
+
+def _dictEstaOcupadaPor(vaga, login):
+    return vaga["estado"] == login
+
+def _dictOcupar(vaga, login):
+    if _dictEstaLivre(vaga):
+        vaga["estado"] = login
+        return True
+    return False
+
+def _dictLiberar(vaga):
+    vaga["estado"] = 0
+
+
+REPRESENTACOES = {
+    "dict": (lambda n: [_dictNova(i) for i in range(1, n + 1)],
+             _dictEstaLivre, _dictEstaOcupadaPor, _dictOcupar, _dictLiberar),
+    "slots": (lambda n: [vaga_mod.nova_vaga(i) for i in range(1, n + 1)],
+              vaga_mod.estaLivre, vaga_mod.estaOcupadaPor, vaga_mod.ocupar,
+              vaga_mod.liberar),
+    "bloco": (lambda n: vaga_mod.novo_bloco_vagas(range(1, n + 1)),
+              vaga_mod.estaLivre, vaga_mod.estaOcupadaPor, vaga_mod.ocupar,
+              vaga_mod.liberar),
+}
+
+
+def _medir(resultado, nome, ops, funcao, repeticoes):
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        segundos = time.perf_counter() - inicio
+        melhor = segundos if melhor is None else min(melhor, segundos)
+    resultado[nome] = {"ops": ops, "segundos": round(melhor, 6),
+                       "ops_por_segundo": round(ops / melhor, 1) if melhor else None}
+
+
+def _bytesPorVaga(criar, n):
+    tracemalloc.start()
+    colecao = criar(n)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del colecao
+    return round(atual / n, 1)
+
+
+def executar(n, nome, repeticoes):
+    criar, esta_livre, ocupada_por, ocupar, liberar = REPRESENTACOES[nome]
+    colecao = criar(n)
+    for i, v in enumerate(colecao):              # metade ocupada, alternada
+        if i % 2:
+            ocupar(v, f"U{i:07d}")
+    alvo = f"U{n - 1 if (n - 1) % 2 else n - 2:07d}"
+    ops = {}
+
+    def varrer_livres():
+        sum(1 for v in colecao if esta_livre(v))
+
+    def buscar_login():
+        next((v for v in colecao if ocupada_por(v, alvo)), None)
+
+    def ocupar_liberar():
+        for v in colecao:
+            if ocupar(v, "X"):
+                liberar(v)
+
+    _medir(ops, "criar", n, lambda: criar(n), repeticoes)
+    _medir(ops, "varrer_livres", n, varrer_livres, repeticoes)
+    _medir(ops, "buscar_login", n, buscar_login, repeticoes)
+    _medir(ops, "ocupar_liberar", n, ocupar_liberar, repeticoes)
+    return {"tamanho": n, "representacao": nome,
+            "bytes_por_vaga": _bytesPorVaga(criar, n), "operacoes": ops}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos registros–vaga.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1_000, 50_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--saida", help="arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+
+    resultados = [executar(n, nome, args.repeticoes)
+                  for n in args.tamanhos for nome in REPRESENTACOES]
+    relatorio = {"modulo": "vagas", "python": platform.python_version(),
+                 "resultados": resultados}
+    texto = json.dumps(relatorio, indent=2)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    else:
+        print(texto)
+
+
+if __name__ == "__main__":
+    main()
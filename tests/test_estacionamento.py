@@ -216,4 +216,355 @@ def test_listar_status_vagas_sem_vagas(capsys):
     out = capsys.readouterr().out
     assert "SemVagas" in out
     # não deve existir “Vaga <número>” (ex.: “Vaga 01”, “Vaga 1” etc.)
-    assert re.search(r"Vaga\s+\d+", out) is None
\ No newline at end of file
+    assert re.search(r"Vaga\s+\d+", out) is None
+# ---------------------------------------------------------------------------
+def test_verificar_status_vaga_por_indice():
+    est = _mock_est(qtd_vagas=3, ocupadas=[2])
+    est_mod.adicionar_vaga(est, vaga_mod.nova_vaga(10))
+    assert est_mod._verificar_status_vaga(est, 2) == "Vaga 02: Ocupada por U2"
+    assert est_mod._verificar_status_vaga(est, 10) == "Vaga 10: Livre"
+    assert est_mod._verificar_status_vaga(est, 4) == "ID de vaga inválido."
+    assert vaga_mod.ocupaVagaPorId(est["vagas"], 10, "U10")
+    assert est_mod._verificar_status_vaga(est, 10) == "Vaga 10: Ocupada por U10"
+
+# ---------------------------------------------------------------------------
+def test_renderizar_status_vagas_filtro_e_paginas():
+    est = _mock_est("Bloco R", qtd_vagas=5, ocupadas=[2, 4])
+    texto = est_mod.renderizar_status_vagas(est)
+    assert texto.splitlines()[2:] == [vaga_mod.status(v) for v in est["vagas"]]
+    ocupadas = est_mod.renderizar_status_vagas(est, filtro="ocupadas").splitlines()
+    assert ocupadas[2:] == ["Vaga 02: Ocupada por U2", "Vaga 04: Ocupada por U4"]
+    pagina2 = est_mod.renderizar_status_vagas(est, filtro="livres", pagina=2, por_pagina=2)
+    assert pagina2.splitlines()[2:] == ["Vaga 05: Livre"]
+    with pytest.raises(ValueError):
+        est_mod.renderizar_status_vagas(est, filtro="todas")
+    with pytest.raises(ValueError):
+        est_mod.renderizar_status_vagas(est, pagina=0, por_pagina=2)
+
+@pytest.mark.parametrize("filtro", [None, "ocupadas"])
+def test_renderizar_status_vagas_formata_so_a_pagina(monkeypatch, filtro):
+    est = est_mod.novo_estacionamento("P")
+    est["vagas"] = vaga_mod.novo_bloco_de_estados([f"U{i}" for i in range(1, 101)])
+    formatadas = []
+    original = vaga_mod.BlocoVagas._estado
+    monkeypatch.setattr(vaga_mod.BlocoVagas, "_estado",
+                        lambda self, i: formatadas.append(i) or original(self, i))
+    pagina = est_mod.renderizar_status_vagas(est, filtro, pagina=5, por_pagina=10)
+    assert pagina.splitlines()[2] == "Vaga 41: Ocupada por U41"
+    assert formatadas == list(range(40, 50))
+
+    lista = [vaga_mod.nova_vaga(i) for i in range(1, 31)]
+    chamadas = []
+    status = vaga_mod.status
+    monkeypatch.setattr(vaga_mod, "status", lambda v: chamadas.append(v.id) or status(v))
+    assert list(vaga_mod.statusVagas(lista, filtro and "livres", 20, 25)) == [
+        f"Vaga {i}: Livre" for i in range(21, 26)]
+    assert chamadas == list(range(21, 26))
+
+def test_listar_status_vagas_escrita_unica(monkeypatch):
+    est = _mock_est(qtd_vagas=3, ocupadas=[1])
+    chamadas = []
+    monkeypatch.setattr(builtins, "print", lambda *a, **k: chamadas.append(a))
+    est_mod.listar_status_vagas(est, filtro="livres")
+    assert len(chamadas) == 1 and "Vaga 03: Livre" in chamadas[0][0]
+
+def test_vagas_ocupadas_contador():
+    est = _mock_est(qtd_vagas=4, ocupadas=[2, 3])
+    assert est_mod.vagas_ocupadas(est) == 2
+    est_mod.ocupar_vaga_por_login(est, "U9")
+    assert (est_mod.vagas_livres(est), est_mod.vagas_ocupadas(est)) == (1, 3)
+
+
+# ---------------------------------------------------------------------------
+def test_snapshot_binario_ida_e_volta(tmp_path):
+    a = est_mod.novo_estacionamento("Estação Á")
+    a["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "joão", "0", "U4"])
+    b = est_mod.novo_estacionamento("B")
+    for i in (5, 9, 2):                       # ids fora de ordem
+        est_mod.adicionar_vaga(b, vaga_mod.nova_vaga(i))
+    vaga_mod.ocupar(b["vagas"][1], "joão")
+    vazio = est_mod.novo_estacionamento("Vazio")
+    caminho = str(tmp_path / "ests.bin")
+    est_mod.salvar_estacionamentos_binario([a, b, vazio], caminho)
+
+    ests = est_mod.criar_estacionamentos_de_binario(caminho)
+    assert [e["nome"] for e in ests] == ["Estação Á", "B", "Vazio"]
+    for original, lido in zip((a, b, vazio), ests):
+        assert [(v.id, v.estado) for v in lido["vagas"]] == \
+               [(v.id, v.estado) for v in original["vagas"]]
+        assert est_mod.vagas_livres(lido) == est_mod.vagas_livres(original)
+    assert vaga_mod.getId(est_mod.buscar_vaga_por_login(ests[1], "joão")) == 9
+    assert est_mod.get_vaga_disponivel(ests[1])["id"] == 5
+
+def test_snapshot_binario_consultas_sem_carregar(tmp_path):
+    est = est_mod.novo_estacionamento("A")
+    est["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2", "0"])
+    caminho = str(tmp_path / "ests.bin")
+    est_mod.salvar_estacionamentos_binario([est], caminho)
+    snap = est_mod.abrir_snapshot(caminho)
+    try:
+        assert est_mod.snapshot_vagas_livres(snap, "A") == 2
+        assert est_mod.snapshot_estado_vaga(snap, "A", 2) == "U2"
+        assert est_mod.snapshot_estado_vaga(snap, "A", 3) == 0
+        assert est_mod.snapshot_estado_vaga(snap, "A", 4) is None
+        assert est_mod.snapshot_vagas_livres(snap, "X") is None
+    finally:
+        est_mod.fechar_snapshot(snap)
+
+@pytest.mark.parametrize("conteudo", [b"", b"CSV!" + bytes(40),
+                                      b"ESTB\x63\x00" + bytes(40)])
+def test_snapshot_binario_invalido(tmp_path, conteudo):
+    caminho = tmp_path / "ests.bin"
+    caminho.write_bytes(conteudo)
+    with pytest.raises(ValueError):
+        est_mod.abrir_snapshot(str(caminho))
+
+@pytest.mark.parametrize("corte", [40, 60, -3])
+def test_snapshot_binario_truncado(tmp_path, corte):
+    a = est_mod.novo_estacionamento("A")
+    a["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2", "0"])
+    b = est_mod.novo_estacionamento("B")
+    b["vagas"] = vaga_mod.novo_bloco_de_estados(["U7", "0"])
+    caminho = tmp_path / "ests.bin"
+    est_mod.salvar_estacionamentos_binario([a, b], str(caminho))
+    conteudo = caminho.read_bytes()
+    caminho.write_bytes(conteudo[:corte])
+    with pytest.raises(ValueError):
+        est_mod.abrir_snapshot(str(caminho))
+
+def test_snapshot_binario_ocupante_corrompido(tmp_path):
+    a = est_mod.novo_estacionamento("A")
+    a["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2"])
+    caminho = tmp_path / "ests.bin"
+    est_mod.salvar_estacionamentos_binario([a], str(caminho))
+    conteudo = bytearray(caminho.read_bytes())
+    off = est_mod._CABECALHO.size + est_mod._LOTE.size
+    conteudo[off + 12:off + 16] = (99).to_bytes(4, "little")   # ocupante da 2ª vaga
+    caminho.write_bytes(bytes(conteudo))
+    snap = est_mod.abrir_snapshot(str(caminho))
+    try:
+        with pytest.raises(ValueError):
+            est_mod.snapshot_estado_vaga(snap, "A", 2)
+        with pytest.raises(ValueError):
+            est_mod.carregar_snapshot(snap)
+    finally:
+        est_mod.fechar_snapshot(snap)
+
+def test_salvamento_incremental(tmp_path):
+    caminho = str(tmp_path / "ests.patch")
+    a = est_mod.novo_estacionamento("A")
+    a["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2", "0"])
+    b = est_mod.novo_estacionamento("B")
+    b["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "0"])
+    assert est_mod.salvar_alteracoes([a, b], caminho) == 0   # carga = ponto de partida
+
+    est_mod.ocupar_vaga_por_login(a, "U1")
+    est_mod.liberar_vaga_de(a, {"login": "U2"})
+    assert est_mod.salvar_alteracoes([a, b], caminho) == 2
+    est_mod.ocupar_vaga_por_login(a, "U3")
+    novo = est_mod.novo_estacionamento("C")
+    est_mod.adicionar_vaga(novo, vaga_mod.nova_vaga(7))
+    assert est_mod.salvar_alteracoes([a, b, novo], caminho) == 2
+    assert est_mod.salvar_alteracoes([a, b, novo], caminho) == 0
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write("A,x")                                     # linha truncada
+
+    ests = [est_mod.novo_estacionamento("A"), est_mod.novo_estacionamento("B")]
+    ests[0]["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2", "0"])
+    ests[1]["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "0"])
+    assert est_mod.aplicar_alteracoes(ests, caminho) == 4
+    assert [e["nome"] for e in ests] == ["A", "B", "C"]
+    assert [v.estado for v in ests[0]["vagas"]] == ["U1", "U3", 0]
+    assert [(v.id, v.estado) for v in ests[2]["vagas"]] == [(7, 0)]
+    assert est_mod.salvar_alteracoes(ests, caminho) == 0   # já estavam no arquivo
+
+    est_mod.zerar_alteracoes(ests, caminho)
+    assert est_mod.aplicar_alteracoes(ests, caminho) == 0
+
+def test_salvamento_incremental_descarta_linha_cortada(tmp_path):
+    caminho = tmp_path / "ests.patch"
+    caminho.write_text("A,1,U1\r\nA,12,2212", encoding="utf-8")    # queda no meio
+    a = est_mod.novo_estacionamento("A")
+    a["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "0", "0"])
+    assert est_mod.salvar_alteracoes([a], str(caminho)) == 0
+    est_mod.ocupar_vaga_por_login(a, "U3")
+    assert est_mod.salvar_alteracoes([a], str(caminho)) == 1
+    assert caminho.read_bytes() == b"A,1,U1\r\nA,1,U3\r\n"
+
+    caminho.write_text("A,1,U1\r\nA,3,U3\r\nA,12,2212", encoding="utf-8")
+    ests = [est_mod.novo_estacionamento("A")]
+    ests[0]["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "0", "0"])
+    assert est_mod.aplicar_alteracoes(ests, str(caminho)) == 2
+    assert est_mod.estado_vaga(ests[0], 12) is None
+    assert caminho.read_bytes() == b"A,1,U1\r\nA,3,U3\r\n"
+
+    caminho.write_text("A,1,U", encoding="utf-8")               # só a linha cortada
+    assert est_mod.aplicar_alteracoes(ests, str(caminho)) == 0
+    assert caminho.read_bytes() == b""
+
+# ---------------------------------------------------------------------------
+def _est_com_setores(ocupadas=()):
+    est = est_mod.novo_estacionamento("Central")
+    est["vagas"] = vaga_mod.novo_bloco_de_estados(
+        [f"U{i}" if i in ocupadas else "0" for i in range(1, 13)])
+    est_mod.definir_setores(est, [
+        ("Piso 1", [("A", 4), ("B", 4)]),
+        ("Piso 2", [("C", 2), ("D", 2)]),
+    ])
+    return est
+
+def test_setores_contagem_e_busca():
+    est = _est_com_setores(ocupadas=[1, 2, 5, 6, 7, 8])
+    assert est_mod.livres_por_setor(est) == [("Piso 1", 2), ("Piso 2", 4)]
+    assert est_mod.livres_por_setor(est, 2) == [("Piso 1/A", 2), ("Piso 1/B", 0),
+                                               ("Piso 2/C", 2), ("Piso 2/D", 2)]
+    assert est_mod.vaga_livre_no_setor(est, "Piso 1")["id"] == 3
+    assert est_mod.vaga_livre_no_setor(est, "Piso 1/B") is None
+    assert est_mod.ocupar_vaga_no_setor(est, "Piso 2", "U99") == (True, 9)
+    assert est_mod.vagas_livres_no_setor(est, "Piso 2/C") == 1
+    est_mod.liberar_vaga_de(est, {"login": "U7"})
+    assert est_mod.vaga_livre_no_setor(est, "Piso 1/B")["id"] == 7
+    with pytest.raises(ValueError):
+        est_mod.vagas_livres_no_setor(est, "Piso 3")
+
+def test_setor_livre_mais_proximo():
+    est = _est_com_setores(ocupadas=[1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+    assert est_mod.setor_livre_mais_proximo(est, "Piso 1/A") == "Piso 2/D"
+    assert est_mod.setor_livre_mais_proximo(est, "Piso 2") == "Piso 2/D"
+    est_mod.liberar_vaga_de(est, {"login": "U2"})
+    assert est_mod.setor_livre_mais_proximo(est, "Piso 1/B") == "Piso 1/A"
+    est_mod.ocupar_vaga_no_setor(est, "Piso 2/D", "X")
+    est_mod.ocupar_vaga_no_setor(est, "Piso 2/D", "Y")
+    est_mod.ocupar_vaga_no_setor(est, "Piso 1/A", "Z")
+    assert est_mod.setor_livre_mais_proximo(est, "Piso 1") is None
+
+def test_setor_livre_mais_proximo_com_zonas_vazias():
+    est = est_mod.novo_estacionamento("Central")    # livres: 4 (Z2) e 10 (Z6)
+    est["vagas"] = vaga_mod.novo_bloco_de_estados(
+        ["0" if i in (4, 10) else f"U{i}" for i in range(1, 14)])
+    est_mod.definir_setores(est, [("Z1", 3), ("Z2", 2), ("Z3", 4), ("Z4", 0),
+                                  ("Z5", 0), ("Z6", 4)])
+    assert est_mod.setor_livre_mais_proximo(est, "Z3") == "Z2"
+    assert est_mod.setor_livre_mais_proximo(est, "Z5") == "Z6"
+    assert est_mod.setor_livre_mais_proximo(est, "Z4") == "Z6"     # empate: depois
+    est_mod.liberar_vaga_de(est, {"login": "U9"})   # última de Z3
+    assert est_mod.setor_livre_mais_proximo(est, "Z4") == "Z3"
+    assert est_mod.setor_livre_mais_proximo(est, "Z5") == "Z6"
+
+    class SemVarredura(dict):
+        def values(self):
+            raise AssertionError("percorreu os setores")
+    est["setores"]["caminhos"] = SemVarredura(est["setores"]["caminhos"])
+    assert est_mod.setor_livre_mais_proximo(est, "Z1") == "Z2"
+
+def test_definir_setores_invalidos():
+    est = _mock_est("Central", qtd_vagas=3)
+    for setores in ([("Piso 1", 4)], [("a/b", 1)], [("A", 1), ("A", 1)], [("A", -1)]):
+        with pytest.raises(ValueError):
+            est_mod.definir_setores(est, setores)
+
+def test_carregar_setores_de_csv(tmp_path, capsys):
+    caminho = tmp_path / "setores.csv"
+    caminho.write_text("Central,Piso 1/A,4\nCentral,Piso 1/B,4\nCentral,Piso 2,4\n"
+                       "Outro,Piso 1,99\nlinha ruim\n", encoding="utf-8")
+    central, outro = _mock_est("Central", qtd_vagas=12), _mock_est("Outro", qtd_vagas=2)
+    est_mod.carregar_setores_de_csv([central, outro], str(caminho))
+    assert est_mod.livres_por_setor(central) == [("Piso 1", 8), ("Piso 2", 4)]
+    assert "setores" not in outro and "Setores ignorados" in capsys.readouterr().out
+    est_mod.carregar_setores_de_csv([central], str(tmp_path / "nao_existe.csv"))
+
+# ---------------------------------------------------------------------------
+def _est_ids(ids, ocupadas=()):
+    est = est_mod.novo_estacionamento("P")
+    for i in ids:
+        v = vaga_mod.nova_vaga(i)
+        if i in ocupadas:
+            vaga_mod.ocupar(v, f"U{i}")
+        est_mod.adicionar_vaga(est, v)
+    return est
+
+def _alocar(est, n):
+    return [est_mod.ocupar_vaga_por_login(est, f"N{k}")[1] for k in range(n)]
+
+def test_politica_menor_id():
+    est = _est_ids([7, 3, 9, 1, 5], ocupadas=[1])
+    est_mod.definir_politica(est, "menor_id")
+    assert _alocar(est, 2) == [3, 5]
+    est_mod.liberar_vaga_de(est, {"login": "U1"})
+    assert _alocar(est, 4) == [1, 7, 9, None]
+
+def test_politica_proxima_entrada():
+    est = _est_ids([1, 2, 3, 4])
+    est_mod.definir_politica(est, "proxima_entrada", distancias={1: 40, 2: 10, 3: 30})
+    assert _alocar(est, 2) == [2, 3]
+    est_mod.liberar_vaga_de(est, {"login": "N0"})
+    assert _alocar(est, 3) == [2, 1, 4]          # sem distância: por último
+
+def test_politica_rodizio():
+    est = _est_ids([1, 2, 3, 4])
+    est_mod.definir_politica(est, "rodizio")
+    assert _alocar(est, 2) == [1, 2]
+    est_mod.liberar_vaga_de(est, {"login": "N0"})
+    assert _alocar(est, 3) == [3, 4, 1]          # volta ao início só no fim
+
+def test_politica_por_zona():
+    est = _est_ids(range(1, 9), ocupadas=[5, 6])
+    est_mod.definir_setores(est, [("A", 4), ("B", 4)])
+    est_mod.definir_politica(est, "por_zona")
+    assert _alocar(est, 3) == [7, 8, 1]          # completa B antes de abrir A
+    est_mod.liberar_vaga_de(est, {"login": "N0"})
+    est_mod.liberar_vaga_de(est, {"login": "N2"})
+    assert _alocar(est, 1) == [7]                # B (1 livre) mais cheia que A
+
+def test_politica_por_zona_liberacao_sem_percorrer_zonas():
+    class SemVarredura(list):
+        def __iter__(self):
+            raise AssertionError("percorreu as zonas")
+    est = _est_ids(range(1, 9))
+    est_mod.definir_setores(est, [("A", 3), ("Vazia", 0), ("B", 5)])
+    est_mod.definir_politica(est, "por_zona")
+    assert _alocar(est, 4) == [1, 2, 3, 4]
+    estado = est["politica"]["estado"]
+    estado["zonas"] = SemVarredura(estado["zonas"])
+    est_mod.liberar_vaga_de(est, {"login": "N3"})          # vaga 4, zona B
+    est_mod.liberar_vaga_de(est, {"login": "N0"})          # vaga 1, zona A
+    assert _alocar(est, 1) == [1]                          # A (1 livre) mais cheia
+
+def test_politica_remonta_apos_liberacao_por_fora():
+    est = _est_ids([1, 2])
+    est_mod.definir_politica(est, "menor_id")
+    assert _alocar(est, 3) == [1, 2, None]
+    vaga_mod.liberar(vaga_mod.buscaVagaPorId(est["vagas"], 2))   # sem aviso
+    assert _alocar(est, 1) == [2]
+
+def test_politica_desconhecida():
+    with pytest.raises(ValueError):
+        est_mod.definir_politica(_est_ids([1]), "aleatoria")
+
+# ---------------------------------------------------------------------------
+def test_aplicar_eventos_em_lote():
+    est = est_mod.novo_estacionamento("Sensores")
+    est["vagas"] = vaga_mod.novo_bloco_de_estados(["0", "U2", "0", "0"])
+    conflitos = est_mod.aplicar_eventos(est, [
+        (1, "S1"),          # ok
+        (2, "S2"),          # ocupada por U2
+        (3, None),          # já livre
+        (9, "S9"),          # não existe
+        (3, "S1"),          # S1 já está na vaga 1
+        (1, "S1"),          # repetido: não é conflito
+        (2, 0),             # ok: U2 saiu
+        (4, "U2"),          # ok
+    ])
+    assert conflitos == [(1, "vaga_ocupada"), (2, "vaga_ja_livre"),
+                         (3, "vaga_inexistente"), (4, "login_em_outra_vaga")]
+    assert [v.estado for v in est["vagas"]] == ["S1", 0, 0, "U2"]
+    assert est_mod.vagas_livres(est) == 2
+    assert est_mod.get_vaga_disponivel(est)["id"] == 2
+    assert est_mod.buscar_vaga_por_login(est, "U2")["id"] == 4
+
+def test_aplicar_eventos_avisa_politica():
+    est = _est_ids([1, 2, 3])
+    est_mod.definir_politica(est, "menor_id")
+    assert _alocar(est, 3) == [1, 2, 3]
+    assert est_mod.aplicar_eventos(est, [(2, None), (3, 0)]) == []
+    assert _alocar(est, 2) == [2, 3]
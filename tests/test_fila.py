@@ -10,14 +10,22 @@ from fila import (
     tamanhoFila,
     carregar_fila_de_csv,
     salvar_fila_em_csv,
+    estaNaFila,
+    compactarFila,
+    configurarRemocao,
+    estatisticasCompactacao,
+    adicionarVariosNaFila,
 )
 
 # Fixture para limpar a fila antes de cada teste
 @pytest.fixture(autouse=True)
 def _reset_fila():
-    fila._FILA.clear()
+    fila.esvaziarFila()
+    fila.configurarRemocao(preguicosa=True, limiar=0.5)
+    fila.configurarNiveis(3)
     yield
-    fila._FILA.clear()
+    fila.fecharJournal()
+    fila.esvaziarFila()
 
 def teste_fila_inicialmente_vazia():
     assert tamanhoFila() == 0
@@ -204,3 +212,287 @@ def test_carregar_fila_csv_inexistente(tmp_path):
         os.remove(inexistente)
     carregar_fila_de_csv(str(inexistente))  # não deve levantar
     assert tamanhoFila() == 0
+
+
+def test_niveis_mantem_prioridade_e_ordem_de_chegada():
+    """Inserções intercaladas e remoções no meio preservam tipo → chegada."""
+    for i in range(20):
+        adicionarNaFila({"login": f"U{i}", "tipo": 1 + (i % 3)})
+    for login in ("U3", "U10", "U0", "U17"):
+        assert removerDaFila(login) == 0
+
+    esperados = [f"U{i}" for t in (1, 2, 3) for i in range(20)
+                 if 1 + (i % 3) == t and f"U{i}" not in ("U3", "U10", "U0", "U17")]
+    assert tamanhoFila() == len(esperados)
+    for pos, login in enumerate(esperados, 1):
+        assert consultarPosicaoNaFila(login) == pos
+    assert retornaPrimeiro()["login"] == esperados[0]
+
+
+def test_indice_acompanha_insercoes_e_remocoes():
+    """estaNaFila e o índice interno refletem cada mutação da fila."""
+    for i in range(10):
+        adicionarNaFila({"login": f"U{i}", "tipo": 2 - (i % 2)})
+    assert all(estaNaFila(f"U{i}") for i in range(10))
+    removerDaFila("U4")
+    assert not estaNaFila("U4")
+    assert removerDaFila("U4") == -1
+    # cada login aponta para a própria entrada, no balde do seu nível
+    niveis = fila._FILAS[None]["niveis"]
+    for login, entrada in fila._INDICE.items():
+        assert entrada in niveis[entrada.tipo - 1]["entradas"]
+        assert entrada.login == login
+    assert adicionarNaFila({"login": "U4", "tipo": 1}) == 0
+    assert estaNaFila("U4")
+
+
+def test_posicoes_consistentes_apos_remocoes_no_meio():
+    """Posto via árvore de Fenwick confere com a ordem esperada (força bruta)."""
+    import random
+    rnd = random.Random(1040)
+    esperado = []                                  # lista ordenada de referência
+    for i in range(300):                           # força o crescimento das árvores
+        tipo = rnd.choice((1, 2, 3))
+        adicionarNaFila({"login": f"U{i}", "tipo": tipo})
+        esperado.append((tipo, i, f"U{i}"))
+        if i % 4 == 3:
+            vitima = rnd.choice(esperado)
+            esperado.remove(vitima)
+            assert removerDaFila(vitima[2]) == 0
+    esperado.sort()
+    assert tamanhoFila() == len(esperado)
+    for pos, (_, _, login) in enumerate(esperado, 1):
+        assert consultarPosicaoNaFila(login) == pos
+
+
+def test_remocao_preguicosa_deixa_lapide_e_compacta_no_limiar():
+    """Remoções viram lápides até passar do limiar; então a fila é compactada."""
+    configurarRemocao(limiar=0.5)
+    for i in range(10):
+        adicionarNaFila({"login": f"U{i}", "tipo": 1})
+    for i in range(5):                              # 5/10 — ainda no limiar
+        removerDaFila(f"U{i}")
+    estat = estatisticasCompactacao()
+    assert estat["mortas"] == 5 and estat["compactacoes"] == 0
+    assert fila._FILAS[None]["total"] == 10 and tamanhoFila() == 5
+    assert retornaPrimeiro()["login"] == "U5"       # pula as lápides do topo
+    assert estatisticasCompactacao()["lapides_no_topo"] == 5
+
+    for i in range(5, 8):                           # 3/5 > 0.5 → compacta
+        removerDaFila(f"U{i}")
+    estat = estatisticasCompactacao()
+    assert estat["compactacoes"] == 1 and estat["mortas"] == 0
+    assert fila._FILAS[None]["total"] == tamanhoFila() == 2
+    assert consultarPosicaoNaFila("U8") == 1
+    assert consultarPosicaoNaFila("U9") == 2
+
+
+def test_reinsercao_apos_remocao_preguicosa():
+    """Login removido (lápide ainda no balde) pode voltar à fila no fim."""
+    adicionarNaFila({"login": "U1", "tipo": 1})
+    adicionarNaFila({"login": "U2", "tipo": 1})
+    adicionarNaFila({"login": "U3", "tipo": 1})
+    removerDaFila("U2")
+    assert adicionarNaFila({"login": "U2", "tipo": 1}) == 0
+    assert consultarPosicaoNaFila("U2") == 3
+    assert compactarFila() == 1
+    assert [consultarPosicaoNaFila(l) for l in ("U1", "U3", "U2")] == [1, 2, 3]
+
+
+def test_remocao_imediata_e_limiar_invalido():
+    configurarRemocao(preguicosa=False)
+    adicionarNaFila({"login": "U1", "tipo": 2})
+    adicionarNaFila({"login": "U2", "tipo": 1})
+    removerDaFila("U2")
+    assert fila._FILAS[None]["total"] == 1 and estatisticasCompactacao()["mortas"] == 0
+    with pytest.raises(ValueError):
+        configurarRemocao(limiar=1.5)
+
+
+def test_journal_reconstroi_fila_apos_queda(tmp_path):
+    """Snapshot + diário: eventos posteriores ao snapshot não se perdem."""
+    csv_path = tmp_path / "fila.csv"
+    csv_path.write_text("U1,1\nU2,2\n", encoding="utf-8")
+    carregar_fila_de_csv(str(csv_path))
+    fila.abrirJournal(str(csv_path))
+    adicionarNaFila({"login": "U3", "tipo": 1})
+    removerDaFila("U1")
+    adicionarNaFila({"login": "U4", "tipo": 2})
+
+    # o snapshot não foi regravado; só o diário cresceu
+    assert csv_path.read_text(encoding="utf-8").split() == ["U1,1", "U2,2"]
+    assert (tmp_path / "fila.journal").read_text(encoding="utf-8").split() == [
+        "+,U3,1", "-,U1", "+,U4,2"]
+
+    fila.fecharJournal()                          # simula a queda do processo
+    fila.esvaziarFila()
+    carregar_fila_de_csv(str(csv_path))
+    assert [consultarPosicaoNaFila(l) for l in ("U3", "U2", "U4")] == [1, 2, 3]
+    assert tamanhoFila() == 3
+
+
+@pytest.mark.parametrize("cortado", ["-,U1", "+,U3,1,Lo", "+,U3"])
+def test_journal_descarta_evento_cortado(tmp_path, cortado):
+    """Evento sem quebra de linha (queda no meio da escrita) é descartado e
+    o próximo evento não se cola a ele."""
+    csv_path = tmp_path / "fila.csv"
+    csv_path.write_text("U1,1\nU12,1\n", encoding="utf-8")
+    journal = tmp_path / "fila.journal"
+    journal.write_bytes(b"+,U2,1\r\n" + cortado.encode())
+    carregar_fila_de_csv(str(csv_path))
+    assert [consultarPosicaoNaFila(l) for l in ("U1", "U12", "U2")] == [1, 2, 3]
+    assert tamanhoFila() == 3
+    assert journal.read_bytes() == b"+,U2,1\r\n"
+
+    journal.write_bytes(b"+,U2,1\r\n" + cortado.encode())        # cortado de novo
+    fila.abrirJournal(str(csv_path))
+    adicionarNaFila({"login": "U4", "tipo": 1})
+    fila.fecharJournal()
+    assert journal.read_bytes() == b"+,U2,1\r\n+,U4,1\r\n"
+    carregar_fila_de_csv(str(csv_path))
+    assert consultarPosicaoNaFila("U4") == 4
+
+
+def test_journal_snapshot_periodico_zera_diario(tmp_path):
+    csv_path = tmp_path / "fila.csv"
+    carregar_fila_de_csv(str(csv_path))
+    fila.abrirJournal(str(csv_path), intervalo=3)
+    for i in range(4):
+        adicionarNaFila({"login": f"U{i}", "tipo": 1})
+    # 3º evento disparou o snapshot; o 4º está apenas no diário
+    assert csv_path.read_text(encoding="utf-8").split() == ["U0,1", "U1,1", "U2,1"]
+    assert (tmp_path / "fila.journal").read_text(encoding="utf-8").split() == ["+,U3,1"]
+
+    salvar_fila_em_csv(str(csv_path))
+    assert (tmp_path / "fila.journal").read_text(encoding="utf-8") == ""
+    fila.fecharJournal()
+    carregar_fila_de_csv(str(csv_path))
+    assert tamanhoFila() == 4
+
+
+def test_adicionar_varios_equivale_a_insercoes_individuais():
+    """Lote deduplica contra a fila e dentro de si, mantendo a ordem final."""
+    adicionarNaFila({"login": "U0", "tipo": 2})
+    adicionarNaFila({"login": "U1", "tipo": 1})
+    lote = [{"login": f"U{i}", "tipo": 1 + (i % 3)} for i in range(12)]
+    lote.append({"login": "U5", "tipo": 1})       # repetido dentro do lote
+
+    ret = adicionarVariosNaFila(lote)
+    assert ret == [-1, -1] + [0] * 10 + [-1]
+    assert tamanhoFila() == 12
+
+    esperado = sorted([(2, 0, "U0"), (1, 0, "U1")] +
+                      [(1 + (i % 3), i, f"U{i}") for i in range(2, 12)])
+    for pos, (_, _, login) in enumerate(esperado, 1):
+        assert consultarPosicaoNaFila(login) == pos
+    niveis = fila._FILAS[None]["niveis"]
+    for login, entrada in fila._INDICE.items():
+        assert entrada in niveis[entrada.tipo - 1]["entradas"]
+        assert entrada.login == login
+
+
+def test_adicionar_varios_lote_pequeno_em_fila_grande():
+    adicionarVariosNaFila([{"login": f"U{i}", "tipo": 2} for i in range(64)])
+    assert adicionarVariosNaFila([{"login": "V", "tipo": 1}]) == [0]
+    assert retornaPrimeiro()["login"] == "V"
+    assert consultarPosicaoNaFila("U63") == 65
+
+
+def test_adicionar_varios_tipo_invalido_nao_insere_nem_diverge_do_diario(tmp_path):
+    caminho = str(tmp_path / "fila.csv")
+    fila.abrirJournal(caminho)
+    with pytest.raises(ValueError):
+        adicionarVariosNaFila([{"login": "A", "tipo": 1}, {"login": "B", "tipo": 9}])
+    assert tamanhoFila() == 0
+    adicionarVariosNaFila([{"login": "A", "tipo": 1}, {"login": "C", "tipo": 2}])
+    fila.fecharJournal()
+    carregar_fila_de_csv(caminho)
+    assert tamanhoFila() == 2 and retornaPrimeiro()["login"] == "A"
+
+def test_filas_por_estacionamento_e_despacho():
+    """Vaga no estacionamento A só chama quem quer A ou qualquer um."""
+    adicionarNaFila({"login": "B1", "tipo": 1}, "B")
+    adicionarNaFila({"login": "Q1", "tipo": 2})            # qualquer estacionamento
+    adicionarNaFila({"login": "A1", "tipo": 2}, "A")
+    adicionarNaFila({"login": "A2", "tipo": 1}, "A")
+
+    assert retornaPrimeiro("A")["login"] == "A2"           # tipo 1 vence
+    removerDaFila("A2")
+    assert retornaPrimeiro("A")["login"] == "Q1"           # mesmo tipo: chegou antes
+    assert retornaPrimeiro("C")["login"] == "Q1"           # lote sem fila própria
+    assert retornaPrimeiro()["login"] == "B1"              # visão global
+    assert consultarPosicaoNaFila("A1") == 1               # posição na própria fila
+    assert tamanhoFila() == 3
+    assert adicionarNaFila({"login": "A1", "tipo": 2}, "B") == -1
+
+
+def test_filas_por_estacionamento_persistem(tmp_path):
+    csv_path = tmp_path / "fila.csv"
+    adicionarNaFila({"login": "A1", "tipo": 2}, "A")
+    adicionarNaFila({"login": "Q1", "tipo": 2})
+    adicionarNaFila({"login": "B1", "tipo": 1}, "B")
+    salvar_fila_em_csv(str(csv_path))
+    assert csv_path.read_text(encoding="utf-8").split() == ["B1,1,B", "A1,2,A", "Q1,2"]
+
+    fila.abrirJournal(str(csv_path))
+    adicionarNaFila({"login": "A2", "tipo": 1}, "A")
+    fila.fecharJournal()
+    carregar_fila_de_csv(str(csv_path))
+    assert retornaPrimeiro("A")["login"] == "A2"
+    removerDaFila("A2")
+    assert retornaPrimeiro("A")["login"] == "A1"
+    assert retornaPrimeiro("B")["login"] == "B1"
+
+
+def test_niveis_configuraveis():
+    """Mais níveis (ex.: acessibilidade, staff) seguem a mesma ordem FIFO."""
+    fila.configurarNiveis(5)
+    for i, tipo in enumerate((5, 3, 1, 4, 5, 2)):
+        adicionarNaFila({"login": f"U{i}", "tipo": tipo})
+    assert [consultarPosicaoNaFila(f"U{i}") for i in range(6)] == [5, 3, 1, 4, 6, 2]
+    with pytest.raises(ValueError):
+        adicionarNaFila({"login": "X", "tipo": 6})
+    assert not estaNaFila("X")
+    with pytest.raises(ValueError):
+        fila.configurarNiveis(3)                   # ainda há tipos 4 e 5
+    removerDaFila("U0"); removerDaFila("U3"); removerDaFila("U4")
+    fila.configurarNiveis(3)
+    assert tamanhoFila() == 3 and retornaPrimeiro()["login"] == "U2"
+    with pytest.raises(ValueError):
+        fila.configurarNiveis(0)
+
+
+def test_entradas_compactas_resolvem_usuario_cadastrado(monkeypatch):
+    """A fila guarda só login/tipo; o registro completo vem de usuario."""
+    import usuario
+    cadastrado = usuario.novo_usuario("1234567", "segredo", 1)
+    monkeypatch.setattr(usuario, "usuarios", [cadastrado])
+    adicionarNaFila({"login": "1234567", "tipo": 1, "extra": "x" * 100})
+    adicionarNaFila({"login": "C1", "tipo": 2})
+    entrada = fila._INDICE["1234567"]
+    assert not hasattr(entrada, "__dict__")
+    assert retornaPrimeiro() is cadastrado
+    removerDaFila("1234567")
+    assert retornaPrimeiro() == {"login": "C1", "senha": "", "tipo": 2}
+
+
+@pytest.mark.parametrize("preguicosa", [True, False])
+def test_arvore_limitada_com_rotatividade_no_topo(preguicosa):
+    """Despachar o topo repetidamente não faz a árvore crescer com as chegadas."""
+    configurarRemocao(preguicosa=preguicosa)
+    for i in range(100):
+        adicionarNaFila({"login": f"U{i}", "tipo": 1})
+    for i in range(100, 20_100):                    # chega um, sai o primeiro
+        adicionarNaFila({"login": f"U{i}", "tipo": 1})
+        removerDaFila(retornaPrimeiro()["login"])
+    nivel = fila._FILAS[None]["niveis"][0]
+    assert len(nivel["arvore"]) <= 4 * 100 + 1
+    assert nivel["proximo"] <= 2 * len(nivel["entradas"]) + 1
+    assert tamanhoFila() == 100
+    assert consultarPosicaoNaFila("U20000") == 1
+    assert consultarPosicaoNaFila("U20099") == 100
+
+    for i in range(20_000, 20_100):                 # esvazia: nível recomeça
+        removerDaFila(f"U{i}")
+    retornaPrimeiro()
+    assert len(fila._FILAS[None]["niveis"][0]["arvore"]) <= 2
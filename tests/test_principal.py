@@ -57,14 +57,46 @@ def teste_login_com_falha():
 # Testes para IniciarSistema
 # -----------------------------------------------
 @patch("usuario.carregarUsuarios")
+@patch("fila.abrirJournal")
+@patch("estacionamento.ocupantes", return_value=[])
+@patch("principal._snapshotAtual", return_value=False)
 @patch("estacionamento.criar_estacionamentos_de_csv", return_value=["Est1", "Est2"])
-def test_iniciar_sistema(mock_criar_estacionamentos, mock_carregar_usuarios):
+def test_iniciar_sistema(mock_criar_estacionamentos, mock_snapshot, mock_ocupantes, mock_abrir_journal, mock_carregar_usuarios):
     principal.IniciarSistema()
+    mock_abrir_journal.assert_called_once_with("fila.csv")
     mock_carregar_usuarios.assert_any_call("users.csv")
     mock_carregar_usuarios.assert_any_call("guests.csv", tipo_padrao=2)
     mock_criar_estacionamentos.assert_called_once_with("estacionamentos.csv")
     assert principal.ESTACIONAMENTOS == ["Est1", "Est2"]
 
+@patch("usuario.carregarUsuarios")
+@patch("fila.abrirJournal")
+@patch("estacionamento.ocupantes", return_value=[])
+@patch("estacionamento.criar_estacionamentos_de_csv")
+def test_iniciar_sistema_prefere_snapshot_binario(mock_criar_csv, mock_ocupantes,
+                                                  mock_abrir_journal, mock_carregar_usuarios,
+                                                  tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    est = estacionamento.novo_estacionamento("Est1")
+    estacionamento.adicionar_vaga(est, vagas.nova_vaga(1))
+    (tmp_path / "estacionamentos.csv").write_text("Est1,0\n", encoding="utf-8")
+    estacionamento.salvar_estacionamentos_binario([est], "estacionamentos.bin")
+    principal.IniciarSistema()
+    mock_criar_csv.assert_not_called()
+    assert [e["nome"] for e in principal.ESTACIONAMENTOS] == ["Est1"]
+
+    # ponto de controle incremental reaplicado sobre o snapshot
+    vagas.ocupar(principal.ESTACIONAMENTOS[0]["vagas"][0], "U1")
+    principal.SalvarCheckpoint()
+    principal.IniciarSistema()
+    assert vagas.getEstado(principal.ESTACIONAMENTOS[0]["vagas"][0]) == "U1"
+    assert principal.CHECKPOINT["alteracoes"] == 1
+
+    # snapshot corrompido: volta para o CSV
+    (tmp_path / "estacionamentos.bin").write_bytes(b"lixo" * 16)
+    principal.IniciarSistema()
+    mock_criar_csv.assert_called_once_with("estacionamentos.csv")
+
 # -----------------------------------------------
 # Testes para MenuInicial
 # -----------------------------------------------
@@ -106,11 +138,32 @@ def test_tratar_erros_unknown_code(mock_print):
 @patch("builtins.print")
 def test_alocar_vaga_sucesso(mock_print, mock_ocupar, mock_get_vaga, mock_selecionar):
     principal.USUARIO_ATUAL = {"login": "teste"}
+    principal.OCUPANTES = {}
     mock_selecionar.return_value = "est"
-    mock_get_vaga.return_value = {"id": 42}
+    mock_get_vaga.return_value = {"id": 1}           # a política escolheu outra
     mock_ocupar.return_value = (True, 42)
     principal.AlocarVaga()
     mock_print.assert_any_call("✅ Vaga 42 ocupada. Boa estadia!")
+    assert principal.OCUPANTES == {"teste": ("est", 42)}
+
+@patch("estacionamento.selecionar_estacionamento")
+@patch("estacionamento.get_vaga_disponivel")
+@patch("estacionamento.ocupar_vaga_por_login")
+@patch("principal.GerenciaFila")
+@patch("principal.TratarErros")
+@patch("builtins.print")
+def test_alocar_vaga_ocupacao_falhou(mock_print, mock_tratar, mock_gerencia, mock_ocupar,
+                                     mock_get_vaga, mock_selecionar):
+    principal.USUARIO_ATUAL = {"login": "teste"}
+    principal.OCUPANTES = {}
+    mock_selecionar.return_value = "est"
+    mock_get_vaga.return_value = {"id": 1}
+    mock_ocupar.return_value = (False, -1)
+    principal.AlocarVaga()
+    assert principal.OCUPANTES == {}
+    mock_gerencia.assert_called_once()
+    mock_tratar.assert_called_with("SEM_VAGAS")
+    assert not any("ocupada" in str(c) for c in mock_print.call_args_list)
 
 @patch("estacionamento.selecionar_estacionamento")
 @patch("estacionamento.get_vaga_disponivel")
@@ -118,6 +171,7 @@ def test_alocar_vaga_sucesso(mock_print, mock_ocupar, mock_get_vaga, mock_seleci
 @patch("principal.TratarErros")
 def test_alocar_vaga_sem_vaga(mock_tratar, mock_gerencia, mock_get_vaga, mock_selecionar):
     principal.USUARIO_ATUAL = {"login": "teste"}
+    principal.OCUPANTES = {}
     mock_selecionar.return_value = "est"
     mock_get_vaga.return_value = None
     principal.AlocarVaga()
@@ -140,17 +194,22 @@ def test_alocar_vaga_sem_autenticacao(mock_tratar):
 def test_liberar_vaga_sucesso(mock_print, mock_atualizar, mock_getnome, mock_liberar):
     principal.USUARIO_ATUAL = {"login": "teste"}
     principal.ESTACIONAMENTOS = ["est"]
+    principal.OCUPANTES = {"teste": ("est", 99)}
     principal.LiberarVaga()
     mock_print.assert_any_call("✅ Vaga 99 liberada no estacionamento 'Est1'.")
     mock_atualizar.assert_called_once()
+    mock_liberar.assert_called_once_with("est", {"login": "teste"})
+    assert "teste" not in principal.OCUPANTES
 
 @patch("estacionamento.liberar_vaga_de", return_value=None)
 @patch("principal.TratarErros")
 def test_liberar_vaga_nao_encontrada(mock_tratar, mock_liberar):
     principal.USUARIO_ATUAL = {"login": "teste"}
     principal.ESTACIONAMENTOS = ["est"]
+    principal.OCUPANTES = {}
     principal.LiberarVaga()
     mock_tratar.assert_called_with("VAGA_NAO_ENCONTRADA")
+    mock_liberar.assert_not_called()
 
 # -----------------------------------------------
 # Testes para ExibirResumo
@@ -177,15 +236,21 @@ def test_exibir_resumo_sem_autenticado(mock_print, mock_tamanho, mock_listar):
 # Teste para EncerrarSistema
 # -----------------------------------------------
 @patch("usuario.salvarUsuarios")
+@patch("fila.salvar_fila_em_csv")
 @patch("estacionamento.salvar_estado_em_csv")
+@patch("estacionamento.salvar_estacionamentos_binario")
+@patch("estacionamento.zerar_alteracoes")
 @patch("builtins.open")
 @patch("csv.writer")
 @patch("builtins.print")
-def test_encerrar_sistema(mock_print, mock_writer, mock_open, mock_salvar_estado, mock_salvar_usuarios):
+def test_encerrar_sistema(mock_print, mock_writer, mock_open, mock_zerar, mock_salvar_binario, mock_salvar_estado, mock_salvar_fila, mock_salvar_usuarios):
     mock_open.return_value.__enter__.return_value = MagicMock()
     with pytest.raises(SystemExit):
         principal.EncerrarSistema()
     mock_salvar_usuarios.assert_called_once()
+    mock_salvar_fila.assert_called_once_with("fila.csv")
+    mock_salvar_binario.assert_called_once_with(principal.ESTACIONAMENTOS, "estacionamentos.bin")
+    mock_zerar.assert_called_once_with(principal.ESTACIONAMENTOS, "estacionamentos.patch")
     mock_print.assert_any_call("✔️  Dados salvos. Até logo!")
 
 #------------------------------------------------------------------------------------------------------------------------
@@ -257,7 +322,9 @@ def test_atualizar_estado_chama_proximo(monkeypatch, capsys):
     prox_user = {"login": "john"}
 
     monkeypatch.setattr(principal.est_mod, "get_vaga_disponivel", lambda est: {"id": 11})
-    monkeypatch.setattr(principal.fila_mod, "retornaPrimeiro", lambda: prox_user)
+    monkeypatch.setattr(principal.est_mod, "getNome", lambda est: "A")
+    monkeypatch.setattr(principal.fila_mod, "retornaPrimeiro",
+                        lambda nome: prox_user if nome == "A" else None)
     monkeypatch.setattr(principal.usuario_mod, "getLogin", lambda u: u["login"])
     monkeypatch.setattr(principal.est_mod, "ocupar_vaga_por_login", lambda est, login: (True, 11))
 
@@ -275,11 +342,11 @@ def test_atualizar_estado_chama_proximo(monkeypatch, capsys):
 def test_gerencia_fila_adiciona(monkeypatch):
     user = {"login": "john"}
     monkeypatch.setattr(principal.usuario_mod, "getLogin", lambda u: u["login"])
-    monkeypatch.setattr(principal.fila_mod, "consultarPosicaoNaFila", lambda login: -1)
+    monkeypatch.setattr(principal.fila_mod, "estaNaFila", lambda login: False)
 
     chamado = {}
 
-    def fake_add(u):
+    def fake_add(u, nome=None):
         chamado["add"] = u
 
     monkeypatch.setattr(principal.fila_mod, "adicionarNaFila", fake_add)
@@ -291,12 +358,107 @@ def test_gerencia_fila_adiciona(monkeypatch):
 def test_gerencia_fila_nao_duplica(monkeypatch):
     user = {"login": "john"}
     monkeypatch.setattr(principal.usuario_mod, "getLogin", lambda u: u["login"])
-    monkeypatch.setattr(principal.fila_mod, "consultarPosicaoNaFila", lambda login: 0)
+    monkeypatch.setattr(principal.fila_mod, "estaNaFila", lambda login: True)
 
     chamado = {}
     monkeypatch.setattr(
-        principal.fila_mod, "adicionarNaFila", lambda u: chamado.setdefault("chamado", True)
+        principal.fila_mod, "adicionarNaFila", lambda u, nome=None: chamado.setdefault("chamado", True)
     )
 
+    principal.GerenciaFila(user)
+    assert "chamado" not in chamado
+
+
+
+
 
+def test_gerencia_fila_usa_fila_do_estacionamento():
+    fila.esvaziarFila()
+    est = estacionamento.novo_estacionamento("Bloco A")
+    principal.GerenciaFila({"login": "john", "tipo": 1}, est)
+    assert fila.retornaPrimeiro("Bloco A")["login"] == "john"
+    assert fila.retornaPrimeiro("Bloco B") is None
+    fila.esvaziarFila()
 
+
+# ---------------------------------------------------------------------------
+# Índice global de ocupantes
+# ---------------------------------------------------------------------------
+
+def test_indice_de_ocupantes_entre_estacionamentos(monkeypatch, tmp_path, capsys):
+    (tmp_path / "estacionamentos.csv").write_text("A,0,U1\nB,U2,0\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(principal.usuario_mod, "carregarUsuarios", lambda *a, **k: None)
+    monkeypatch.setattr(principal.fila_mod, "abrirJournal", lambda *a, **k: None)
+    principal.IniciarSistema()
+    a, b = principal.ESTACIONAMENTOS
+    assert principal.OCUPANTES == {"U1": (a, 2), "U2": (b, 1)}
+
+    principal.USUARIO_ATUAL = {"login": "U2", "tipo": 1}
+    principal.AlocarVaga()                          # já estacionado em B
+    assert "já está alocado" in capsys.readouterr().out
+    monkeypatch.setattr(principal, "AtualizarEstado", lambda est: None)
+    principal.LiberarVaga()
+    assert "U2" not in principal.OCUPANTES
+    assert estacionamento.buscar_vaga_por_login(b, "U2") is None
+
+
+def test_aplicar_eventos_sensores_atualiza_ocupantes_e_chama_fila(monkeypatch):
+    fila.esvaziarFila()
+    est = estacionamento.novo_estacionamento("A")
+    est["vagas"] = vagas.novo_bloco_de_estados(["U1", "U2", "0", "U3"])
+    principal.ESTACIONAMENTOS = [est]
+    principal.OCUPANTES = {"U1": (est, 1), "U2": (est, 2), "U3": (est, 4)}
+    monkeypatch.setattr(principal.usuario_mod, "buscarUsuario", lambda login: None)
+    fila.adicionarNaFila({"login": "Q1", "tipo": 1}, "A")
+    fila.adicionarNaFila({"login": "Q2", "tipo": 1}, "A")
+    fila.adicionarNaFila({"login": "Q3", "tipo": 1}, "A")
+
+    conflitos = principal.AplicarEventosSensores(est, [
+        (1, 0), (3, "S1"), (2, None),
+        (4, "0"), (4, "U3"),                        # sai e volta no mesmo lote
+        (9, 0),
+    ])
+    assert conflitos == [(5, "vaga_inexistente")]
+    assert principal.OCUPANTES == {"S1": (est, 3), "U3": (est, 4),
+                                   "Q1": (est, 1), "Q2": (est, 2)}
+    assert estacionamento.estado_vaga(est, 1) == "Q1"
+    assert estacionamento.estado_vaga(est, 2) == "Q2"
+    assert fila.retornaPrimeiro("A")["login"] == "Q3"
+    fila.esvaziarFila()
+
+
+def test_aplicar_eventos_sensores_tira_da_fila_quem_estacionou(monkeypatch):
+    fila.esvaziarFila()
+    est = estacionamento.novo_estacionamento("A")
+    est["vagas"] = vagas.novo_bloco_de_estados(["U1", "0", "U3"])
+    principal.ESTACIONAMENTOS = [est]
+    principal.OCUPANTES = {"U1": (est, 1), "U3": (est, 3)}
+    monkeypatch.setattr(principal.usuario_mod, "buscarUsuario", lambda login: None)
+    fila.adicionarNaFila({"login": "Q1", "tipo": 1}, "A")
+    fila.adicionarNaFila({"login": "Q2", "tipo": 1}, "A")
+
+    assert principal.AplicarEventosSensores(est, [(2, "Q1"), (1, 0)]) == []
+    assert principal.OCUPANTES == {"Q1": (est, 2), "U3": (est, 3), "Q2": (est, 1)}
+    assert estacionamento.estado_vaga(est, 1) == "Q2"
+    assert not fila.estaNaFila("Q1") and not fila.estaNaFila("Q2")
+    fila.esvaziarFila()
+
+
+def test_aplicar_eventos_sensores_login_em_outro_estacionamento(monkeypatch):
+    fila.esvaziarFila()
+    a = estacionamento.novo_estacionamento("A")
+    a["vagas"] = vagas.novo_bloco_de_estados(["0", "0"])
+    b = estacionamento.novo_estacionamento("B")
+    b["vagas"] = vagas.novo_bloco_de_estados(["U1", "U2"])
+    principal.ESTACIONAMENTOS = [a, b]
+    principal.OCUPANTES = {"U1": (b, 1), "U2": (b, 2)}
+    monkeypatch.setattr(principal.usuario_mod, "buscarUsuario", lambda login: None)
+    fila.adicionarNaFila({"login": "Q1", "tipo": 1}, "B")
+
+    assert principal.AplicarEventosSensores(a, [(2, "U1")]) == []
+    # o sensor prevalece: a vaga antiga em B é liberada e chamada da fila de B
+    assert principal.OCUPANTES == {"U1": (a, 2), "U2": (b, 2), "Q1": (b, 1)}
+    assert estacionamento.buscar_vaga_por_login(b, "U1") is None
+    assert estacionamento.estado_vaga(b, 1) == "Q1"
+    fila.esvaziarFila()
@@ -281,4 +281,47 @@ def teste_cria_convidado_senha_vazia(mock_print, mock_input):
     usuario.criaConvidado()
     
     # Não deve adicionar usuário se senha for vazia
-    assert len(usuario.usuarios) == inicial_count
\ No newline at end of file
+    assert len(usuario.usuarios) == inicial_count
+
+# ---------------------------------------------------------------------------
+def test_tabela_login_id_bidirecional():
+    id_a = usuario.internarLogin("2212001")
+    id_b = usuario.internarLogin("12345678901")
+    assert id_a >= 1 and id_b != id_a
+    assert usuario.internarLogin("2212001") == id_a
+    assert usuario.idDoLogin("2212001") == id_a
+    assert usuario.loginDoId(id_b) == "12345678901"
+    assert usuario.idDoLogin("nunca-visto") is None
+    with pytest.raises(IndexError):
+        usuario.loginDoId(0)
+
+def test_buscar_usuario_indexado_sem_varrer_a_lista(monkeypatch):
+    """Usuários carregados são achados pelo índice, sem percorrer `usuarios`."""
+    usuario.usuarios.clear()
+    usuario.convidados.clear()
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        for i in range(1000):
+            f.write(f"{1000000 + i},s,1\n")
+        temp_file = f.name
+    try:
+        usuario.carregarUsuarios(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+    class SemVarredura(list):
+        def __iter__(self):
+            raise AssertionError("busca linear")
+    monkeypatch.setattr(usuario, "usuarios", SemVarredura(usuario.usuarios))
+    assert usuario.buscarUsuario("1000999")["login"] == "1000999"
+    assert usuario.autentica("1000500", "s")["login"] == "1000500"
+
+def test_buscar_usuario_com_lista_editada_por_fora():
+    """Índice desatualizado (lista limpa/reescrita) cai na busca linear."""
+    usuario.usuarios.clear()
+    usuario._registrarUsuario(usuario.novo_usuario("1234567", "a", 1))
+    usuario.usuarios.clear()
+    assert usuario.buscarUsuario("1234567") is None
+    outro = usuario.novo_usuario("7654321", "b", 1)
+    usuario.usuarios.append(outro)
+    assert usuario.buscarUsuario("1234567") is None
+    assert usuario.buscarUsuario("7654321") is outro
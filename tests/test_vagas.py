@@ -123,4 +123,164 @@ def test_getEstado_multiplas_ocupacoes():
     # Libera e ocupa com segundo usuário
     vaga_mod.liberar(v)
     vaga_mod.ocupar(v, "user123")
-    assert vaga_mod.getEstado(v) == "user123"
\ No newline at end of file
+    assert vaga_mod.getEstado(v) == "user123"
+# ---------------------------------------------------------------------------
+def teste_bloco_vagas_acessores():
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 4))
+    ocupada = vaga_mod.nova_vaga(9)
+    vaga_mod.ocupar(ocupada, "U9")
+    bloco.append(ocupada)
+    assert len(bloco) == 4
+    assert [vaga_mod.getId(v) for v in bloco] == [1, 2, 3, 9]
+    assert [vaga_mod.estaLivre(v) for v in bloco] == [True, True, True, False]
+    assert vaga_mod.estaOcupadaPor(bloco[-1], "U9")
+    v = bloco[1]
+    assert vaga_mod.ocupar(v, "U2") and not vaga_mod.ocupar(v, "U3")
+    assert vaga_mod.getEstado(bloco[1]) == "U2"
+    assert vaga_mod.status(bloco[1]) == "Vaga 02: Ocupada por U2"
+    vaga_mod.liberar(bloco[1])
+    assert vaga_mod.estaLivre(bloco[1]) and bloco[1] == v
+
+# ---------------------------------------------------------------------------
+def teste_ocupaVagaPorId_em_bloco():
+    bloco = vaga_mod.novo_bloco_vagas([10, 20])
+    assert vaga_mod.ocupaVagaPorId(bloco, 20, "U7")
+    assert bloco[1]["estado"] == "U7" and bloco[0]["estado"] == 0
+    assert not vaga_mod.ocupaVagaPorId(bloco, 99, "U7")
+
+# ---------------------------------------------------------------------------
+def teste_vaga_slots_compativel_com_dict():
+    v = vaga_mod.nova_vaga(3)
+    assert isinstance(v, vaga_mod.Vaga) and not hasattr(v, "__dict__")
+    assert v.id == v["id"] == 3
+    v["estado"] = "U3"
+    assert vaga_mod.estaOcupadaPor(v, "U3") and v.estado == "U3"
+    with pytest.raises(KeyError):
+        v["cor"]
+    with pytest.raises(AttributeError):
+        v.cor = "azul"
+
+# ---------------------------------------------------------------------------
+def teste_bloco_indice_por_id():
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 6))
+    assert bloco.porId(3).id == 3 and bloco.porId(0) is None
+    assert bloco.porId(6) is None and bloco.porId("3") is None
+    bloco.append(vaga_mod.nova_vaga(6))             # ainda consecutivo
+    bloco.append(vaga_mod.nova_vaga(40))            # fora da sequência
+    bloco.append(vaga_mod.nova_vaga(2))             # repetido: vale o primeiro
+    assert [vaga_mod.getId(bloco.porId(i)) for i in (1, 6, 40)] == [1, 6, 40]
+    assert bloco.porId(2) == bloco[1]
+    assert vaga_mod.buscaVagaPorId(vaga_mod.novo_bloco_vagas([7, 3]), 3).id == 3
+
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("internar", [False, True])
+def teste_bloco_ocupantes_internados(internar):
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 5), internar=internar)
+    ocupada = vaga_mod.nova_vaga(5)
+    vaga_mod.ocupar(ocupada, "2212001")
+    bloco.append(ocupada)
+    assert vaga_mod.ocupar(bloco[2], "12345678901")
+    assert vaga_mod.getEstado(bloco[2]) == "12345678901"
+    assert vaga_mod.estaOcupadaPor(bloco[4], "2212001")
+    assert vaga_mod.buscaVagaPorOcupante(bloco, "12345678901").id == 3
+    assert vaga_mod.buscaVagaPorOcupante(bloco, "9999999") is None
+    vaga_mod.liberar(bloco[2])
+    assert vaga_mod.buscaVagaPorOcupante(bloco, "12345678901") is None
+    assert [vaga_mod.getEstado(v) for v in bloco] == [0, 0, 0, 0, "2212001"]
+
+# ---------------------------------------------------------------------------
+def teste_bloco_primeira_livre_acompanha_ocupacoes():
+    import random
+    rng = random.Random(7)
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 201))
+    assert vaga_mod.primeiraVagaLivre(vaga_mod.novo_bloco_vagas()) is None
+    for _ in range(2000):
+        v = bloco[rng.randrange(len(bloco))]
+        if rng.random() < 0.6:
+            vaga_mod.ocupar(v, "U")
+        else:
+            vaga_mod.liberar(v)
+        esperado = next((x for x in bloco if vaga_mod.estaLivre(x)), None)
+        assert vaga_mod.primeiraVagaLivre(bloco) == esperado
+    for v in bloco:
+        vaga_mod.ocupar(v, "U")
+    assert bloco.primeiraLivre() is None
+    bloco.append(vaga_mod.nova_vaga(201))
+    assert bloco.primeiraLivre().id == 201
+
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("internar", [False, True])
+def teste_bloco_indice_de_ocupantes(internar):
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 7), internar=internar)
+    vaga_mod.ocupar(bloco[4], "U1")
+    vaga_mod.ocupar(bloco[1], "U1")                 # repetido (CSV à mão)
+    vaga_mod.ocupar(bloco[2], "U2")
+    assert bloco.porOcupante("U1").id == 2
+    vaga_mod.liberar(bloco[1])
+    assert bloco.porOcupante("U1").id == 5           # a outra vaga do login
+    vaga_mod.liberar(bloco[4])
+    assert bloco.porOcupante("U1") is None
+    bloco[2]["estado"] = "U3"                       # sobrescrita direta
+    assert bloco.porOcupante("U2") is None and bloco.porOcupante("U3").id == 3
+
+# ---------------------------------------------------------------------------
+def teste_bloco_contadores_com_verificacao(monkeypatch):
+    import random
+    monkeypatch.setitem(vaga_mod._CONFIG_BLOCO, "verificar", True)
+    rng = random.Random(3)
+    bloco = vaga_mod.novo_bloco_vagas(range(1, 51))
+    for _ in range(500):
+        v = bloco[rng.randrange(len(bloco))]
+        acao = rng.random()
+        if acao < 0.5:
+            vaga_mod.ocupar(v, f"U{rng.randrange(5)}")
+        elif acao < 0.9:
+            vaga_mod.liberar(v)
+        else:
+            v["estado"] = "X"                       # sobrescrita direta
+        assert vaga_mod.contarLivres(bloco) == sum(vaga_mod.estaLivre(x) for x in bloco)
+    assert bloco.ocupadas() == len(bloco) - bloco.livres()
+    bloco._nLivres += 1                              # corrompe o contador
+    with pytest.raises(RuntimeError):
+        bloco.livres()
+
+# ---------------------------------------------------------------------------
+def teste_bloco_de_estados_do_csv():
+    bloco = vaga_mod.novo_bloco_de_estados(["0", " U1 ", "0", " 0", "U3"])
+    assert [vaga_mod.getId(v) for v in bloco] == [1, 2, 3, 4, 5]
+    assert [vaga_mod.getEstado(v) for v in bloco] == [0, "U1", 0, 0, "U3"]
+    assert bloco.livres() == 3 and bloco.primeiraLivre().id == 1
+    assert bloco.porOcupante("U3").id == 5
+
+@pytest.mark.parametrize("como_bloco", [False, True])
+def test_livres_por_trecho(como_bloco):
+    estados = ["0", "U1", "0", "U2", "U3", "0", "U4"]
+    vagas = vaga_mod.novo_bloco_de_estados(estados)
+    if not como_bloco:
+        vagas = [vaga_mod.nova_vaga(v.id) for v in vagas]
+        for v, estado in zip(vagas, estados):
+            if estado != "0":
+                vaga_mod.ocupar(v, estado)
+    assert vaga_mod.contarLivresEntre(vagas, 1, 6) == 2
+    assert vaga_mod.posicaoLivreEntre(vagas, 3, 7) == 5
+    assert vaga_mod.posicaoLivreEntre(vagas, 6, 7) == -1
+    assert vaga_mod.posicaoLivreAntes(vagas, 5) == 2
+    vaga_mod.liberar(vagas[6])
+    vaga_mod.ocupar(vagas[0], "U5")
+    assert vaga_mod.contarLivresEntre(vagas, 0, 7) == 3
+    assert vaga_mod.posicaoLivreEntre(vagas, 6, 7) == 6
+    assert vaga_mod.posicaoLivreAntes(vagas, 2) == -1
+
+@pytest.mark.parametrize("como_bloco", [False, True])
+def test_aplicar_eventos_lista_e_bloco(como_bloco):
+    vagas = vaga_mod.novo_bloco_de_estados(["U1", "0", "0"])
+    if not como_bloco:
+        vagas = [vaga_mod.nova_vaga(i) for i in (1, 2, 3)]
+        vaga_mod.ocupar(vagas[0], "U1")
+    conflitos = vaga_mod.aplicarEventosVagas(
+        vagas, [(1, "0"), (1, "U3"), (2, "U3"), (2, None), (1, "U3"), (4, 0)])
+    assert conflitos == [(2, "login_em_outra_vaga"), (3, "vaga_ja_livre"),
+                         (5, "vaga_inexistente")]
+    assert [vaga_mod.getEstado(v) for v in vagas] == ["U3", 0, 0]
+    assert vaga_mod.contarLivres(vagas) == 2
+    assert vaga_mod.getId(vaga_mod.primeiraVagaLivre(vagas)) == 2